@@ -0,0 +1,26 @@
+"""
+Archive idle chat conversations into compressed cold storage.
+Run: python archive_chat_conversations.py [--days 90] [--batch-size 200]
+"""
+import argparse
+from core import config
+from core.database import SessionLocal
+from services.chat_archive_service import ChatArchiveService
+
+def archive_conversations(idle_days: int, batch_size: int):
+    db = SessionLocal()
+    
+    try:
+        archived = ChatArchiveService.archive_idle_conversations(db, idle_days, batch_size)
+        print(f"\n✅ Archived {archived} conversation(s) idle for more than {idle_days} days\n")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive idle chat conversations")
+    parser.add_argument("--days", type=int, default=config.CHAT_ARCHIVE_IDLE_DAYS, help="Idle days before a conversation is archived")
+    parser.add_argument("--batch-size", type=int, default=config.CHAT_ARCHIVE_BATCH_SIZE, help="Conversations archived per transaction")
+    args = parser.parse_args()
+    archive_conversations(args.days, args.batch_size)
@@ -0,0 +1,46 @@
+"""
+Microbenchmark for the get_current_user auth dependency.
+Compares a full signature verification on every call (cache disabled) with
+cached verification of the same token.
+Run: python benchmarks/bench_auth.py [--iterations 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Defaults so the benchmark runs without a .env file
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_EXPIRATION_MINUTES", "30")
+
+from services.user_service import create_access_token
+from utils.auth import get_current_user, token_cache
+
+def run(iterations: int):
+    token = create_access_token({"sub": "bench@example.com", "role": "premium", "id": 1})
+    
+    max_size = token_cache.max_size
+    token_cache.max_size = 0
+    token_cache.clear()
+    uncached = timeit.timeit(lambda: get_current_user(token), number=iterations)
+    
+    token_cache.max_size = max_size
+    get_current_user(token)
+    cached = timeit.timeit(lambda: get_current_user(token), number=iterations)
+    
+    print("=" * 50)
+    print(f"get_current_user x {iterations}")
+    print(f"  uncached: {uncached / iterations * 1e6:8.2f} us/call")
+    print(f"  cached:   {cached / iterations * 1e6:8.2f} us/call")
+    print(f"  speedup:  {uncached / cached:8.1f}x")
+    print("=" * 50)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the auth dependency")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.iterations)
@@ -0,0 +1,81 @@
+"""
+Benchmark for the streaming admin user export.
+Seeds a throwaway SQLite database with N users and consumes the export two ways:
+  - list:   get_all_users (every row in memory) rendered as one JSON envelope
+  - stream: services.export_service.stream_export as NDJSON, chunk by chunk
+reporting time and peak memory allocated (tracemalloc) at growing row counts; the
+stream's peak should stay flat while the list's grows with N.
+Run: python benchmarks/bench_exports.py [--rows 10000 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Defaults so the benchmark runs without a .env file
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_exports.db')}"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_EXPIRATION_MINUTES", "30")
+
+from sqlalchemy import delete
+from core.database import SessionLocal, create_tables, engine
+from core.response import success_response
+from models.user import User, UserRole
+from services.export_service import UserExportFilters, stream_export, user_export_statement
+from services.user_service import get_all_users
+
+
+def seed(count: int):
+    create_tables()
+    with engine.begin() as conn:
+        conn.execute(delete(User.__table__))
+        conn.execute(User.__table__.insert(), [
+            {"email": f"user{i}@example.com", "hashed_password": "unused", "name": f"User {i}",
+             "role": UserRole.FREE.name, "auth_method": "email", "has_password": True}
+            for i in range(count)
+        ])
+
+
+def as_list() -> int:
+    db = SessionLocal()
+    try:
+        return len(success_response(data=get_all_users(db)).body)
+    finally:
+        db.close()
+
+
+def as_stream() -> int:
+    return sum(len(chunk) for chunk in stream_export(SessionLocal, user_export_statement(UserExportFilters()), "ndjson"))
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def run(counts):
+    print("=" * 60)
+    for count in counts:
+        seed(count)
+        print(f"{count} users:")
+        for name, fn in (("list", as_list), ("stream", as_stream)):
+            elapsed, peak, size = measure(fn)
+            print(f"  {name:6}: {elapsed * 1000:9.1f} ms  peak {peak / 2**20:7.1f} MiB  {size / 2**20:7.1f} MiB out")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list vs streaming user export")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+    run(args.rows)
@@ -0,0 +1,80 @@
+"""
+Cold-start benchmark: how long `import main` takes in a fresh interpreter.
+Each run is a new process with -X importtime; reports the median and best import
+time of main, the slowest top-level imports of the last run, and whether any of the
+lazily imported SDKs (openai, stripe, authlib) were loaded.
+Run: python benchmarks/bench_import.py [--runs 5] [--budget-ms 1000] [--top 15]
+Exits with status 1 if the median exceeds the budget or a lazy SDK was imported.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_SDKS = ("openai", "stripe", "authlib")
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+# Defaults so the benchmark runs without a .env file; the database is never touched at import
+ENV_DEFAULTS = {
+    "DATABASE_URL": "sqlite:///bench_import.db",
+    "JWT_SECRET_KEY": "benchmark-secret",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_EXPIRATION_MINUTES": "30",
+}
+
+PROBE = "import sys, main; print('lazy-sdks:' + ','.join(m for m in {sdks!r} if m in sys.modules))"
+
+
+def import_once():
+    """Import main in a fresh interpreter; returns (main_us, [(cumulative_us, module)] top-level, loaded_sdks)."""
+    env = {**ENV_DEFAULTS, **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(sdks=LAZY_SDKS)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    main_us = None
+    top_level = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, module = int(match.group(2)), len(match.group(3)), match.group(4)
+        if module == "main":
+            main_us = cumulative
+        elif indent == 2:
+            top_level.append((cumulative, module))
+    probe = next(line for line in result.stdout.splitlines() if line.startswith("lazy-sdks:"))
+    loaded = [m for m in probe[len("lazy-sdks:"):].split(",") if m]
+    return main_us, top_level, loaded
+
+
+def run(runs: int, budget_ms: float, top: int) -> bool:
+    timings = []
+    for _ in range(runs):
+        main_us, top_level, loaded = import_once()
+        timings.append(main_us / 1000)
+
+    median = statistics.median(timings)
+    print("=" * 50)
+    print(f"import main x {runs}")
+    print(f"  median: {median:8.1f} ms")
+    print(f"  best:   {min(timings):8.1f} ms")
+    print(f"  budget: {budget_ms:8.1f} ms")
+    print("Slowest imports under main (last run):")
+    for cumulative, module in sorted(top_level, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+    print(f"Lazy SDKs loaded at import: {', '.join(loaded) or 'none'}")
+    print("=" * 50)
+    return median <= budget_ms and not loaded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark application import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Maximum median import time")
+    parser.add_argument("--top", type=int, default=15, help="Number of slow imports to list")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.runs, args.budget_ms, args.top) else 1)
@@ -0,0 +1,86 @@
+"""
+Login throughput benchmark.
+Runs authenticate_user from many concurrent callers against a throwaway SQLite
+database and reports logins/s, latency percentiles and how many requests the
+bounded password hasher rejected with 503.
+Run: python benchmarks/bench_login.py [--rounds 12] [--concurrency 32] [--logins 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark login throughput")
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument("--workers", type=int, default=None, help="PASSWORD_HASH_WORKERS")
+    parser.add_argument("--queue-limit", type=int, default=None, help="PASSWORD_HASH_QUEUE_LIMIT")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent login callers")
+    parser.add_argument("--logins", type=int, default=200, help="Total logins")
+    return parser.parse_args()
+
+args = parse_args()
+db_path = os.path.join(tempfile.mkdtemp(), "bench_login.db")
+
+# Settings must be in place before the app modules read core.config
+os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_EXPIRATION_MINUTES", "30")
+os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+if args.workers is not None:
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+if args.queue_limit is not None:
+    os.environ["PASSWORD_HASH_QUEUE_LIMIT"] = str(args.queue_limit)
+
+from fastapi import HTTPException
+from core import config
+from core.database import SessionLocal, create_tables
+import models
+from models.user import User
+from services.user_service import authenticate_user, get_password_hash
+
+def login(index: int):
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        authenticate_user(db, f"bench{index % 10}@example.com", "benchmark-password")
+        return time.perf_counter() - start, None
+    except HTTPException as e:
+        return time.perf_counter() - start, e.status_code
+    finally:
+        db.close()
+
+def run():
+    create_tables()
+    db = SessionLocal()
+    hashed = get_password_hash("benchmark-password")
+    for i in range(10):
+        db.add(User(email=f"bench{i}@example.com", hashed_password=hashed, name=f"Bench {i}"))
+    db.commit()
+    db.close()
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(login, range(args.logins)))
+    elapsed = time.perf_counter() - start
+    
+    latencies = sorted(latency for latency, error in results if error is None)
+    rejected = sum(1 for _, error in results if error == 503)
+    
+    print("=" * 50)
+    print(f"bcrypt rounds {config.BCRYPT_ROUNDS}, hasher workers {config.PASSWORD_HASH_WORKERS}, "
+          f"queue limit {config.PASSWORD_HASH_QUEUE_LIMIT}, callers {args.concurrency}")
+    print(f"  successful logins: {len(latencies)} / {args.logins} ({rejected} rejected with 503)")
+    print(f"  throughput:        {len(latencies) / elapsed:8.1f} logins/s")
+    if latencies:
+        print(f"  p50 latency:       {latencies[len(latencies) // 2] * 1000:8.1f} ms")
+        print(f"  p95 latency:       {latencies[int(len(latencies) * 0.95) - 1] * 1000:8.1f} ms")
+    print("=" * 50)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,106 @@
+"""
+Benchmark for keyset vs OFFSET pagination at deep pages.
+Seeds a throwaway SQLite database with N quizzes for one user, then fetches a page
+of 20 quiz summaries at increasing depths two ways:
+  - offset: QuizService.get_user_quizzes(skip=depth) + get_quiz_count, as /quiz/ did
+  - keyset: core.pagination.paginate with the cursor of the row before the page
+reporting the median time per page at each depth.
+Run: python benchmarks/bench_pagination.py [--rows 200000] [--iterations 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Defaults so the benchmark runs without a .env file
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_pagination.db')}"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_EXPIRATION_MINUTES", "30")
+
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
+from core.database import SessionLocal, create_tables, engine
+from core.pagination import Keyset, PageParams, encode_cursor, paginate
+from models.quiz import Quiz, QuizDifficulty
+from models.user import User, UserRole
+from services.quiz_service import QUIZ_SUMMARY_COLUMNS, QuizService
+
+PAGE_SIZE = 20
+KEYSET = Keyset(Quiz.created_at, Quiz.id)
+
+
+def seed(count: int) -> int:
+    create_tables()
+    with engine.begin() as conn:
+        user_id = conn.execute(User.__table__.insert().values(
+            email="bench@example.com", hashed_password="unused", name="Bench",
+            role=UserRole.PREMIUM.name, auth_method="email", has_password=True,
+        )).inserted_primary_key[0]
+        start = datetime(2024, 1, 1)
+        conn.execute(Quiz.__table__.insert(), [
+            {"user_id": user_id, "certification": "SC-300", "topic": f"Topic {i}",
+             "difficulty": QuizDifficulty.BEGINNER.name, "quiz_content": {"questions": []},
+             "created_at": start + timedelta(seconds=i), "updated_at": start + timedelta(seconds=i)}
+            for i in range(count)
+        ])
+    return user_id
+
+
+def median(fn, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        db = SessionLocal()
+        start = time.perf_counter()
+        fn(db)
+        timings.append(time.perf_counter() - start)
+        db.close()
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def cursor_before(user_id: int, depth: int) -> str:
+    """Cursor of the row just before the page at depth, as the previous page would have returned it."""
+    db = SessionLocal()
+    row = db.execute(
+        select(Quiz.created_at, Quiz.id).where(Quiz.user_id == user_id)
+        .order_by(Quiz.created_at.desc(), Quiz.id.desc()).offset(depth - 1).limit(1)
+    ).one()
+    db.close()
+    return encode_cursor(row.created_at, row.id)
+
+
+def run(count: int, iterations: int):
+    user_id = seed(count)
+    statement = select(Quiz).options(load_only(*QUIZ_SUMMARY_COLUMNS)).where(Quiz.user_id == user_id)
+    depths = [d for d in (1, 1000, 10000, 100000, count - PAGE_SIZE) if 0 < d <= count - PAGE_SIZE]
+
+    print("=" * 60)
+    print(f"Pages of {PAGE_SIZE} from {count} quizzes (median of {iterations})")
+    print(f"{'depth':>10} {'offset+count':>14} {'keyset':>10} {'speedup':>9}")
+    for depth in depths:
+        cursor = cursor_before(user_id, depth)
+        params = PageParams(cursor=cursor, limit=PAGE_SIZE)
+
+        def offset_page(db):
+            QuizService.get_user_quizzes(db, user_id, skip=depth, limit=PAGE_SIZE)
+            QuizService.get_quiz_count(db, user_id)
+
+        def keyset_page(db):
+            paginate(db, statement, KEYSET, params)
+
+        offset_time, keyset_time = median(offset_page, iterations), median(keyset_page, iterations)
+        print(f"{depth:>10} {offset_time * 1000:>11.2f} ms {keyset_time * 1000:>7.2f} ms {offset_time / keyset_time:>8.1f}x")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark keyset vs OFFSET pagination")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, args.iterations)
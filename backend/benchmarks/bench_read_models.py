@@ -0,0 +1,97 @@
+"""
+Benchmark for the Core select() read rows behind the hot list endpoints.
+Seeds a throwaway SQLite database with N courses and N users, then renders the
+list envelope two ways:
+  - orm:  db.query(Model).all() validated through the response schema
+  - rows: services.read_models NamedTuple rows handed straight to orjson
+reporting time per render and peak memory allocated (tracemalloc) for each.
+Run: python benchmarks/bench_read_models.py [--rows 100000] [--iterations 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Defaults so the benchmark runs without a .env file
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_read_models.db')}"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_EXPIRATION_MINUTES", "30")
+
+from core.database import SessionLocal, create_tables, engine
+from core.response import success_response
+from models.course import Course
+from models.user import User, UserRole
+from schemas.course import CourseOut
+from schemas.user import UserOut
+from services.read_models import course_rows, user_rows
+
+
+def seed(count: int):
+    create_tables()
+    with engine.begin() as conn:
+        conn.execute(Course.__table__.insert(), [
+            {"title": f"Course {i}", "description": "Benchmark course description " * 4, "instructor_name": "Bench"}
+            for i in range(count)
+        ])
+        conn.execute(User.__table__.insert(), [
+            {"email": f"user{i}@example.com", "hashed_password": "unused", "name": f"User {i}",
+             "role": UserRole.FREE.name, "auth_method": "email", "has_password": True}
+            for i in range(count)
+        ])
+
+
+def measure(render, iterations: int):
+    """(seconds per render, peak bytes allocated during one render), each with a fresh session."""
+    timings = []
+    for _ in range(iterations):
+        db = SessionLocal()
+        start = time.perf_counter()
+        render(db)
+        timings.append(time.perf_counter() - start)
+        db.close()
+
+    db = SessionLocal()
+    tracemalloc.start()
+    render(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    return min(timings), peak
+
+
+CASES = [
+    ("courses",
+     lambda db: success_response(data=db.query(Course).all(), schema=List[CourseOut]).body,
+     lambda db: success_response(data=course_rows(db)).body),
+    ("users",
+     lambda db: success_response(data=db.query(User).order_by(User.id.asc()).all(), schema=List[UserOut]).body,
+     lambda db: success_response(data=user_rows(db)).body),
+]
+
+
+def run(count: int, iterations: int):
+    seed(count)
+    print("=" * 60)
+    print(f"List envelope of {count} rows (best of {iterations})")
+    for name, orm, rows in CASES:
+        orm_time, orm_peak = measure(orm, iterations)
+        rows_time, rows_peak = measure(rows, iterations)
+        print(f"{name}:")
+        print(f"  orm:  {orm_time * 1000:9.1f} ms  peak {orm_peak / 2**20:7.1f} MiB")
+        print(f"  rows: {rows_time * 1000:9.1f} ms  peak {rows_peak / 2**20:7.1f} MiB")
+        print(f"  speedup {orm_time / rows_time:.1f}x, {orm_peak / rows_peak:.1f}x less memory")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ORM vs Core read rows for list endpoints")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.iterations)
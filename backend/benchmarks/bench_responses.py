@@ -0,0 +1,128 @@
+"""
+Benchmark for the response layer on list payloads.
+Renders a list of ORM rows into the {success, data, message} envelope three ways:
+  - legacy: Model.model_validate(row).model_dump(mode="json") per row + stdlib JSONResponse
+  - schema: success_response(data=rows, schema=List[Model]) (pydantic-core straight to bytes)
+  - msgpack: the same envelope negotiated as MessagePack (skipped if msgpack is missing)
+then times GET /courses/ end to end with the same number of courses seeded.
+Run: python benchmarks/bench_responses.py [--rows 1000] [--iterations 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Defaults so the benchmark runs without a .env file
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_responses.db')}"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_EXPIRATION_MINUTES", "30")
+os.environ.setdefault("LOG_RESPONSE_TIME", "false")
+
+from fastapi.responses import JSONResponse
+from core.response import EnvelopeResponse, _msgpack, success_response
+from models.progress import Progress
+from schemas.progress import ProgressOut
+
+
+def make_rows(count: int) -> List[Progress]:
+    now = datetime.utcnow()
+    return [
+        Progress(id=i, user_id=1, module_id=i, status="completed", created_at=now, updated_at=now)
+        for i in range(count)
+    ]
+
+
+def legacy(rows):
+    return JSONResponse(content={
+        "success": True,
+        "data": [ProgressOut.model_validate(r).model_dump(mode="json") for r in rows],
+        "message": "Progress retrieved successfully",
+    }).body
+
+
+def schema(rows):
+    return success_response(data=rows, schema=List[ProgressOut], message="Progress retrieved successfully").body
+
+
+def msgpack_body(response: EnvelopeResponse) -> bytes:
+    """Drive the ASGI call with an msgpack Accept header and capture the body sent."""
+    scope = {"type": "http", "headers": [(b"accept", b"application/msgpack")]}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            sent.append(message["body"])
+
+    asyncio.run(response(scope, receive, send))
+    return sent[0]
+
+
+def end_to_end(count: int, iterations: int) -> float:
+    """Median seconds for GET /courses/ with `count` courses seeded."""
+    from fastapi.testclient import TestClient
+    from core.database import SessionLocal, create_tables
+    from main import app
+    from models.course import Course
+    from services.user_service import create_access_token
+
+    create_tables()
+    db = SessionLocal()
+    db.add_all([Course(title=f"Course {i}", description="Benchmark course " * 8, instructor_name="Bench") for i in range(count)])
+    db.commit()
+    db.close()
+
+    token = create_access_token({"sub": "bench@example.com", "role": "premium", "id": 1})
+    headers = {"Authorization": f"Bearer {token}"}
+    timings = []
+    with TestClient(app) as client:
+        client.get("/courses/", headers=headers)
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = client.get("/courses/", headers=headers)
+            timings.append(time.perf_counter() - start)
+            assert len(response.json()["data"]) == count
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def run(count: int, iterations: int):
+    rows = make_rows(count)
+    legacy_bytes, schema_bytes = legacy(rows), schema(rows)
+
+    legacy_time = timeit.timeit(lambda: legacy(rows), number=iterations) / iterations
+    schema_time = timeit.timeit(lambda: schema(rows), number=iterations) / iterations
+
+    print("=" * 50)
+    print(f"Envelope of {count} ProgressOut rows x {iterations}")
+    print(f"  legacy:  {legacy_time * 1000:8.2f} ms  {len(legacy_bytes):>9} bytes")
+    print(f"  schema:  {schema_time * 1000:8.2f} ms  {len(schema_bytes):>9} bytes")
+    print(f"  speedup: {legacy_time / schema_time:8.1f}x")
+    if _msgpack() is not None:
+        packed_time = timeit.timeit(
+            lambda: msgpack_body(success_response(data=rows, schema=List[ProgressOut])), number=iterations
+        ) / iterations
+        packed = msgpack_body(success_response(data=rows, schema=List[ProgressOut]))
+        print(f"  msgpack: {packed_time * 1000:8.2f} ms  {len(packed):>9} bytes")
+    else:
+        print("  msgpack: not installed, skipped")
+    print(f"GET /courses/ with {count} courses (median of {iterations}): {end_to_end(count, iterations) * 1000:.2f} ms")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    run(args.rows, args.iterations)
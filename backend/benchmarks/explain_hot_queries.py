@@ -0,0 +1,221 @@
+"""
+Index report for the hot queries.
+Runs the service methods behind the busiest endpoints, captures the SQL they emit and
+prints its query plan (EXPLAIN QUERY PLAN on SQLite, EXPLAIN on Postgres), flagging any
+statement that falls back to a full table scan. Seed rows are written in a transaction
+that is rolled back, so it is safe to point at a real database. On Postgres sequential
+scans are disabled for the session, so a plan shows whether an index *can* serve the
+query rather than what the planner prefers for a nearly empty table.
+Run: python benchmarks/explain_hot_queries.py [--database-url URL]
+Exits with status 1 if any hot query scans a table.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import List, NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Statement(NamedTuple):
+    sql: str
+    plan: List[str]
+    full_scans: List[str]
+
+
+class QueryReport(NamedTuple):
+    name: str
+    statements: List[Statement]
+
+    @property
+    def uses_indexes(self) -> bool:
+        return all(not statement.full_scans for statement in self.statements)
+
+
+SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def _seed(db):
+    """Insert one row per hot table and return the ids the queries filter on."""
+    from models import (
+        ChatConversation, ChatMessage, Course, DailyUsage, MentorAvailability, MentorSession,
+        MockExam, Module, Progress, Quiz, StudyPlan, StudyPlanProgress, User
+    )
+    from models.chat import MessageRole
+    from models.mentor_session import SessionStatus
+    from models.mock_exam import MockExamDifficulty
+    from models.quiz import QuizDifficulty
+    from models.user import UserRole
+
+    student = User(email="explain-student@example.com", hashed_password="unused", name="Student", role=UserRole.FREE)
+    mentor = User(email="explain-mentor@example.com", hashed_password="unused", name="Mentor", role=UserRole.MENTOR)
+    course = Course(title="Explain", description="", instructor_name="")
+    db.add_all([student, mentor, course])
+    db.flush()
+
+    module = Module(title="Module", content_link="https://example.com", course_id=course.id)
+    plan = StudyPlan(user_id=student.id, certification="SC-300", certification_name="SC-300",
+                     duration_days=7, daily_hours=1.0, plan_content={})
+    conversation = ChatConversation(user_id=student.id, title="Explain")
+    db.add_all([module, plan, conversation])
+    db.flush()
+
+    db.add_all([
+        Progress(user_id=student.id, module_id=module.id, status="completed"),
+        StudyPlanProgress(user_id=student.id, study_plan_id=plan.id, day_number=1, is_completed=True),
+        ChatMessage(conversation_id=conversation.id, role=MessageRole.USER, content="hello"),
+        Quiz(user_id=student.id, certification="SC-300", topic="Identity",
+             difficulty=QuizDifficulty.BEGINNER, quiz_content={}),
+        MockExam(user_id=student.id, certification="SC-300",
+                 difficulty=MockExamDifficulty.BEGINNER, exam_content={}),
+        DailyUsage(user_id=student.id, date=date.today(), chat_messages_count=1, quiz_count=0),
+        MentorAvailability(mentor_id=mentor.id, day_of_week=0, start_time="09:00", end_time="17:00"),
+        MentorSession(mentor_id=mentor.id, student_id=student.id, title="Explain",
+                      scheduled_at=datetime.utcnow() + timedelta(days=1), price=10.0,
+                      status=SessionStatus.CONFIRMED),
+    ])
+    db.flush()
+    return {
+        "user_id": student.id,
+        "mentor_id": mentor.id,
+        "course_id": course.id,
+        "module_id": module.id,
+        "plan_id": plan.id,
+        "conversation_id": conversation.id,
+    }
+
+
+def hot_queries() -> List[tuple]:
+    """(name, callable(db, ids)) for the queries behind the busiest endpoints."""
+    from sqlalchemy import desc
+    from models import ChatMessage, Progress
+    from services.chat_service import ChatService
+    from services.mentor_service import MentorService
+    from services.mock_exam_service import MockExamService
+    from services.module_service import get_modules_by_course
+    from services.progress_service import get_module_progress
+    from services.quiz_service import QuizService
+    from services.quota_service import QuotaService
+    from services.study_plan_progress_service import StudyPlanProgressService
+    from services.study_plan_service import StudyPlanService
+
+    mentors = MentorService()
+    return [
+        ("quiz history", lambda db, ids: QuizService.get_user_quizzes(db, ids["user_id"])),
+        ("quiz count", lambda db, ids: QuizService.get_quiz_count(db, ids["user_id"])),
+        ("mock exam history", lambda db, ids: MockExamService.get_user_mock_exams(db, ids["user_id"])),
+        ("study plans", lambda db, ids: StudyPlanService.get_user_study_plans(db, ids["user_id"])),
+        ("study plan progress", lambda db, ids: StudyPlanProgressService.get_study_plan_progress(db, ids["user_id"], ids["plan_id"])),
+        ("chat conversations", lambda db, ids: ChatService.get_user_conversations(db, ids["user_id"])),
+        ("chat messages", lambda db, ids: db.query(ChatMessage).filter(ChatMessage.conversation_id == ids["conversation_id"]).all()),
+        ("course modules", lambda db, ids: get_modules_by_course(db, ids["course_id"])),
+        ("module progress", lambda db, ids: get_module_progress(db, ids["module_id"])),
+        ("dashboard completed modules", lambda db, ids: db.query(Progress).filter(
+            Progress.user_id == ids["user_id"], Progress.status == "completed").count()),
+        ("dashboard last viewed", lambda db, ids: db.query(Progress).filter(
+            Progress.user_id == ids["user_id"]).order_by(desc(Progress.updated_at)).first()),
+        ("daily usage", lambda db, ids: QuotaService.get_usage(db, ids["user_id"], QuotaService.CHAT_MESSAGES)),
+        ("mentor availability", lambda db, ids: mentors.get_mentor_availability(db, ids["mentor_id"])),
+        ("mentor sessions", lambda db, ids: mentors.get_mentor_sessions(db, ids["mentor_id"])),
+        ("student sessions", lambda db, ids: mentors.get_student_sessions(db, ids["user_id"])),
+        ("mentor dashboard", lambda db, ids: mentors.get_mentor_stats(db, ids["mentor_id"])),
+    ]
+
+
+def _explain(conn, sql: str, parameters) -> List[str]:
+    if conn.dialect.name == "postgresql":
+        rows = conn.exec_driver_sql("EXPLAIN " + sql, parameters).all()
+        return [row[0] for row in rows]
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, parameters).all()
+    return [row[-1] for row in rows]
+
+
+def _full_scans(dialect: str, plan: List[str]) -> List[str]:
+    pattern = POSTGRES_FULL_SCAN if dialect == "postgresql" else SQLITE_FULL_SCAN
+    return [match.group(1) for line in plan for match in [pattern.search(line.strip())] if match]
+
+
+def explain_hot_queries(engine, queries: List[tuple] = None) -> List[QueryReport]:
+    """Seed, run every hot query, explain each SELECT it issued, then roll everything back."""
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    queries = queries if queries is not None else hot_queries()
+    reports = []
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            if conn.dialect.name == "postgresql":
+                conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            db = Session(bind=conn, join_transaction_mode="create_savepoint")
+            ids = _seed(db)
+
+            captured = []
+
+            def capture(connection, cursor, statement, parameters, context, executemany):
+                if statement.lstrip().upper().startswith("SELECT"):
+                    captured.append((statement, parameters))
+
+            event.listen(conn, "before_cursor_execute", capture)
+            try:
+                for name, run in queries:
+                    captured.clear()
+                    db.expire_all()
+                    run(db, ids)
+                    issued = list(captured)
+                    statements = []
+                    for sql, parameters in issued:
+                        plan = _explain(conn, sql, parameters)
+                        statements.append(Statement(sql, plan, _full_scans(conn.dialect.name, plan)))
+                    reports.append(QueryReport(name, statements))
+            finally:
+                event.remove(conn, "before_cursor_execute", capture)
+            db.close()
+        finally:
+            transaction.rollback()
+    return reports
+
+
+def print_report(reports: List[QueryReport]):
+    for report in reports:
+        status = "ok  " if report.uses_indexes else "SCAN"
+        print(f"[{status}] {report.name}")
+        for statement in report.statements:
+            print("       " + " ".join(statement.sql.split())[:110])
+            for line in statement.plan:
+                print(f"         {line}")
+    scans = [report.name for report in reports if not report.uses_indexes]
+    print("=" * 50)
+    print(f"{len(reports) - len(scans)}/{len(reports)} hot queries use an index")
+    if scans:
+        print("Full table scans: " + ", ".join(scans))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot queries and check they use indexes")
+    parser.add_argument("--database-url", default=None, help="Database to explain against (default: a throwaway SQLite file)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'explain.db')}"
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("JWT_ALGORITHM", "HS256")
+    os.environ.setdefault("JWT_EXPIRATION_MINUTES", "30")
+    os.environ.setdefault("OPENAI_API_KEY", "unused")  # The services import the OpenAI client; nothing calls it
+
+    from core.database import create_tables, engine
+
+    create_tables()
+    reports = explain_hot_queries(engine)
+    print_report(reports)
+    sys.exit(0 if all(report.uses_indexes for report in reports) else 1)
+
+
+if __name__ == "__main__":
+    main()
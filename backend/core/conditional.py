@@ -0,0 +1,128 @@
+"""
+Conditional GET: cheap validators, 304 Not Modified and caching headers.
+
+A route opts in with dependencies=[Depends(conditional(validators_dependency))]. The
+validators dependency computes an ETag and/or Last-Modified from something cheap (a
+table version, count and max(updated_at) of the user's rows, a constant catalog)
+before the handler runs; a matching If-None-Match or If-Modified-Since is answered
+with 304 right there, so the body is never loaded or serialized. Otherwise the
+validators are stashed on the request and ConditionalHeadersMiddleware adds them to
+the handler's 200 response.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict, NamedTuple, Optional
+from fastapi import Depends, Request
+from core.response import _msgpack, _wants_msgpack
+
+# Authenticated, per-user data: caches must revalidate every time
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+class Validators(NamedTuple):
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None  # Naive datetimes are UTC, like the model columns
+
+
+class NotModified(Exception):
+    """Raised by conditional() to short-circuit a request; the handler in core.error_handlers sends the 304."""
+
+    def __init__(self, headers: Dict[str, str]):
+        self.headers = headers
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the parts that determine a response."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _utc(value: datetime) -> datetime:
+    value = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """If-None-Match wins when present (RFC 9110 13.2.2); If-Modified-Since is the fallback."""
+    if request.headers.get("if-none-match"):
+        return validators.etag is not None and etag_matches(request, validators.etag)
+    since = request.headers.get("if-modified-since")
+    if not since or validators.last_modified is None:
+        return False
+    try:
+        since_at = parsedate_to_datetime(since)
+    except (TypeError, ValueError):
+        return False
+    return _utc(validators.last_modified) <= _utc(since_at)
+
+
+def validator_headers(validators: Validators, cache_control: str = PRIVATE_REVALIDATE) -> Dict[str, str]:
+    headers = {"Cache-Control": cache_control}
+    if validators.etag:
+        headers["ETag"] = validators.etag
+    if validators.last_modified:
+        headers["Last-Modified"] = format_datetime(_utc(validators.last_modified), usegmt=True)
+    return headers
+
+
+def conditional(validators_dependency: Callable[..., Validators], cache_control: str = PRIVATE_REVALIDATE):
+    """
+    Route dependency answering conditional GETs from validators_dependency, itself a
+    FastAPI dependency (it can take the db session, current user and path parameters,
+    which the handler then shares). Returning Validators() with neither field skips
+    the check, e.g. when the user may not see the resource anyway.
+    """
+    async def check(request: Request, validators: Validators = Depends(validators_dependency)):
+        if request.method not in ("GET", "HEAD") or validators == Validators():
+            return
+        if validators.etag and request.url.query:
+            # One ETag per page, filter and so on
+            validators = validators._replace(etag=make_etag(validators.etag, request.url.query))
+        headers = {}
+        if _msgpack() is not None:
+            # Envelope routes negotiate MessagePack on Accept; keep one ETag per representation
+            headers["Vary"] = "Accept"
+            if validators.etag and _wants_msgpack(request.scope):
+                validators = validators._replace(etag=validators.etag[:-1] + '-msgpack"')
+        headers.update(validator_headers(validators, cache_control))
+        if is_not_modified(request, validators):
+            raise NotModified(headers)
+        request.state.conditional_headers = headers
+
+    return check
+
+
+class ConditionalHeadersMiddleware:
+    """Adds the validators stashed by conditional() to 200 responses that don't set their own."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_with_validators(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = scope.get("state", {}).get("conditional_headers")
+                if headers:
+                    present = {name.lower() for name, _ in message.get("headers", [])}
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in headers.items()
+                        if name.lower().encode("latin-1") not in present
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
@@ -5,10 +5,38 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Database Pool Configuration (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # Seconds to wait for a free connection before failing
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Replace connections older than this many seconds
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # Postgres statement_timeout per connection, 0 disables
+
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "true").lower() == "true"  # Disable when migrations run as a release step (python -m core.migrations)
+
+# Read Replica Configuration
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]  # Comma-separated, empty reads from the primary
+DB_REPLICA_HEALTH_CHECK_SECONDS = float(os.getenv("DB_REPLICA_HEALTH_CHECK_SECONDS", "10"))  # Minimum time between replica probes
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))  # Reads go to the primary this long after a user's own write
+
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
 JWT_EXPIRATION_MINUTES = int(os.getenv("JWT_EXPIRATION_MINUTES"))
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))  # Verified tokens kept in memory, 0 disables the cache
+JWT_CACHE_TTL_SECONDS = float(os.getenv("JWT_CACHE_TTL_SECONDS", "300"))  # Max time a verified token is trusted without re-checking its signature
 LOG_RESPONSE_TIME = os.getenv("LOG_RESPONSE_TIME", "true").lower() == "true"
+QUERY_STATS_HEADERS = os.getenv("QUERY_STATS_HEADERS", "true").lower() == "true"  # Send X-DB-Queries / X-DB-Time on responses
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))  # Identical statements per request before flagging a probable N+1
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))  # Statements at least this slow are logged and aggregated, 0 disables
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"  # Capture an EXPLAIN plan for each slow SELECT fingerprint
+SLOW_QUERY_MAX_FINGERPRINTS = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "500"))  # Distinct slow statements kept for /metrics/slow-queries
+
+# Password Hashing Configuration
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))  # Existing hashes with another cost are rehashed on login
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))  # Dedicated bcrypt threads
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))  # Hashes waiting beyond the workers before answering 503
 
 # Google OAuth2 Configuration
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
@@ -23,6 +51,45 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 OPENAI_MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "2500"))  # Increased for better content generation
 OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
 
+# Chat WebSocket Configuration
+CHAT_WS_MAX_PENDING_MESSAGES = int(os.getenv("CHAT_WS_MAX_PENDING_MESSAGES", "3"))  # Queued turns per connection before rejecting
+
+# Chat Archival Configuration
+CHAT_ARCHIVE_IDLE_DAYS = int(os.getenv("CHAT_ARCHIVE_IDLE_DAYS", "90"))  # Archive conversations idle longer than this
+CHAT_ARCHIVE_BATCH_SIZE = int(os.getenv("CHAT_ARCHIVE_BATCH_SIZE", "200"))  # Conversations per archival transaction
+
+# Quota Configuration
+# "database": every consume is an atomic upsert on daily_usage (safe with any number of workers)
+# "memory": counters live in process memory and are flushed to daily_usage in the background.
+#           Limits are enforced per process, so only use it with a single worker.
+QUOTA_BACKEND = os.getenv("QUOTA_BACKEND", "database").lower()
+QUOTA_FLUSH_INTERVAL_SECONDS = float(os.getenv("QUOTA_FLUSH_INTERVAL_SECONDS", "5"))
+
+# Entitlement Cache Configuration
+# Role/subscription lookups are cached per process and invalidated on change; the TTL
+# bounds how long another worker can serve a stale role
+ENTITLEMENT_CACHE_TTL_SECONDS = float(os.getenv("ENTITLEMENT_CACHE_TTL_SECONDS", "60"))
+ENTITLEMENT_CACHE_SIZE = int(os.getenv("ENTITLEMENT_CACHE_SIZE", "10000"))  # Users whose entitlements are kept in memory, least recently used dropped first
+
+# Profile Cache Configuration
+# Serialized /users/me and /users/profile payloads are cached per process and invalidated
+# on change; the TTL bounds how long another worker can serve a stale profile
+PROFILE_CACHE_TTL_SECONDS = float(os.getenv("PROFILE_CACHE_TTL_SECONDS", "30"))
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+
+# Conditional GET Configuration
+# Browser cache lifetime of static catalogs (e.g. /study-plans/certifications), which only change on deploy
+STATIC_CATALOG_MAX_AGE = int(os.getenv("STATIC_CATALOG_MAX_AGE", "3600"))
+
+# Pagination Configuration
+# Page size when a client sends ?cursor= without ?limit=, and the largest ?limit= it may ask for
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "500"))
+
+# Export Configuration
+# Rows fetched per round trip (and encoded per chunk) by the streaming admin exports
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
 # Stripe Configuration
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY")
 STRIPE_PUBLISHABLE_KEY = os.getenv("STRIPE_PUBLISHABLE_KEY")
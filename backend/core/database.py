@@ -1,20 +1,210 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from fastapi.requests import HTTPConnection
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.dialects import postgresql, sqlite
+from core import config
 from core.config import DATABASE_URL
+from core.pool_metrics import InstrumentedQueuePool, instrument_pool
+from core.replicas import READ_YOUR_WRITES_HEADER, ReplicaRouter
+from core.slow_queries import slow_query_log  # noqa: F401  (registers the slow-query cursor listeners)
+import logging
 
-engine = create_engine(DATABASE_URL)
+logger = logging.getLogger(__name__)
+
+def engine_options(url: str) -> dict:
+    """Pool and connection settings for create_engine, driven by config."""
+    if url.startswith("sqlite"):
+        return {}
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+    if url.startswith("postgresql") and config.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+instrument_pool(engine, "primary")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+@event.listens_for(SessionLocal, "after_commit")
+def _mark_committed(session):
+    session.info["committed"] = True
+    conn = session.info.get("connection")
+    if conn is not None and replica_router.enabled:
+        # Sent back as READ_YOUR_WRITES_HEADER by core.replicas.ReadYourWritesMiddleware
+        conn.state.read_your_writes_until = replica_router.pin_until()
+
+def request_user_id(conn: HTTPConnection):
+    """User id from the request's bearer token, or None; used to key read-your-writes pins."""
+    authorization = conn.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    from utils.auth import verify_token  # utils.auth imports models, which import this module
+    try:
+        return verify_token(token).user["id"]
+    except Exception:
+        return None
+
+def get_db(conn: HTTPConnection):
+    db = SessionLocal(info={"connection": conn})
     try:
         yield db
     finally:
+        saved = db.info.get("pk_lookups_saved", 0)
+        if saved:
+            logger.debug(f"Request-scoped loader saved {saved} duplicate primary-key lookup(s)")
+        if db.info.get("committed") and replica_router.enabled:
+            replica_router.pin(request_user_id(conn))
         db.close()
 
+def _use_replica(conn: HTTPConnection) -> bool:
+    return (
+        replica_router.enabled
+        and conn.scope.get("method") in ("GET", "HEAD")
+        and not replica_router.header_pinned(conn.headers.get(READ_YOUR_WRITES_HEADER))
+        and not replica_router.is_pinned(request_user_id(conn))
+    )
+
+def get_read_db(conn: HTTPConnection):
+    """
+    Session for read-only GET handlers: a healthy read replica in round-robin order,
+    or the primary when no replica is configured or healthy, or the user wrote recently.
+    """
+    replica = replica_router.choose() if _use_replica(conn) else None
+    db = replica.session_factory() if replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_session_factory(conn: HTTPConnection):
+    """
+    Session factory for streaming responses. Their body is produced after yield
+    dependencies have exited, so the stream opens and closes its own session; it
+    comes from the same replica-or-primary choice as get_read_db.
+    """
+    replica = replica_router.choose() if _use_replica(conn) else None
+    return replica.session_factory if replica else SessionLocal
+
+# Async engine, created on first use so the sync app does not need the async drivers
+_async_engine = None
+_async_session_factory = None
+
+def async_database_url(url: str):
+    """Map a sync DATABASE_URL to its async driver: asyncpg for Postgres, aiosqlite for SQLite."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        query = dict(parsed.query)
+        # asyncpg takes ssl instead of libpq's sslmode
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        return parsed.set(drivername="postgresql+asyncpg", query=query)
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite")
+    raise NotImplementedError(f"No async driver configured for {backend}")
+
+def create_async_engine_for(url: str):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    options = engine_options(url)
+    options.pop("poolclass", None)  # Async engines use AsyncAdaptedQueuePool
+    connect_args = options.pop("connect_args", None)
+    if connect_args and config.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}}
+    return create_async_engine(async_database_url(url), **options)
+
+def create_replica_engine(url: str):
+    options = engine_options(url)
+    options.pop("poolclass", None)  # Keep replica checkouts out of the primary's pool metrics
+    return create_engine(url, **options)
+
+replica_router = ReplicaRouter(
+    config.DATABASE_REPLICA_URLS,
+    engine_factory=create_replica_engine,
+    async_engine_factory=create_async_engine_for,
+    health_check_interval=config.DB_REPLICA_HEALTH_CHECK_SECONDS,
+    pin_seconds=config.DB_READ_YOUR_WRITES_SECONDS,
+)
+
+def get_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        
+        _async_engine = create_async_engine_for(DATABASE_URL)
+        instrument_pool(_async_engine.sync_engine, "primary_async")
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_engine
+
+async def get_async_db():
+    """Async counterpart of get_db yielding an AsyncSession"""
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+async def get_async_read_db(conn: HTTPConnection):
+    """Async counterpart of get_read_db"""
+    replica = replica_router.choose() if _use_replica(conn) else None
+    if replica is None:
+        get_async_engine()
+        factory = _async_session_factory
+    else:
+        factory = replica.async_session_factory()
+    async with factory() as db:
+        yield db
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+    await replica_router.dispose_async()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+def get_by_id(db: Session, model, id):
+    """
+    Load a row by primary key, memoized for the life of the session (one request).
+    Rows already loaded in this session and not expired by a commit are returned from
+    the identity map without a query; the number of lookups saved is kept in db.info.
+    """
+    if id is None:
+        return None
+    cached = db.identity_map.get(db.identity_key(model, id))
+    if cached is not None and not inspect(cached).expired:
+        db.info["pk_lookups_saved"] = db.info.get("pk_lookups_saved", 0) + 1
+        return cached
+    obj = db.get(model, id)
+    if obj is not None:
+        # The identity map only holds weak references; keep loaded rows alive
+        # until the session closes so later lookups can reuse them
+        db.info.setdefault("pk_loaded", []).append(obj)
+    return obj
+
+def dialect_insert(db: Session, table):
+    """
+    Return an INSERT construct for the session's dialect that supports
+    ON CONFLICT ... DO UPDATE (Postgres and SQLite)
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Upserts are not supported on {dialect}")
+
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    """Bring the schema up to date through the versioned migrations in core.migrations"""
+    from core.migrations import run_migrations
+    return run_migrations(engine)
 
 def recreate_tables():
     """Drop and recreate all tables - use for development only"""
@@ -1,9 +1,10 @@
 # core/error_handlers.py
 import traceback
 from datetime import datetime, timezone
-from fastapi import Request, status
+from fastapi import Request, Response, status
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from core.conditional import NotModified
 from core.response import error_response
 from core.logging_config import get_logger
 
@@ -53,6 +54,11 @@ def init_error_handlers(app):
             status_code=exc.status_code
         )
 
+    @app.exception_handler(NotModified)
+    async def not_modified_handler(request: Request, exc: NotModified):
+        # The client's cached copy is current: no body, just the validators
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=exc.headers)
+
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
         error_msg = "Invalid request format"
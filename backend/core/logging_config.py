@@ -2,12 +2,26 @@
 
 import sys
 from pathlib import Path
+import threading
 from loguru import logger
 
+_configured = False
+_configure_lock = threading.Lock()
+
 
 def setup_logging():
-    """Configure loguru for structured JSON logging."""
+    """Configure loguru for structured JSON logging. Only the first call has an effect."""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        _configure_handlers()
+        _configured = True
     
+    logger.info("Logging configuration initialized")
+
+
+def _configure_handlers():
     # Remove default handler
     logger.remove()
     
@@ -39,10 +53,6 @@ def setup_logging():
         backtrace=True,
         diagnose=True
     )
-    
-    # Log configuration complete
-    
-    logger.info("Logging configuration initialized")
 
 
 def get_logger():
@@ -4,17 +4,25 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from core import config
 from core.logging_config import get_logger
+from core.query_stats import start_request, stop_request
 
 logger = get_logger()
 
 class ResponseTimeMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         start_time = time.time()
-        response = await call_next(request)
+        stats, token = start_request(request.url.path)
+        try:
+            response = await call_next(request)
+        finally:
+            stop_request(token)
         process_time = (time.time() - start_time) * 1000  # milliseconds
 
         # Add header (preserve existing functionality)
         response.headers["X-Response-Time"] = f"{process_time:.2f}ms"
+        if config.QUERY_STATS_HEADERS:
+            response.headers["X-DB-Queries"] = str(stats.queries)
+            response.headers["X-DB-Time"] = f"{stats.milliseconds:.2f}ms"
 
         # Get client IP
         client_ip = request.client.host if request.client else "unknown"
@@ -28,11 +36,21 @@ class ResponseTimeMiddleware(BaseHTTPMiddleware):
             "process_time_ms": round(process_time, 2),
             "client_ip": client_ip,
             "query_params": str(request.url.query) if request.url.query else None,
-            "user_agent": request.headers.get("user-agent", "unknown")
+            "user_agent": request.headers.get("user-agent", "unknown"),
+            "db_queries": stats.queries,
+            "db_time_ms": round(stats.milliseconds, 2),
+            "n_plus_one": stats.n_plus_one or None
         }
         
         logger.info("Request processed", **log_data)
 
+        # Same statement repeated within one request: usually a query inside a loop
+        for suspect in log_data["n_plus_one"] or []:
+            logger.warning(
+                f"Probable N+1: statement ran {suspect['count']} times in {request.method} "
+                f"{request.url.path} from {suspect['call_site']}: {suspect['statement']}"
+            )
+
         # Legacy logging (preserve existing functionality)
         if config.LOG_RESPONSE_TIME:
             print(f"{request.method} {request.url.path} took {process_time:.2f}ms")
@@ -0,0 +1,206 @@
+"""
+Versioned schema migrations.
+
+Each migration runs once, in version order, inside a transaction, and is recorded in
+the schema_migrations table. A fresh database gets the whole current schema from the
+baseline, so every later migration must be idempotent (create with checkfirst, inspect
+before altering) to be a no-op there and only do work on databases that predate it.
+"""
+
+from datetime import datetime
+import logging
+from typing import Callable, List, NamedTuple
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for pg_advisory_xact_lock so only one worker migrates at a time
+MIGRATION_LOCK_KEY = 804_113_577
+
+_migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _baseline(conn: Connection):
+    """Every table, index and FTS object declared on the models."""
+    import models  # noqa: F401  (registers all tables on Base.metadata)
+    from core.database import Base
+
+    Base.metadata.create_all(bind=conn)
+
+
+def _chat_search(conn: Connection):
+    """Full-text search objects for chat_messages on databases created before chat search."""
+    from models.chat import SQLITE_FTS_STATEMENTS, chat_messages_fts_index
+
+    if conn.dialect.name == "postgresql":
+        chat_messages_fts_index.create(conn, checkfirst=True)
+    elif conn.dialect.name == "sqlite":
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chat_messages_fts'"
+        )).first()
+        if exists:
+            return
+        for statement in SQLITE_FTS_STATEMENTS:
+            conn.execute(text(statement))
+        # Index the messages written before the FTS table existed
+        conn.execute(text("INSERT INTO chat_messages_fts(chat_messages_fts) VALUES ('rebuild')"))
+
+
+def _chat_archive(conn: Connection):
+    from models.chat import ChatConversationArchive
+
+    ChatConversationArchive.__table__.create(conn, checkfirst=True)
+
+
+def _daily_usage_unique(conn: Connection):
+    """
+    Merge duplicate (user_id, date) rows left by the old read-then-insert counters,
+    then enforce one row per user per day, which the quota upsert relies on.
+    """
+    inspector = inspect(conn)
+    wanted = ["user_id", "date"]
+    if any(c["column_names"] == wanted for c in inspector.get_unique_constraints("daily_usage")) or any(
+        i["unique"] and i["column_names"] == wanted for i in inspector.get_indexes("daily_usage")
+    ):
+        return
+
+    duplicates = conn.execute(text(
+        "SELECT user_id, date, MIN(id) AS keep_id, SUM(chat_messages_count) AS chats, SUM(quiz_count) AS quizzes "
+        "FROM daily_usage GROUP BY user_id, date HAVING COUNT(*) > 1"
+    )).all()
+    for row in duplicates:
+        conn.execute(
+            text("UPDATE daily_usage SET chat_messages_count = :chats, quiz_count = :quizzes WHERE id = :keep_id"),
+            {"chats": row.chats, "quizzes": row.quizzes, "keep_id": row.keep_id},
+        )
+        conn.execute(
+            text("DELETE FROM daily_usage WHERE user_id = :user_id AND date = :date AND id <> :keep_id"),
+            {"user_id": row.user_id, "date": row.date, "keep_id": row.keep_id},
+        )
+    if duplicates:
+        logger.info(f"Merged {len(duplicates)} duplicate daily_usage day(s)")
+
+    conn.execute(text("CREATE UNIQUE INDEX uq_daily_usage_user_date ON daily_usage (user_id, date)"))
+
+
+# Composite indexes matched to the service queries; declared on the models, see
+# benchmarks/explain_hot_queries.py for the plans they produce
+HOT_QUERY_INDEXES = (
+    "ix_quizzes_user_created",
+    "ix_mock_exams_user_created",
+    "ix_study_plans_user_created",
+    "ix_study_plan_progress_user_plan_day",
+    "ix_chat_conversations_user_updated",
+    "ix_chat_messages_conversation_created",
+    "ix_modules_course_id",
+    "ix_progress_module_id",
+    "ix_progress_user_status_module",
+    "ix_progress_user_updated",
+    "ix_mentor_availability_mentor_day",
+    "ix_mentor_sessions_mentor_scheduled",
+    "ix_mentor_sessions_student_scheduled",
+    "ix_session_reviews_session_id",
+)
+
+
+def _hot_query_indexes(conn: Connection):
+    import models  # noqa: F401
+    from core.database import Base
+
+    indexes = {index.name: index for table in Base.metadata.tables.values() for index in table.indexes}
+    for name in HOT_QUERY_INDEXES:
+        indexes[name].create(conn, checkfirst=True)
+
+
+def _content_blobs(conn: Connection):
+    from models.content_blob import ContentBlob
+
+    ContentBlob.__table__.create(conn, checkfirst=True)
+
+
+def _table_versions(conn: Connection):
+    from models.table_version import TableVersion, VERSIONED_TABLES
+
+    table = TableVersion.__table__
+    table.create(conn, checkfirst=True)
+    existing = set(conn.execute(select(table.c.table_name)).scalars())
+    now = datetime.utcnow()
+    for name in sorted(VERSIONED_TABLES - existing):
+        conn.execute(table.insert().values(table_name=name, version=0, updated_at=now))
+
+
+def _users_created_at(conn: Connection):
+    """Signup time for admin exports. Existing users keep NULL: when they signed up was never recorded."""
+    from models.user import User
+
+    if "created_at" not in {c["name"] for c in inspect(conn).get_columns("users")}:
+        column_type = User.__table__.c.created_at.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE users ADD COLUMN created_at {column_type}"))
+    for index in User.__table__.indexes:
+        if index.name == "ix_users_created_at":
+            index.create(conn, checkfirst=True)
+
+
+def _users_version(conn: Connection):
+    """Row version that cached profiles and entitlements are validated against."""
+    if "version" not in {c["name"] for c in inspect(conn).get_columns("users")}:
+        conn.execute(text("ALTER TABLE users ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "chat_search", _chat_search),
+    Migration(3, "chat_archive", _chat_archive),
+    Migration(4, "daily_usage_unique", _daily_usage_unique),
+    Migration(5, "hot_query_indexes", _hot_query_indexes),
+    Migration(6, "content_blobs", _content_blobs),
+    Migration(7, "table_versions", _table_versions),
+    Migration(8, "users_created_at", _users_created_at),
+    Migration(9, "users_version", _users_version),
+]
+
+
+def applied_versions(conn: Connection) -> set:
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(engine: Engine, migrations: List[Migration] = MIGRATIONS) -> List[int]:
+    """Apply pending migrations in order; returns the versions applied."""
+    _migration_metadata.create_all(bind=engine)
+    applied = []
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        done = applied_versions(conn)
+        for migration in sorted(migrations, key=lambda m: m.version):
+            if migration.version in done:
+                continue
+            logger.info(f"Applying migration {migration.version}: {migration.name}")
+            migration.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+            ))
+            applied.append(migration.version)
+    return applied
+
+
+if __name__ == "__main__":
+    from core.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    applied = run_migrations(engine)
+    print(f"Applied migrations: {applied or 'none'}")
@@ -0,0 +1,176 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Each list is ordered by (sort_key, id) and a page is fetched with
+WHERE (sort_key, id) < (last_sort_key, last_id) ... LIMIT n + 1, so the database
+seeks straight to the page through the matching index instead of reading and
+discarding OFFSET rows, and the extra row tells whether there is a next page.
+The cursor handed to clients is an opaque base64 token of the last row's key.
+
+Lists that used to return every row still do unless the client asks for a page
+with ?limit= (page_params() has no default limit), so existing clients are not cut
+off; the per-user history lists page by default.
+
+Totals are optional: the first page of a list that fits on one page knows its
+total for free; otherwise it is counted only when asked for (include_total=true),
+and whole-table lists use the planner's row estimate on Postgres.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Tuple
+import orjson
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from core import config
+
+
+class PageInfo(BaseModel):
+    """The "page" object of every paginated response: pass next_cursor back as ?cursor= for the next page"""
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    limit: Optional[int] = None  # None: the whole list, unpaged
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
+class PageParams(NamedTuple):
+    cursor: Optional[str] = None
+    limit: Optional[int] = config.PAGE_SIZE_DEFAULT
+    include_total: bool = False
+
+
+class Page(NamedTuple):
+    items: list
+    info: PageInfo
+
+
+def page_params(default_limit: Optional[int] = None):
+    """
+    Dependency factory for the cursor, limit and include_total query parameters.
+    With no default_limit the list is unpaged until the client sends ?limit=
+    (a ?cursor= alone pages by PAGE_SIZE_DEFAULT).
+    """
+    def dependency(
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+        limit: Optional[int] = Query(default_limit, ge=1, le=config.PAGE_SIZE_MAX),
+        include_total: bool = Query(False, description="Count the whole list (approximate on large tables)"),
+    ) -> PageParams:
+        if limit is None and cursor:
+            limit = config.PAGE_SIZE_DEFAULT
+        return PageParams(cursor, limit, include_total)
+
+    return dependency
+
+
+def encode_cursor(sort_value: Any, id_value: int) -> str:
+    if isinstance(sort_value, datetime):
+        key = ["d", sort_value.isoformat(), id_value]
+    else:
+        key = ["v", sort_value, id_value]
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """(sort value, id) of a cursor; 400 for anything this module didn't produce."""
+    try:
+        kind, sort_value, id_value = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if kind == "d":
+            sort_value = datetime.fromisoformat(sort_value)
+        if kind not in ("d", "v") or not isinstance(id_value, int):
+            raise ValueError(kind)
+    except (ValueError, TypeError, orjson.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return sort_value, id_value
+
+
+class Keyset(NamedTuple):
+    """
+    Order of a list: sort column, then the primary key as tie-breaker. The sort
+    column must be non-null and both should lead an index on the filtered rows.
+    Pass the id column as sort too for lists ordered by id alone.
+    """
+    sort: Any
+    id: Any
+    descending: bool = True
+
+    def apply(self, statement, params: PageParams, skip: int = 0):
+        """Order, seek past the cursor and fetch one row more than the page."""
+        single = self.sort is self.id
+        if params.cursor:
+            sort_value, id_value = decode_cursor(params.cursor)
+            key = self.id if single else tuple_(self.sort, self.id)
+            bound = id_value if single else tuple_(sort_value, id_value)
+            statement = statement.where(key < bound if self.descending else key > bound)
+        elif skip:
+            # Legacy ?skip= paging; cursors are the fast path
+            statement = statement.offset(skip)
+        columns = [self.id] if single else [self.sort, self.id]
+        order = [column.desc() if self.descending else column.asc() for column in columns]
+        statement = statement.order_by(*order)
+        return statement if params.limit is None else statement.limit(params.limit + 1)
+
+    def cursor_for(self, row) -> str:
+        return encode_cursor(getattr(row, self.sort.key), getattr(row, self.id.key))
+
+
+def _count_statement(statement):
+    return select(func.count()).select_from(statement.order_by(None).subquery())
+
+
+def _estimate_statement(table_name: str):
+    return text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)").bindparams(name=table_name)
+
+
+def _page(rows: list, keyset: Keyset, params: PageParams, skip: int) -> Tuple[list, PageInfo]:
+    has_more = params.limit is not None and len(rows) > params.limit
+    items = rows[:params.limit]
+    info = PageInfo(
+        next_cursor=keyset.cursor_for(items[-1]) if has_more else None,
+        has_more=has_more,
+        limit=params.limit,
+    )
+    if not params.cursor and not skip and not has_more:
+        info.total = len(items)  # The whole list is on this page
+    return items, info
+
+
+def _rows(result, row_type) -> list:
+    if row_type is None:
+        return list(result.scalars().all())
+    return [row_type._make(row) for row in result]
+
+
+def paginate(
+    db: Session, statement, keyset: Keyset, params: PageParams,
+    row_type=None, skip: int = 0, estimate_table: Optional[str] = None
+) -> Page:
+    """
+    One page of statement: ORM objects for select(Model), or row_type (a read-model
+    NamedTuple) for a select of columns. estimate_table names the table of an
+    unfiltered list, whose total may then come from the Postgres planner estimate.
+    """
+    items, info = _page(_rows(db.execute(keyset.apply(statement, params, skip)), row_type), keyset, params, skip)
+    if params.include_total and info.total is None:
+        if estimate_table and db.get_bind().dialect.name == "postgresql":
+            estimate = db.execute(_estimate_statement(estimate_table)).scalar()
+            if estimate is not None and estimate >= 0:  # -1 until the table is first analyzed
+                info.total, info.total_is_estimate = int(estimate), True
+        if info.total is None:
+            info.total = db.execute(_count_statement(statement)).scalar_one()
+    return Page(items, info)
+
+
+async def apaginate(
+    db: AsyncSession, statement, keyset: Keyset, params: PageParams,
+    row_type=None, skip: int = 0
+) -> Page:
+    """Async counterpart of paginate for the per-user lists (totals are exact)."""
+    result = await db.execute(keyset.apply(statement, params, skip))
+    items, info = _page(_rows(result, row_type), keyset, params, skip)
+    if params.include_total and info.total is None:
+        info.total = (await db.execute(_count_statement(statement))).scalar_one()
+    return Page(items, info)
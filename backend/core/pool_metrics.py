@@ -0,0 +1,120 @@
+"""Connection pool instrumentation: checkout wait time and pool event counters."""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Thread-safe counters for one engine's pool, fed by InstrumentedQueuePool and pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.soft_invalidations = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.waits = 0
+
+    def incr(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            data = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / self.waits * 1000, 3) if self.waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+        data["pool_class"] = type(pool).__name__
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+            })
+        return data
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection in its engine's PoolMetrics."""
+
+    _local = threading.local()
+    metrics: Optional[PoolMetrics] = None
+
+    def recreate(self):
+        # engine.dispose() swaps in a recreated pool; keep reporting to the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        # QueuePool._do_get recurses; only time the outermost call
+        if self.metrics is None or getattr(self._local, "timing", False):
+            return super()._do_get()
+        self._local.timing = True
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        finally:
+            self._local.timing = False
+        self.metrics.record_wait(time.perf_counter() - start)
+        return record
+
+
+# Engines reported by GET /metrics/db-pool, by name
+instrumented_engines: Dict[str, Tuple[object, PoolMetrics]] = {}
+
+
+def instrument_pool(engine, name: Optional[str] = None) -> PoolMetrics:
+    """
+    Count pool lifecycle events for an engine in a PoolMetrics of its own. Named
+    engines are listed by pool_snapshots().
+    """
+    metrics = PoolMetrics()
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+    event.listen(engine, "connect", lambda *args: metrics.incr("connects"))
+    event.listen(engine, "checkout", lambda *args: metrics.incr("checkouts"))
+    event.listen(engine, "checkin", lambda *args: metrics.incr("checkins"))
+    event.listen(engine, "invalidate", lambda *args: metrics.incr("invalidations"))
+    event.listen(engine, "soft_invalidate", lambda *args: metrics.incr("soft_invalidations"))
+    if name is not None:
+        instrumented_engines[name] = (engine, metrics)
+    return metrics
+
+
+def pool_snapshots() -> dict:
+    """Snapshot of every named engine's pool, keyed by name."""
+    return {name: metrics.snapshot(engine.pool) for name, (engine, metrics) in list(instrumented_engines.items())}
@@ -0,0 +1,38 @@
+"""Serving stored gzip payloads without recompressing them."""
+
+import gzip
+from fastapi import Request, Response
+from core.conditional import PRIVATE_REVALIDATE, etag_matches
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Whether Accept-Encoding allows gzip (explicitly or via *) with a non-zero q."""
+    header = request.headers.get("accept-encoding", "")
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip().removeprefix("q=")
+        try:
+            return not params or float(q) > 0
+        except ValueError:
+            return True
+    return False
+
+
+def precompressed_response(request: Request, sha256: str, payload: bytes, media_type: str = "application/json") -> Response:
+    """
+    Send a gzip payload as-is to clients that accept gzip, decompressed otherwise.
+    Each encoding gets its own strong ETag, and If-None-Match is answered with 304.
+    """
+    use_gzip = accepts_gzip(request)
+    etag = f'"{sha256}-gzip"' if use_gzip else f'"{sha256}"'
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": PRIVATE_REVALIDATE}
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=payload, media_type=media_type, headers=headers)
+    return Response(content=gzip.decompress(payload), media_type=media_type, headers=headers)
@@ -0,0 +1,110 @@
+"""
+Per-request SQL statistics: query count, total database time and probable N+1 patterns.
+
+Cursor events on every Engine feed the RequestQueryStats bound to the current request
+through a context variable; ResponseTimeMiddleware opens and reports it. Sync handlers
+run in a worker thread with a copy of the request context, so their queries land in the
+same object.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from core import config
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+
+_current: ContextVar[Optional["RequestQueryStats"]] = ContextVar("request_query_stats", default=None)
+
+
+def _call_site() -> Optional[str]:
+    """The innermost application frame outside SQLAlchemy and this module, as path:line in function."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_APP_ROOT) and filename != _THIS_FILE and "site-packages" not in filename:
+            return f"{os.path.relpath(filename, _APP_ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class RequestQueryStats:
+    """Counters for one request. A statement seen n_plus_one_threshold times is flagged once."""
+
+    def __init__(self, n_plus_one_threshold: int, path: Optional[str] = None):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.path = path
+        self.queries = 0
+        self.seconds = 0.0
+        self._shapes: Dict[str, int] = {}
+        self._flagged: List[tuple] = []  # (statement, call site)
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float):
+        with self._lock:
+            self.queries += 1
+            self.seconds += seconds
+            count = self._shapes.get(statement, 0) + 1
+            self._shapes[statement] = count
+        # Bound parameters keep the statement text identical across repeats, so the
+        # text is the shape; the stack is only walked once per flagged shape
+        if count == self.n_plus_one_threshold:
+            call_site = _call_site()
+            with self._lock:
+                self._flagged.append((statement, call_site))
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+    @property
+    def n_plus_one(self) -> List[dict]:
+        with self._lock:
+            return [
+                {"statement": " ".join(statement.split())[:200], "count": self._shapes[statement], "call_site": call_site}
+                for statement, call_site in self._flagged
+            ]
+
+
+def start_request(path: Optional[str] = None):
+    """Begin collecting for the current request; returns (stats, token for stop_request)."""
+    stats = RequestQueryStats(config.N_PLUS_ONE_THRESHOLD, path)
+    return stats, _current.set(stats)
+
+
+def stop_request(token):
+    _current.reset(token)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    stats.record(statement, time.perf_counter() - starts.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
@@ -0,0 +1,205 @@
+"""Read-replica routing: round-robin over healthy replicas with read-your-writes pinning."""
+
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Response header carrying a read-your-writes pin (unix time it lasts until); clients
+# echo it on later requests so the pin holds whichever worker serves them
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+
+class ReplicaWriteError(RuntimeError):
+    """Raised when a session bound to a read replica tries to flush changes."""
+
+
+class ReplicaSession(Session):
+    """Session bound to a read replica; flushing raises ReplicaWriteError."""
+
+
+@event.listens_for(ReplicaSession, "before_flush")
+def _reject_writes(session, flush_context, instances):
+    raise ReplicaWriteError("Read-replica sessions are read-only; use get_db for writes")
+
+
+class Replica:
+    """One replica URL with its engine, session factories and last known health."""
+
+    def __init__(self, url: str, engine, async_engine_factory: Callable):
+        self.url = url
+        self.engine = engine
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=ReplicaSession)
+        self.healthy = True
+        self._async_engine_factory = async_engine_factory
+        self._async_engine = None
+        self._async_session_factory = None
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    def async_session_factory(self):
+        if self._async_session_factory is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+
+            self._async_engine = self._async_engine_factory(self.url)
+            self._async_session_factory = async_sessionmaker(
+                self._async_engine, expire_on_commit=False, autoflush=False, sync_session_class=ReplicaSession
+            )
+        return self._async_session_factory
+
+    async def dispose_async(self):
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+            self._async_session_factory = None
+
+
+class ReplicaRouter:
+    """
+    Picks a replica for read-only requests.
+    Replicas are probed with SELECT 1 at most once per health-check interval, on a
+    background thread started by whichever request notices the check is due, so choose()
+    never waits on a connect; unhealthy replicas are skipped until a later probe succeeds.
+    When no replica is healthy, callers fall back to the primary.
+    A user is pinned to the primary for a short window after their own write so they
+    never read data older than what they just saved. pin() only covers this process;
+    the READ_YOUR_WRITES_HEADER round trip (see header_pinned) covers the other workers.
+    """
+
+    def __init__(self, urls: List[str], engine_factory: Callable, async_engine_factory: Callable,
+                 health_check_interval: float, pin_seconds: float):
+        self.replicas = [Replica(url, engine_factory(url), async_engine_factory) for url in urls]
+        self.health_check_interval = health_check_interval
+        self.pin_seconds = pin_seconds
+        self._counter = itertools.count()
+        self._health_lock = threading.Lock()
+        self._last_health_check = time.monotonic()
+        self._pins_lock = threading.Lock()
+        self._pins: Dict[object, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def pin(self, key):
+        """Route `key`'s reads to the primary for the next pin_seconds."""
+        if not self.enabled or key is None or self.pin_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._pins_lock:
+            self._pins[key] = now + self.pin_seconds
+            # Drop expired pins opportunistically so the map stays small
+            if len(self._pins) > 1024:
+                self._pins = {k: until for k, until in self._pins.items() if until > now}
+
+    def is_pinned(self, key) -> bool:
+        if key is None:
+            return False
+        with self._pins_lock:
+            until = self._pins.get(key)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._pins[key]
+                return False
+            return True
+
+    def header_pinned(self, value: Optional[str]) -> bool:
+        """
+        Whether a READ_YOUR_WRITES_HEADER value echoed by the client is still running.
+        Only the next pin_seconds count, so a client cannot pin itself for longer.
+        """
+        if not value or self.pin_seconds <= 0:
+            return False
+        try:
+            until = float(value)
+        except ValueError:
+            return False
+        now = time.time()
+        return now < until <= now + self.pin_seconds
+
+    def pin_until(self) -> float:
+        """Unix time a pin made now lasts until, for READ_YOUR_WRITES_HEADER."""
+        return time.time() + self.pin_seconds
+
+    def check_health(self):
+        """Probe every replica and record whether it answered."""
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                if not replica.healthy:
+                    logger.info(f"Read replica {replica.name} is healthy again")
+                replica.healthy = True
+            except Exception as e:
+                if replica.healthy:
+                    logger.warning(f"Read replica {replica.name} failed its health check: {str(e)}")
+                replica.healthy = False
+        self._last_health_check = time.monotonic()
+
+    def _maybe_check_health(self):
+        if time.monotonic() - self._last_health_check < self.health_check_interval:
+            return
+        # One probe at a time; requests keep using the last known state meanwhile
+        if self._health_lock.acquire(blocking=False):
+            threading.Thread(target=self._probe, name="replica-health-check", daemon=True).start()
+
+    def _probe(self):
+        try:
+            self.check_health()
+        finally:
+            self._health_lock.release()
+
+    def choose(self) -> Optional[Replica]:
+        """Return the next healthy replica in round-robin order, or None."""
+        if not self.enabled:
+            return None
+        self._maybe_check_health()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def clear_pins(self):
+        with self._pins_lock:
+            self._pins.clear()
+
+    def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+    async def dispose_async(self):
+        for replica in self.replicas:
+            await replica.dispose_async()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Adds READ_YOUR_WRITES_HEADER to responses of requests that committed a write on the
+    primary (core.database records the pin in scope["state"] at commit time).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start":
+                until = scope.get("state", {}).get("read_your_writes_until")
+                if until:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (READ_YOUR_WRITES_HEADER.lower().encode("latin-1"), f"{until:.3f}".encode("latin-1"))
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
@@ -1,23 +1,117 @@
 # core/response.py
 
-from fastapi.responses import JSONResponse
+from functools import lru_cache
+from typing import Any, Generic, Optional, TypeVar
+import orjson
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_jsonable_python
+from starlette.responses import Response
+from core.pagination import PageInfo
 
-def success_response(data=None, message="Success", status_code=200):
-    return JSONResponse(
+T = TypeVar("T")
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+class Envelope(BaseModel, Generic[T]):
+    """Body of every success_response/error_response; use as response_model so the docs match"""
+    success: bool
+    data: Optional[T] = None
+    message: str
+    page: Optional[PageInfo] = None  # Only on paginated lists
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+@lru_cache(maxsize=1)
+def _msgpack():
+    """The msgpack module when installed; MessagePack responses are optional."""
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return msgpack
+
+
+def _default(obj):
+    """orjson fallback: NamedTuple read rows become objects, anything else goes through pydantic."""
+    if isinstance(obj, tuple) and hasattr(obj, "_asdict"):
+        return obj._asdict()
+    return to_jsonable_python(obj)
+
+
+def _serialize_data(data: Any, schema) -> bytes:
+    """
+    JSON bytes for the envelope's data. With a schema, ORM rows are validated and dumped
+    by pydantic-core in one pass; without, plain data and read rows go through orjson.
+    """
+    if schema is not None:
+        adapter = _adapter(schema)
+        return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _wants_msgpack(scope) -> bool:
+    for name, value in scope.get("headers", []):
+        if name == b"accept":
+            accept = value.decode("latin-1").lower()
+            return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+    return False
+
+
+class EnvelopeResponse(Response):
+    """
+    {success, data, message[, page]} rendered straight to bytes. JSON by default; clients
+    that send Accept: application/msgpack get the same envelope as MessagePack when the
+    msgpack package is installed.
+    """
+    media_type = "application/json"
+
+    def __init__(
+        self, success: bool, data: Any = None, message: str = "", status_code: int = 200,
+        schema=None, page: Optional[PageInfo] = None
+    ):
+        body = b"".join((
+            b'{"success":', b"true" if success else b"false",
+            b',"data":', _serialize_data(data, schema),
+            b',"message":', orjson.dumps(message),
+            b',"page":' + page.model_dump_json().encode() if page is not None else b"",
+            b"}",
+        ))
+        super().__init__(content=body, status_code=status_code)
+
+    async def __call__(self, scope, receive, send):
+        msgpack = _msgpack()
+        if msgpack is not None:
+            self.headers.append("Vary", "Accept")
+            if _wants_msgpack(scope):
+                self.body = msgpack.packb(orjson.loads(self.body))
+                self.headers["content-type"] = MSGPACK_MEDIA_TYPES[0]
+                self.headers["content-length"] = str(len(self.body))
+                etag = self.headers.get("etag")
+                if etag:
+                    self.headers["etag"] = etag[:-1] + '-msgpack"'
+        await super().__call__(scope, receive, send)
+
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """Plain (non-envelope) JSON via orjson, for routers that return bare objects."""
+    return Response(
+        content=orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS),
         status_code=status_code,
-        content={
-            "success": True,
-            "data": data,
-            "message": message
-        }
+        media_type="application/json",
     )
 
+
+def success_response(data=None, message="Success", status_code=200, schema=None, page=None):
+    """
+    Envelope with success=True. Pass schema (e.g. List[CourseOut]) to serialize ORM rows
+    directly, and page (core.pagination.PageInfo) for a page of a paginated list.
+    """
+    return EnvelopeResponse(True, data, message, status_code, schema, page)
+
 def error_response(message="An error occurred", status_code=400, data=None):
-    return JSONResponse(
-        status_code=status_code,
-        content={
-            "success": False,
-            "data": data,
-            "message": message
-        }
-    )
+    return EnvelopeResponse(False, data, message, status_code)
@@ -0,0 +1,190 @@
+"""
+Slow-query log.
+
+Every statement slower than SLOW_QUERY_MS is logged with its parameters redacted and
+the path of the request that issued it, and aggregated under a normalized fingerprint
+(literals and placeholders replaced by ?). The first time a SELECT fingerprint turns up
+slow its plan is captured with EXPLAIN on a background thread, so the request that hit
+it never waits on the extra round trip. GET /metrics/slow-queries lists the worst
+fingerprints by total time.
+"""
+
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from core import config
+from core.query_stats import current_stats
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def _strip_literals(text: str) -> str:
+    text = _STRING_LITERAL.sub("?", text)
+    return _NUMBER_LITERAL.sub("?", text)
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape: literals and bind placeholders become ?, IN lists collapse to (...)."""
+    normalized = _PLACEHOLDER.sub("?", _strip_literals(statement))
+    normalized = _IN_LIST.sub("(...)", normalized)
+    return " ".join(normalized.split())
+
+
+def redact_parameters(parameters, executemany: bool = False):
+    """Parameter shape with every value hidden; values can hold emails, tokens and message text."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: "?" for key in parameters}
+    if isinstance(parameters, (list, tuple)):
+        return ["?"] * len(parameters)
+    return None
+
+
+class SlowQueryLog:
+    """Thread-safe per-fingerprint totals for slow statements, plus one captured plan each."""
+
+    def __init__(self, max_fingerprints: int = 500):
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._entries: Dict[str, dict] = {}
+
+    def record(self, conn, statement: str, parameters, executemany: bool, seconds: float):
+        key = fingerprint(statement)
+        milliseconds = seconds * 1000
+        stats = current_stats()
+        path = stats.path if stats else None
+        logger.warning(
+            f"Slow query ({milliseconds:.1f}ms) on {path or 'no request'}: {key} "
+            f"params={redact_parameters(parameters, executemany)}"
+        )
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    # Make room by forgetting the cheapest fingerprint
+                    del self._entries[min(self._entries, key=lambda k: self._entries[k]["total_ms"])]
+                entry = self._entries[key] = {
+                    "fingerprint": key,
+                    "calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "last_path": None,
+                    "last_seen": None,
+                    "plan": None,
+                    "plan_pending": False,
+                }
+            entry["calls"] += 1
+            entry["total_ms"] += milliseconds
+            entry["max_ms"] = max(entry["max_ms"], milliseconds)
+            entry["last_path"] = path
+            entry["last_seen"] = datetime.now(timezone.utc).isoformat()
+            explain = (
+                config.SLOW_QUERY_EXPLAIN
+                and entry["plan"] is None
+                and not entry["plan_pending"]
+                and not executemany
+                and not conn.dialect.is_async  # The async driver's engine can't be used from a plain thread
+                and statement.lstrip().upper().startswith("SELECT")
+            )
+            if explain:
+                entry["plan_pending"] = True
+
+        if explain:
+            self._explain_in_background(conn.engine, key, statement, parameters)
+
+    def _explain_in_background(self, engine: Engine, key: str, statement: str, parameters):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+            executor = self._executor
+        executor.submit(self._capture_plan, engine, key, statement, parameters)
+
+    def _capture_plan(self, engine: Engine, key: str, statement: str, parameters):
+        try:
+            with engine.connect() as conn:
+                conn.info["explaining"] = True
+                try:
+                    if conn.dialect.name == "postgresql":
+                        rows = conn.exec_driver_sql("EXPLAIN (ANALYZE off) " + statement, parameters).all()
+                        plan = [row[0] for row in rows]
+                    else:
+                        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+                        plan = [row[-1] for row in rows]
+                finally:
+                    conn.info.pop("explaining", None)
+        except Exception as e:
+            logger.warning(f"Could not EXPLAIN slow query {key}: {e}")
+            plan = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # Postgres plans inline the bound values in filter conditions
+                entry["plan"] = [_strip_literals(line) for line in plan] if plan else None
+                entry["plan_pending"] = False
+
+    def top(self, limit: int = 20) -> List[dict]:
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: e["total_ms"], reverse=True)[:limit]
+            return [
+                {
+                    "fingerprint": e["fingerprint"],
+                    "calls": e["calls"],
+                    "total_ms": round(e["total_ms"], 2),
+                    "avg_ms": round(e["total_ms"] / e["calls"], 2),
+                    "max_ms": round(e["max_ms"], 2),
+                    "last_path": e["last_path"],
+                    "last_seen": e["last_seen"],
+                    "plan": list(e["plan"]) if e["plan"] else None,
+                }
+                for e in entries
+            ]
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+slow_query_log = SlowQueryLog(config.SLOW_QUERY_MAX_FINGERPRINTS)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if config.SLOW_QUERY_MS > 0 and not conn.info.get("explaining"):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("slow_query_start")
+    if not starts:
+        return
+    seconds = time.perf_counter() - starts.pop()
+    if seconds * 1000 >= config.SLOW_QUERY_MS:
+        slow_query_log.record(conn, statement, parameters, executemany, seconds)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("slow_query_start"):
+        conn.info["slow_query_start"].pop()
@@ -1,28 +1,55 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.sessions import SessionMiddleware
-from routers import health, user, courses, module, progress, notifications, google_auth, dashboard, chat, study_plan, study_plan_progress, quiz, mock_exam, payment, mentor_sessions
-from core.database import create_tables
+from routers import health, user, courses, module, progress, notifications, google_auth, dashboard, chat, study_plan, study_plan_progress, quiz, mock_exam, payment, mentor_sessions, metrics
+from core.database import create_tables, SessionLocal, dispose_async_engine
 from core.error_handlers import init_error_handlers
+from core.conditional import ConditionalHeadersMiddleware
+from core.replicas import READ_YOUR_WRITES_HEADER, ReadYourWritesMiddleware
 from core.middleware import ResponseTimeMiddleware
+from core.slow_queries import slow_query_log
 from core import config
+from services.quota_service import memory_quota
 
 # Import logging configuration before app startup
 from core.logging_config import get_logger
 
 # Initialize logger
 logger = get_logger()
-logger.info("Starting FastAPI LMS application")
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup and shutdown. Nothing here runs at import, so importing main (tests,
+    tooling, worker boot) touches neither the database nor the network.
+    """
+    logger.info("Starting FastAPI LMS application")
+    
+    if config.RUN_MIGRATIONS_ON_STARTUP:
+        try:
+            applied = await run_in_threadpool(create_tables)
+            logger.info(f"Database schema up to date (applied migrations: {applied or 'none'})")
+        except Exception as e:
+            logger.error(f"Failed to apply database migrations: {e}")
+            # Continue startup even if migrations fail
+    
+    if config.QUOTA_BACKEND == "memory":
+        memory_quota.start(SessionLocal, config.QUOTA_FLUSH_INTERVAL_SECONDS)
+    
+    # Warm the OAuth client in the background rather than delaying readiness
+    warm_oauth = asyncio.create_task(google_auth.warm_google_metadata())
+    
+    yield
+    
+    warm_oauth.cancel()
+    memory_quota.stop()
+    slow_query_log.shutdown()
+    await dispose_async_engine()
 
-# Initialize database tables
-try:
-    create_tables()
-    logger.info("Database tables created successfully")
-except Exception as e:
-    logger.error(f"Failed to create database tables: {e}")
-    # Continue startup even if table creation fails
+app = FastAPI(lifespan=lifespan)
 
 init_error_handlers(app)
 
@@ -37,6 +64,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[READ_YOUR_WRITES_HEADER],
 )
 
 # Middleware order as specified:
@@ -46,6 +74,12 @@ app.add_middleware(SessionMiddleware, secret_key=config.SESSION_SECRET_KEY)
 # 2. Logging middleware (ResponseTimeMiddleware with integrated logging)
 app.add_middleware(ResponseTimeMiddleware)
 
+# 3. ETag/Last-Modified headers from conditional() on 200 responses
+app.add_middleware(ConditionalHeadersMiddleware)
+
+# 4. Read-your-writes pin header for requests that wrote to the primary
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Include Routers
 app.include_router(health.router)
 app.include_router(user.router)
@@ -62,6 +96,7 @@ app.include_router(quiz.router)
 app.include_router(mock_exam.router)
 app.include_router(payment.router)
 app.include_router(mentor_sessions.router)
+app.include_router(metrics.router)
 # AI router removed - OpenAI service available for future use
 
 if __name__ == "__main__":
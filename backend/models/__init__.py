@@ -4,12 +4,14 @@ from .course import Course
 from .module import Module
 from .progress import Progress
 from .notification import Notification
-from .chat import ChatConversation, ChatMessage
+from .chat import ChatConversation, ChatMessage, ChatConversationArchive
 from .daily_usage import DailyUsage
 from .study_plan import StudyPlan
 from .study_plan_progress import StudyPlanProgress
 from .quiz import Quiz
 from .mock_exam import MockExam
+from .content_blob import ContentBlob
+from .table_version import TableVersion
 from .mentor_session import MentorSession, MentorAvailability, MentorProfile, SessionReview, SessionStatus
 
-__all__ = ['User', 'Course', 'Module', 'Progress', 'Notification', 'ChatConversation', 'ChatMessage', 'DailyUsage', 'StudyPlan', 'StudyPlanProgress', 'Quiz', 'MockExam', 'MentorSession', 'MentorAvailability', 'MentorProfile', 'SessionReview', 'SessionStatus']
\ No newline at end of file
+__all__ = ['User', 'Course', 'Module', 'Progress', 'Notification', 'ChatConversation', 'ChatMessage', 'ChatConversationArchive', 'DailyUsage', 'StudyPlan', 'StudyPlanProgress', 'Quiz', 'MockExam', 'ContentBlob', 'TableVersion', 'MentorSession', 'MentorAvailability', 'MentorProfile', 'SessionReview', 'SessionStatus']
\ No newline at end of file
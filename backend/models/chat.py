@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, LargeBinary, Index, DDL, event, func
 from sqlalchemy.orm import relationship
 from core.database import Base
 from datetime import datetime
@@ -20,6 +20,10 @@ class ChatConversation(Base):
     # Relationships
     user = relationship("User")
     messages = relationship("ChatMessage", back_populates="conversation", cascade="all, delete-orphan")
+    archive = relationship("ChatConversationArchive", uselist=False, cascade="all, delete-orphan")
+    
+    # Conversation list: WHERE user_id = ? ORDER BY updated_at DESC
+    __table_args__ = (Index("ix_chat_conversations_user_updated", "user_id", "updated_at"),)
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
@@ -31,4 +35,53 @@ class ChatMessage(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
-    conversation = relationship("ChatConversation", back_populates="messages")
\ No newline at end of file
+    conversation = relationship("ChatConversation", back_populates="messages")
+    
+    # Loading a conversation's messages, and the last-message age used by archiving
+    __table_args__ = (Index("ix_chat_messages_conversation_created", "conversation_id", "created_at"),)
+
+class ChatConversationArchive(Base):
+    """
+    Cold storage for idle conversations: all messages of the conversation serialized
+    to JSON and compressed into a single blob. The ChatConversation row itself stays
+    in place so listings keep working; its messages are restored on first access.
+    """
+    __tablename__ = "chat_conversation_archives"
+
+    conversation_id = Column(Integer, ForeignKey("chat_conversations.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    message_count = Column(Integer, nullable=False)
+    codec = Column(String(10), nullable=False, default="zlib")
+    original_size = Column(Integer, nullable=False)  # Uncompressed JSON size in bytes
+    payload = Column(LargeBinary, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+# Full-text search over message content. Both indexes are maintained by the database
+# on every insert/update/delete, so nothing ever has to be rebuilt.
+# Postgres: GIN expression index over to_tsvector('english', content)
+chat_messages_fts_index = Index(
+    "ix_chat_messages_content_fts",
+    func.to_tsvector("english", ChatMessage.content),
+    postgresql_using="gin"
+).ddl_if(dialect="postgresql")
+
+# SQLite (dev/tests): external-content FTS5 table kept in sync by triggers
+SQLITE_FTS_STATEMENTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chat_messages_fts "
+    "USING fts5(content, content='chat_messages', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_ai AFTER INSERT ON chat_messages BEGIN "
+    "INSERT INTO chat_messages_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_ad AFTER DELETE ON chat_messages BEGIN "
+    "INSERT INTO chat_messages_fts(chat_messages_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_au AFTER UPDATE OF content ON chat_messages BEGIN "
+    "INSERT INTO chat_messages_fts(chat_messages_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+    "INSERT INTO chat_messages_fts(rowid, content) VALUES (new.id, new.content); END",
+)
+for _statement in SQLITE_FTS_STATEMENTS:
+    event.listen(ChatMessage.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    ChatMessage.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS chat_messages_fts").execute_if(dialect="sqlite")
+)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, UniqueConstraint
+from core.database import Base
+from datetime import datetime
+
+class ContentBlob(Base):
+    """
+    Pre-rendered detail response of a generated quiz, mock exam or study plan: the
+    canonical JSON compressed once with gzip, plus its SHA-256 for the ETag. The blob
+    is tied to the source row's updated_at, so submitting a quiz makes it stale and
+    the next read rebuilds it.
+    """
+    __tablename__ = "content_blobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20), nullable=False)  # quiz, mock_exam, study_plan
+    object_id = Column(Integer, nullable=False)
+    source_updated_at = Column(DateTime, nullable=True)
+    sha256 = Column(String(64), nullable=False)  # Of the uncompressed JSON
+    codec = Column(String(10), nullable=False, default="gzip")
+    original_size = Column(Integer, nullable=False)  # Uncompressed JSON size in bytes
+    payload = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (UniqueConstraint("kind", "object_id", name="uq_content_blobs_kind_object"),)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Date, ForeignKey
+from sqlalchemy import Column, Integer, Date, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from core.database import Base
 from datetime import date
@@ -17,5 +17,6 @@ class DailyUsage(Base):
     
     # Composite unique constraint to ensure one record per user per day
     __table_args__ = (
+        UniqueConstraint('user_id', 'date', name='uq_daily_usage_user_date'),
         {'sqlite_autoincrement': True},
     )
\ No newline at end of file
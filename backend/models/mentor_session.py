@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Float, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Float, Enum, Index
 from sqlalchemy.orm import relationship
 from core.database import Base
 import enum
@@ -24,6 +24,8 @@ class MentorAvailability(Base):
     
     # Relationships
     mentor = relationship("User", back_populates="mentor_availability")
+    
+    __table_args__ = (Index("ix_mentor_availability_mentor_day", "mentor_id", "day_of_week"),)
 
 class MentorSession(Base):
     __tablename__ = "mentor_sessions"
@@ -59,6 +61,13 @@ class MentorSession(Base):
     # Relationships
     mentor = relationship("User", foreign_keys=[mentor_id], back_populates="mentor_sessions")
     student = relationship("User", foreign_keys=[student_id], back_populates="student_sessions")
+    
+    # Session lists ordered by scheduled_at, status filters and dashboard counts;
+    # status is included so the counts never touch the table
+    __table_args__ = (
+        Index("ix_mentor_sessions_mentor_scheduled", "mentor_id", "scheduled_at", "status"),
+        Index("ix_mentor_sessions_student_scheduled", "student_id", "scheduled_at", "status"),
+    )
 
 class MentorProfile(Base):
     __tablename__ = "mentor_profiles"
@@ -104,3 +113,5 @@ class SessionReview(Base):
     # Relationships
     session = relationship("MentorSession")
     reviewer = relationship("User")
+    
+    __table_args__ = (Index("ix_session_reviews_session_id", "session_id"),)
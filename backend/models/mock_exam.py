@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Enum as SQLEnum, Float, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Enum as SQLEnum, Float, Boolean, Index
 from sqlalchemy.orm import relationship
 from core.database import Base
 from datetime import datetime
@@ -36,5 +36,8 @@ class MockExam(Base):
     # Relationship
     user = relationship("User", back_populates="mock_exams")
     
+    # Exam history: WHERE user_id = ? ORDER BY created_at DESC
+    __table_args__ = (Index("ix_mock_exams_user_created", "user_id", "created_at"),)
+    
     def __repr__(self):
         return f"<MockExam(id={self.id}, certification='{self.certification}', level='certification', status='{self.status}')>"
\ No newline at end of file
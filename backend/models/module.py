@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -11,3 +11,5 @@ class Module(Base):
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
 
     course = relationship("Course", back_populates="modules")
+
+    __table_args__ = (Index("ix_modules_course_id", "course_id"),)
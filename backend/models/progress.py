@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, DateTime, Index
 from sqlalchemy.sql import func
 from core.database import Base
 
@@ -12,4 +12,10 @@ class Progress(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
-    __table_args__ = (UniqueConstraint('user_id', 'module_id', name='user_module_unique'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'module_id', name='user_module_unique'),
+        Index('ix_progress_module_id', 'module_id'),
+        # Dashboard: completed-module counts joined on module_id, and the last viewed module
+        Index('ix_progress_user_status_module', 'user_id', 'status', 'module_id'),
+        Index('ix_progress_user_updated', 'user_id', 'updated_at'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Enum as SQLEnum, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Enum as SQLEnum, Float, Index
 from sqlalchemy.orm import relationship
 from core.database import Base
 from datetime import datetime
@@ -32,5 +32,8 @@ class Quiz(Base):
     # Relationship
     user = relationship("User", back_populates="quizzes")
     
+    # Quiz history: WHERE user_id = ? ORDER BY created_at DESC
+    __table_args__ = (Index("ix_quizzes_user_created", "user_id", "created_at"),)
+    
     def __repr__(self):
         return f"<Quiz(id={self.id}, certification='{self.certification}', topic='{self.topic}', difficulty='{self.difficulty}')>"
\ No newline at end of file
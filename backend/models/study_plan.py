@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .user import Base
@@ -20,5 +20,7 @@ class StudyPlan(Base):
     user = relationship("User", back_populates="study_plans")
     progress_records = relationship("StudyPlanProgress", back_populates="study_plan")
     
+    __table_args__ = (Index("ix_study_plans_user_created", "user_id", "created_at"),)
+    
     def __repr__(self):
         return f"<StudyPlan(id={self.id}, user_id={self.user_id}, certification={self.certification}, duration={self.duration_days} days)>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .user import Base
@@ -19,6 +19,9 @@ class StudyPlanProgress(Base):
     user = relationship("User", back_populates="study_plan_progress")
     study_plan = relationship("StudyPlan", back_populates="progress_records")
     
+    # Per-day lookups and the day-ordered progress listing of one plan
+    __table_args__ = (Index("ix_study_plan_progress_user_plan_day", "user_id", "study_plan_id", "day_number"),)
+    
     def __repr__(self):
         return f"<StudyPlanProgress(id={self.id}, user_id={self.user_id}, study_plan_id={self.study_plan_id}, day={self.day_number}, completed={self.is_completed})>"
     
@@ -0,0 +1,45 @@
+from datetime import datetime
+from itertools import chain
+from sqlalchemy import Column, DateTime, Integer, String, event, insert, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from core.database import Base
+
+# Tables whose version is bumped on every ORM write, for conditional GETs on the catalog
+VERSIONED_TABLES = frozenset({"courses", "modules"})
+
+
+class TableVersion(Base):
+    """
+    Change counter of a catalog table. Any flush that inserts, updates or deletes rows of
+    a versioned table bumps its version in the same transaction, so GET handlers can
+    validate a cached response with one primary-key lookup instead of reloading the table.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+def bump_table_versions(conn: Connection, tables):
+    """Increment the version of each table; rows are seeded by the migration and created here if missing."""
+    now = datetime.utcnow()
+    table = TableVersion.__table__
+    for name in sorted(tables):
+        result = conn.execute(
+            update(table).where(table.c.table_name == name).values(version=table.c.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            conn.execute(insert(table).values(table_name=name, version=1, updated_at=now))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_on_flush(session, flush_context):
+    tables = {
+        obj.__table__.name
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if getattr(obj, "__tablename__", None) in VERSIONED_TABLES
+    }
+    if tables:
+        bump_table_versions(session.connection(), tables)
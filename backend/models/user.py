@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Enum, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, Enum, DateTime, Index, literal_column, text
 from sqlalchemy.orm import relationship
 from core.database import Base
 import enum
@@ -20,6 +20,10 @@ class User(Base):
     name = Column(String, nullable=True)
     auth_method = Column(String, nullable=False, default="email")  # "email" or "google"
     has_password = Column(Boolean, nullable=False, default=True)  # False for OAuth users who haven't set a password
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=True)  # Signup time; NULL for users older than the column
+    # Bumped by the database on every UPDATE of the row, whichever worker makes it;
+    # cached profiles and entitlements are only served while it still matches
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"), onupdate=literal_column("version") + 1)
     
     # Subscription fields
     subscription_id = Column(String, nullable=True)  # Stripe subscription ID
@@ -36,4 +40,7 @@ class User(Base):
     mentor_sessions = relationship("MentorSession", foreign_keys="MentorSession.mentor_id", back_populates="mentor")
     student_sessions = relationship("MentorSession", foreign_keys="MentorSession.student_id", back_populates="student")
     mentor_availability = relationship("MentorAvailability", back_populates="mentor")
-    mentor_profile = relationship("MentorProfile", back_populates="user", uselist=False)
\ No newline at end of file
+    mentor_profile = relationship("MentorProfile", back_populates="user", uselist=False)
+
+    # Admin exports filter on signup date
+    __table_args__ = (Index("ix_users_created_at", "created_at"),)
\ No newline at end of file
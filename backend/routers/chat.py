@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import iterate_in_threadpool
 from sqlalchemy.orm import Session
-from core.database import get_db
-from utils.auth import get_current_user
-from schemas.chat import ChatRequest, ChatResponse, ChatConversation, ChatMessage
-from services.chat_service import chat_service
-from typing import List, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_db, get_async_db
+from core import config
+from utils.auth import get_current_user, decode_token
+from models.chat import MessageRole
+from schemas.chat import ChatRequest, ChatResponse, ChatConversation, ChatMessage, ChatSearchResponse
+from services.chat_service import chat_service, AsyncChatService, ChatConnectionState
+from services.openai_service import tutor_chat_stream
+from typing import List, Dict, Optional
+import asyncio
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
@@ -48,7 +55,7 @@ async def send_message(
 async def get_conversations(
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
@@ -56,7 +63,7 @@ async def get_conversations(
     Use skip and limit for pagination (e.g. ?skip=0&limit=20).
     """
     try:
-        conversations = chat_service.get_user_conversations(
+        conversations = await AsyncChatService.get_user_conversations(
             db=db,
             user_id=current_user["id"],
             limit=limit,
@@ -71,17 +78,52 @@ async def get_conversations(
             detail="Failed to retrieve conversations"
         )
 
+@router.get("/search", response_model=ChatSearchResponse)
+async def search_messages(
+    q: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Dict = Depends(get_current_user)
+):
+    """
+    Full-text search over the current user's chat history.
+    Returns ranked snippets with their conversation IDs (e.g. ?q=conditional+access&skip=0&limit=20).
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query cannot be empty"
+        )
+    
+    try:
+        results, has_more = chat_service.search_messages(
+            db=db,
+            user_id=current_user["id"],
+            query=q,
+            skip=skip,
+            limit=limit
+        )
+        return ChatSearchResponse(results=results, skip=skip, limit=limit, has_more=has_more)
+        
+    except Exception as e:
+        logger.error(f"Error in search_messages: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search chat history"
+        )
+
 @router.get("/conversations/{conversation_id}", response_model=ChatConversation)
 async def get_conversation(
     conversation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
     Get a specific conversation with all its messages
     """
     try:
-        conversation = chat_service.get_conversation_with_messages(
+        conversation = await AsyncChatService.get_conversation_with_messages(
             db=db,
             conversation_id=conversation_id,
             user_id=current_user["id"]
@@ -182,4 +224,187 @@ async def get_chat_access_status(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get chat access status: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+async def _receive_frame(websocket: WebSocket) -> Optional[Dict]:
+    """Next client frame, or None if it is not a JSON object"""
+    try:
+        frame = await websocket.receive_json()
+    except ValueError:
+        return None
+    return frame if isinstance(frame, dict) else None
+
+async def _authenticate_websocket(websocket: WebSocket, token: Optional[str]) -> Dict:
+    """
+    Authenticate a chat WebSocket once for the life of the connection.
+    The token comes from the `token` query parameter or, so it stays out of URLs and
+    access logs, from a first {"type": "auth", "token": ...} frame.
+    """
+    if not token:
+        frame = await _receive_frame(websocket)
+        if not frame or frame.get("type") != "auth":
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+        token = frame.get("token")
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    
+    payload = decode_token(token)
+    return {"email": payload.get("sub"), "id": payload.get("id")}
+
+async def _stream_reply(websocket: WebSocket, db: Session, state: ChatConnectionState, frame: Dict):
+    """
+    Answer one queued chat turn, streaming assistant tokens back to the client
+    """
+    message = (frame.get("message") or "").strip()
+    if not message:
+        await websocket.send_json({"type": "error", "message": "Message cannot be empty"})
+        return
+    
+    if not state.has_access():
+        await websocket.send_json({"type": "error", "message": state.access_info["message"]})
+        return
+    
+    # Free users pay for the turn up front and are refunded if it does not complete
+    consumed = False
+    if state.access_info["role"] == "free":
+        if not chat_service.consume_daily_message(db, state.user_id):
+            state.exhaust_quota()
+            await websocket.send_json({"type": "error", "message": state.access_info["message"]})
+            return
+        consumed = True
+    
+    try:
+        conversation_id = frame.get("conversation_id")
+        if conversation_id:
+            history = state.histories.get(conversation_id)
+            if history is None:
+                conversation = chat_service.get_conversation_with_messages(db, conversation_id, state.user_id)
+                if not conversation:
+                    if consumed:
+                        chat_service.refund_daily_message(db, state.user_id)
+                    await websocket.send_json({"type": "error", "message": "Conversation not found or access denied"})
+                    return
+                history = chat_service.get_conversation_history(conversation)
+        else:
+            title = message[:50] + "..." if len(message) > 50 else message
+            conversation_id = chat_service.create_conversation(db, state.user_id, title).id
+            history = []
+        state.histories[conversation_id] = history
+        
+        chat_service.add_message(db, conversation_id, MessageRole.USER, message)
+        
+        cancel_event = threading.Event()
+        state.cancel_event = cancel_event
+        await websocket.send_json({"type": "start", "conversation_id": conversation_id})
+        
+        chunks = []
+        async for token in iterate_in_threadpool(tutor_chat_stream(message, history[-10:], cancel_event)):
+            chunks.append(token)
+            await websocket.send_json({"type": "token", "content": token})
+        
+        history.append({"role": MessageRole.USER.value, "content": message})
+        
+        if cancel_event.is_set():
+            # Cancelled turns keep the question but are not answered or counted against the quota
+            if consumed:
+                chat_service.refund_daily_message(db, state.user_id)
+            await websocket.send_json({"type": "cancelled", "conversation_id": conversation_id})
+            return
+        
+        ai_message = chat_service.add_message(db, conversation_id, MessageRole.ASSISTANT, "".join(chunks).strip())
+        history.append({"role": MessageRole.ASSISTANT.value, "content": ai_message.content})
+        del history[:-10]
+        
+        consumed = False
+        state.record_message()
+        
+        await websocket.send_json({
+            "type": "done",
+            "conversation_id": conversation_id,
+            "message": ChatMessage.model_validate(ai_message).model_dump(mode="json"),
+            "remaining_messages": state.remaining_messages
+        })
+    except Exception as e:
+        logger.error(f"Error in chat websocket turn: {str(e)}")
+        db.rollback()
+        if consumed:
+            chat_service.refund_daily_message(db, state.user_id)
+        await websocket.send_json({"type": "error", "message": "Failed to process chat message"})
+    finally:
+        state.cancel_event = None
+
+async def _chat_worker(websocket: WebSocket, db: Session, state: ChatConnectionState, queue: asyncio.Queue):
+    """Answer queued turns one at a time, in order"""
+    while True:
+        frame = await queue.get()
+        await _stream_reply(websocket, db, state, frame)
+
+@router.websocket("/ws")
+async def chat_websocket(
+    websocket: WebSocket,
+    token: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Persistent chat channel with the AI tutor.
+    
+    Client frames:
+      {"type": "auth", "token": "..."}                        (first frame, unless ?token= is used)
+      {"type": "message", "message": "...", "conversation_id": 1}
+      {"type": "cancel"}                                      (stop the answer being generated)
+    
+    Server frames: ready, start, token, done, cancelled, error.
+    At most CHAT_WS_MAX_PENDING_MESSAGES turns are queued; further messages are rejected
+    with a "busy" error until the tutor catches up.
+    """
+    await websocket.accept()
+    
+    try:
+        user = await _authenticate_websocket(websocket, token)
+    except (HTTPException, ValueError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid or expired token")
+        return
+    except WebSocketDisconnect:
+        return
+    
+    state = ChatConnectionState(user["id"], chat_service.check_chat_access(db, user["id"]))
+    await websocket.send_json({
+        "type": "ready",
+        "has_access": state.has_access(),
+        "remaining_messages": state.remaining_messages,
+        "role": state.access_info["role"],
+        "message": state.access_info["message"]
+    })
+    
+    queue: asyncio.Queue = asyncio.Queue(maxsize=config.CHAT_WS_MAX_PENDING_MESSAGES)
+    worker = asyncio.create_task(_chat_worker(websocket, db, state, queue))
+    
+    try:
+        while True:
+            frame = await _receive_frame(websocket)
+            if frame is None:
+                await websocket.send_json({"type": "error", "message": "Frames must be JSON objects"})
+                continue
+            frame_type = frame.get("type")
+            
+            if frame_type == "cancel":
+                if not state.cancel_generation():
+                    await websocket.send_json({"type": "error", "message": "Nothing to cancel"})
+            elif frame_type == "message":
+                try:
+                    queue.put_nowait(frame)
+                except asyncio.QueueFull:
+                    await websocket.send_json({
+                        "type": "error",
+                        "code": "busy",
+                        "message": "Too many pending messages. Wait for the tutor to answer."
+                    })
+            else:
+                await websocket.send_json({"type": "error", "message": f"Unknown frame type: {frame_type}"})
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Chat websocket error for user {user['id']}: {str(e)}")
+    finally:
+        state.cancel_generation()
+        worker.cancel()
@@ -1,29 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from core.database import get_db
+from core.database import get_db, get_read_db
 from schemas.course import CourseCreate, CourseOut
-from services.course_service import get_all_courses, create_course, search_courses, get_course_by_id
+from services.course_service import get_course_page, create_course, search_courses, get_course_by_id
 from utils.auth import get_current_user, require_admin
-from core.response import success_response, error_response
+from core.conditional import Validators, conditional
+from core.pagination import PageParams, page_params
+from core.response import Envelope, success_response, error_response
+from services.cache_validators import table_validators
 from typing import List
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
-@router.get("/", response_model=List[CourseOut])
+def catalog_validators(db: Session = Depends(get_read_db), user=Depends(get_current_user)) -> Validators:
+    """The course list changes only when the courses table does."""
+    return table_validators(db, "courses")
+
+def course_validators(
+    course_id: int, db: Session = Depends(get_read_db), user=Depends(get_current_user)
+) -> Validators:
+    return table_validators(db, "courses", parts=(course_id,))
+
+@router.get("/", response_model=Envelope[List[CourseOut]], dependencies=[Depends(conditional(catalog_validators))])
 def list_courses(
-    db: Session = Depends(get_db),
+    params: PageParams = Depends(page_params()),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
-    """Get all available courses."""
+    """Get the available courses (paged with ?limit=)."""
     try:
-        courses = get_all_courses(db)
-        return success_response(data=[CourseOut.model_validate(c).model_dump(mode="json") for c in courses], message="Courses retrieved successfully")
+        page = get_course_page(db, params)
+        return success_response(data=page.items, page=page.info, message="Courses retrieved successfully")
     except HTTPException as e:
         return error_response(message=e.detail, status_code=e.status_code)
     except Exception as e:
         return error_response(message=str(e), status_code=500)
 
-@router.post("/", response_model=CourseOut)
+@router.post("/", response_model=Envelope[CourseOut])
 def create_new_course(
     course: CourseCreate,
     db: Session = Depends(get_db),
@@ -32,38 +45,38 @@ def create_new_course(
     """Create a new course (Admin only)."""
     try:
         new_course = create_course(db, course)
-        return success_response(data=CourseOut.model_validate(new_course).model_dump(mode="json"), message="Course created successfully")
+        return success_response(data=new_course, schema=CourseOut, message="Course created successfully")
     except HTTPException as e:
         return error_response(message=e.detail, status_code=e.status_code)
     except Exception as e:
         return error_response(message=str(e), status_code=500)
 
-@router.get("/search", response_model=List[CourseOut])
+@router.get("/search", response_model=Envelope[List[CourseOut]])
 def search_courses_endpoint(
     keyword: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user),
     limit: int = 10
 ):
     """Search courses by keyword."""
     try:
         results = search_courses(db, keyword, limit)
-        return success_response(data=[CourseOut.model_validate(c).model_dump(mode="json") for c in results], message="Courses search results")
+        return success_response(data=results, schema=List[CourseOut], message="Courses search results")
     except HTTPException as e:
         return error_response(message=e.detail, status_code=e.status_code)
     except Exception as e:
         return error_response(message=str(e), status_code=500)
 
-@router.get("/{course_id}", response_model=CourseOut)
+@router.get("/{course_id}", response_model=Envelope[CourseOut], dependencies=[Depends(conditional(course_validators))])
 def get_course_details(
     course_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     """Get details of a specific course."""
     try:
         course = get_course_by_id(db, course_id)
-        return success_response(data=CourseOut.model_validate(course).model_dump(mode="json"), message="Course retrieved successfully")
+        return success_response(data=course, schema=CourseOut, message="Course retrieved successfully")
     except HTTPException as e:
         return error_response(message=e.detail, status_code=e.status_code)
     except Exception as e:
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
-from core.database import get_db
+from core.database import get_read_db, get_by_id
 from utils.auth import get_current_user
 from core.response import success_response, error_response
 from models.progress import Progress
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/stats")
 def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     """Get dashboard statistics for the current user."""
@@ -62,9 +62,9 @@ def get_dashboard_stats(
         last_viewed_info = None
         if last_progress:
             # Get module and course information
-            module = db.query(Module).filter(Module.id == last_progress.module_id).first()
+            module = get_by_id(db, Module, last_progress.module_id)
             if module:
-                course = db.query(Course).filter(Course.id == module.course_id).first()
+                course = get_by_id(db, Course, module.course_id)
                 if course:
                     last_viewed_info = {
                         "course_id": course.id,
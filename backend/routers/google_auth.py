@@ -1,40 +1,58 @@
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
-from authlib.integrations.starlette_client import OAuth
 from starlette.config import Config
-import secrets
-import string
+from functools import lru_cache
+import logging
 
 from core.database import get_db
 from core.response import success_response, error_response
 from core import config
-from services.user_service import get_user_by_email, create_user_oauth, create_access_token
-from schemas.user import UserCreate, UserOut
+from services.user_service import upsert_oauth_user, create_access_token
 
-router = APIRouter(prefix="/auth/google", tags=["Google OAuth"])
+logger = logging.getLogger(__name__)
 
-# Configure OAuth
-oauth_config = Config(environ={
-    'GOOGLE_CLIENT_ID': config.GOOGLE_CLIENT_ID,
-    'GOOGLE_CLIENT_SECRET': config.GOOGLE_CLIENT_SECRET,
-})
+router = APIRouter(prefix="/auth/google", tags=["Google OAuth"])
 
-oauth = OAuth(oauth_config)
-oauth.register(
-    name='google',
-    client_id=config.GOOGLE_CLIENT_ID,
-    client_secret=config.GOOGLE_CLIENT_SECRET,
-    server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-    client_kwargs={
-        'scope': 'openid email profile'
-    }
-)
+@lru_cache(maxsize=1)
+def google_client():
+    """
+    The registered Google OAuth client. Built on first use: authlib pulls in httpx and
+    its JOSE stack, which the rest of the app does not need at startup.
+    """
+    from authlib.integrations.starlette_client import OAuth
+    
+    oauth_config = Config(environ={
+        'GOOGLE_CLIENT_ID': config.GOOGLE_CLIENT_ID,
+        'GOOGLE_CLIENT_SECRET': config.GOOGLE_CLIENT_SECRET,
+    })
+    
+    oauth = OAuth(oauth_config)
+    oauth.register(
+        name='google',
+        client_id=config.GOOGLE_CLIENT_ID,
+        client_secret=config.GOOGLE_CLIENT_SECRET,
+        server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
+        client_kwargs={
+            'scope': 'openid email profile'
+        }
+    )
+    return oauth.google
 
-def generate_random_password(length: int = 16) -> str:
-    """Generate a random password for OAuth users."""
-    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+async def warm_google_metadata():
+    """
+    Fetch Google's OpenID metadata and JWKS ahead of the first callback.
+    authlib keeps both on the client (and refetches the JWKS when a key rotates),
+    so callbacks then validate the ID token without extra round-trips.
+    """
+    if not config.GOOGLE_CLIENT_ID:
+        return
+    try:
+        await google_client().load_server_metadata()
+        await google_client().fetch_jwk_set()
+        logger.info("Loaded Google OpenID metadata and JWKS")
+    except Exception as e:
+        logger.warning(f"Could not preload Google OpenID metadata: {str(e)}")
 
 @router.get("/login")
 async def google_login(request: Request):
@@ -46,7 +64,7 @@ async def google_login(request: Request):
         redirect_uri = f"{config.BACKEND_URL}/auth/google/callback"
         
         # Redirect to Google's authorization URL
-        return await oauth.google.authorize_redirect(request, redirect_uri)
+        return await google_client().authorize_redirect(request, redirect_uri)
     except Exception as e:
         return error_response(
             message=f"Failed to initiate Google login: {str(e)}",
@@ -62,7 +80,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
     """
     try:
         # Get the authorization token from Google
-        token = await oauth.google.authorize_access_token(request)
+        token = await google_client().authorize_access_token(request)
         
         # Get user info from Google
         user_info = token.get('userinfo')
@@ -83,54 +101,23 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
                 status_code=302
             )
         
-        # Check if user exists in database
-        existing_user = get_user_by_email(db, email)
+        # Sign in or sign up in one statement
+        user = upsert_oauth_user(db, email, name if name else None)
         
-        if existing_user:
-            # User exists, create JWT token
-            token_data = {
-                "sub": existing_user.email,
-                "role": existing_user.role.value,  # Convert enum to string
-                "id": existing_user.id
-            }
-            access_token = create_access_token(data=token_data)
-            user_out = UserOut.model_validate(existing_user)
-            
-            redirect_url = f"{config.FRONTEND_URL}/auth/google/callback?token={access_token}&email={email}&name={existing_user.name or ''}&user_id={existing_user.id}"
-            
-            # Redirect to frontend with token and user info
-            return RedirectResponse(
-                url=redirect_url,
-                status_code=302
-            )
-        else:
-            # User doesn't exist, create new user
-            random_password = generate_random_password()
-            user_create = UserCreate(
-                email=email,
-                password=random_password,
-                name=name if name else None
-            )
-            
-            # Create the new user
-            new_user = create_user_oauth(db, user_create)
-            
-            # Create JWT token for new user
-            token_data = {
-                "sub": new_user.email,
-                "role": new_user.role.value,  # Convert enum to string
-                "id": new_user.id
-            }
-            access_token = create_access_token(data=token_data)
-            user_out = UserOut.model_validate(new_user)
-            
-            redirect_url = f"{config.FRONTEND_URL}/auth/google/callback?token={access_token}&email={email}&name={new_user.name or ''}&user_id={new_user.id}"
-            
-            # Redirect to frontend with token and user info
-            return RedirectResponse(
-                url=redirect_url,
-                status_code=302
-            )
+        token_data = {
+            "sub": user.email,
+            "role": user.role.value,  # Convert enum to string
+            "id": user.id
+        }
+        access_token = create_access_token(data=token_data)
+        
+        redirect_url = f"{config.FRONTEND_URL}/auth/google/callback?token={access_token}&email={email}&name={user.name or ''}&user_id={user.id}"
+        
+        # Redirect to frontend with token and user info
+        return RedirectResponse(
+            url=redirect_url,
+            status_code=302
+        )
             
     except HTTPException as he:
         # Redirect to frontend with error
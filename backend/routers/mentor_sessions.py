@@ -5,8 +5,10 @@ from datetime import datetime, date, timedelta
 import json
 import logging
 
-from core.database import get_db
+from core.database import get_db, get_read_db
 from core import config
+from core.pagination import PageParams, page_params
+from core.response import json_response
 from utils.auth import get_current_user, require_roles
 from models.user import UserRole
 from models.mentor_session import SessionStatus
@@ -69,7 +71,7 @@ async def update_mentor_profile(
 async def get_public_mentor_profile(
     mentor_id: int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get public mentor profile (for students)"""
     profile = mentor_service.get_mentor_profile(db, mentor_id)
@@ -128,12 +130,14 @@ async def delete_availability(
 @router.get("/mentors", response_model=MentorListResponse)
 async def get_available_mentors(
     expertise_area: Optional[str] = None,
+    params: PageParams = Depends(page_params()),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get list of available mentors"""
-    mentors = mentor_service.get_available_mentors(db, expertise_area)
-    return MentorListResponse(mentors=mentors, total=len(mentors))
+    """Get available mentors (paged with ?limit=)"""
+    page = mentor_service.get_available_mentor_page(db, params, expertise_area)
+    # Read rows are encoded as they are; MentorListResponse documents the shape
+    return json_response({"mentors": page.items, "total": page.info.total, "page": page.info.model_dump()})
 
 @router.get("/mentor/{mentor_id}/available-slots", response_model=AvailableTimeSlotsResponse)
 async def get_available_time_slots(
@@ -237,17 +241,21 @@ async def get_user_sessions(
     
     # Add mentor/student names and review status to response
     from models.mentor_session import SessionReview
+    # Sessions the current user already reviewed, in one query rather than one per session
+    reviewed_ids = set()
+    if sessions:
+        reviewed_ids = {
+            session_id for (session_id,) in db.query(SessionReview.session_id).filter(
+                SessionReview.session_id.in_([session.id for session in sessions]),
+                SessionReview.reviewer_id == current_user["id"]
+            )
+        }
     for session in sessions:
         if hasattr(session, 'mentor') and session.mentor:
             session.mentor_name = session.mentor.name
         if hasattr(session, 'student') and session.student:
             session.student_name = session.student.name
-        # Check if current user already reviewed this session
-        existing_review = db.query(SessionReview).filter(
-            SessionReview.session_id == session.id,
-            SessionReview.reviewer_id == current_user["id"]
-        ).first()
-        session.has_user_review = existing_review is not None
+        session.has_user_review = session.id in reviewed_ids
     
     return sessions
 
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Query
+from core import config
+from core.pool_metrics import pool_snapshots
+from core.slow_queries import slow_query_log
+from core.response import success_response, error_response
+from utils.auth import require_admin
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+@router.get("/db-pool")
+def get_db_pool_metrics(admin_user=Depends(require_admin)):
+    """Connection pool usage and event counters per engine, e.g. primary and primary_async (Admin only)."""
+    try:
+        return success_response(
+            data=pool_snapshots(),
+            message="Database pool metrics retrieved successfully"
+        )
+    except Exception as e:
+        return error_response(message=str(e), status_code=500)
+
+@router.get("/slow-queries")
+def get_slow_queries(limit: int = Query(20, ge=1, le=200), admin_user=Depends(require_admin)):
+    """Slowest statement fingerprints by total time, with captured plans (Admin only)."""
+    try:
+        return success_response(
+            data={
+                "threshold_ms": config.SLOW_QUERY_MS,
+                "queries": slow_query_log.top(limit),
+            },
+            message="Slow queries retrieved successfully"
+        )
+    except Exception as e:
+        return error_response(message=str(e), status_code=500)
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.conditional import Validators, conditional
+from core.pagination import PageParams, page_params
+from core.database import get_db, get_async_read_db
+from core.precompressed import precompressed_response
 from utils.auth import get_current_user
 from schemas.mock_exam import (
     MockExamRequest, MockExamResponse, MockExamSubmission, MockExamResultResponse,
     MockExamListResponse, MockExam as MockExamSchema, MockExamAccessResponse
 )
-from services.mock_exam_service import MockExamService
+from services.mock_exam_service import MockExamService, AsyncMockExamService
+from services.content_blob_service import AsyncContentBlobService
+from services.entitlement_service import Entitlements, get_entitlements
+from services.cache_validators import user_scope_validators
+from models.mock_exam import MockExam
 from typing import List, Dict, Any
 import logging
 
@@ -14,16 +22,26 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/mock-exam", tags=["mock-exam"])
 
+async def mock_exam_list_validators(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Dict = Depends(get_current_user),
+    entitlements: Entitlements = Depends(get_entitlements)
+) -> Validators:
+    if not entitlements.mock_exam_access()["has_access"]:
+        return Validators()  # The handler answers 403
+    return await user_scope_validators(db, MockExam, current_user["id"])
+
 @router.get("/access-status", response_model=MockExamAccessResponse)
 async def get_mock_exam_access_status(
     db: Session = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    current_user: Dict = Depends(get_current_user),
+    entitlements: Entitlements = Depends(get_entitlements)
 ):
     """
     Check if user has access to mock exams (premium only)
     """
     try:
-        access_info = MockExamService.check_mock_exam_access(db, current_user["id"])
+        access_info = entitlements.mock_exam_access()
         
         return MockExamAccessResponse(
             has_access=access_info["has_access"],
@@ -113,31 +131,33 @@ async def submit_mock_exam(
             detail=str(e)
         )
 
-@router.get("/", response_model=MockExamListResponse)
+@router.get("/", response_model=MockExamListResponse, dependencies=[Depends(conditional(mock_exam_list_validators))])
 async def get_user_mock_exams(
     skip: int = 0,
-    limit: int = 20,
-    db: Session = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    params: PageParams = Depends(page_params(default_limit=20)),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Dict = Depends(get_current_user),
+    entitlements: Entitlements = Depends(get_entitlements)
 ):
     """
-    Get all mock exams for the current user with pagination
+    Get a page of the current user's mock exams, newest first. Pass page.next_cursor
+    as ?cursor= for the next page; ?skip= is still accepted but reads past every skipped row.
     """
     try:
         # Check access first
-        access_info = MockExamService.check_mock_exam_access(db, current_user["id"])
+        access_info = entitlements.mock_exam_access()
         if not access_info["has_access"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=access_info["message"]
             )
         
-        mock_exams = MockExamService.get_user_mock_exams(db, current_user["id"], skip, limit)
-        total_count = MockExamService.get_mock_exam_count(db, current_user["id"])
+        page = await AsyncMockExamService.get_user_mock_exam_page(db, current_user["id"], params, skip)
         
         return MockExamListResponse(
-            mock_exams=mock_exams,
-            total=total_count,
+            mock_exams=page.items,
+            total=page.info.total,
+            page=page.info,
             message="Mock exams retrieved successfully"
         )
         
@@ -153,30 +173,32 @@ async def get_user_mock_exams(
 @router.get("/{mock_exam_id}", response_model=MockExamSchema)
 async def get_mock_exam(
     mock_exam_id: int,
-    db: Session = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Dict = Depends(get_current_user),
+    entitlements: Entitlements = Depends(get_entitlements)
 ):
     """
-    Get a specific mock exam by ID
+    Get a specific mock exam by ID, served from its stored gzip response
     """
     try:
         # Check access first
-        access_info = MockExamService.check_mock_exam_access(db, current_user["id"])
+        access_info = entitlements.mock_exam_access()
         if not access_info["has_access"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=access_info["message"]
             )
         
-        mock_exam = MockExamService.get_mock_exam(db, current_user["id"], mock_exam_id)
+        blob = await AsyncContentBlobService.get_detail(db, "mock_exam", mock_exam_id, current_user["id"])
         
-        if not mock_exam:
+        if not blob:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Mock exam not found"
             )
         
-        return mock_exam
+        return precompressed_response(request, blob.sha256, blob.payload)
         
     except HTTPException:
         raise
@@ -190,22 +212,23 @@ async def get_mock_exam(
 @router.get("/{mock_exam_id}/review")
 async def get_mock_exam_review(
     mock_exam_id: int,
-    db: Session = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Dict = Depends(get_current_user),
+    entitlements: Entitlements = Depends(get_entitlements)
 ):
     """
     Get detailed review of a completed mock exam with correct answers and explanations
     """
     try:
         # Check access first
-        access_info = MockExamService.check_mock_exam_access(db, current_user["id"])
+        access_info = entitlements.mock_exam_access()
         if not access_info["has_access"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=access_info["message"]
             )
         
-        mock_exam = MockExamService.get_mock_exam(db, current_user["id"], mock_exam_id)
+        mock_exam = await AsyncMockExamService.get_mock_exam(db, current_user["id"], mock_exam_id)
         
         if not mock_exam:
             raise HTTPException(
@@ -267,14 +290,15 @@ async def get_mock_exam_review(
 async def delete_mock_exam(
     mock_exam_id: int,
     db: Session = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    current_user: Dict = Depends(get_current_user),
+    entitlements: Entitlements = Depends(get_entitlements)
 ):
     """
     Delete a mock exam
     """
     try:
         # Check access first
-        access_info = MockExamService.check_mock_exam_access(db, current_user["id"])
+        access_info = entitlements.mock_exam_access()
         if not access_info["has_access"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -306,14 +330,15 @@ async def delete_mock_exam(
 @router.get("/statistics/summary")
 async def get_mock_exam_statistics(
     db: Session = Depends(get_db),
-    current_user: Dict = Depends(get_current_user)
+    current_user: Dict = Depends(get_current_user),
+    entitlements: Entitlements = Depends(get_entitlements)
 ):
     """
     Get mock exam statistics for the current user
     """
     try:
         # Check access first
-        access_info = MockExamService.check_mock_exam_access(db, current_user["id"])
+        access_info = entitlements.mock_exam_access()
         if not access_info["has_access"]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
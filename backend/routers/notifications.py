@@ -1,15 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from schemas.notification import NotificationCreate, NotificationOut
-from services.notification_service import create_notification, get_all_notifications, mark_notification_as_read
+from services.notification_service import create_notification, get_notification_page, mark_notification_as_read
 from core.database import get_db
 from utils.auth import get_current_user, require_admin
-from core.response import success_response, error_response
+from core.pagination import PageParams, page_params
+from core.response import Envelope, success_response, error_response
 from typing import List
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
-@router.post("/", response_model=NotificationOut)
+@router.post("/", response_model=Envelope[NotificationOut])
 def create_new_notification(
     data: NotificationCreate,
     db: Session = Depends(get_db),
@@ -19,7 +20,7 @@ def create_new_notification(
     try:
         notification = create_notification(db, data, admin_user["id"])
         return success_response(
-            data=NotificationOut.model_validate(notification).model_dump(mode="json"),
+            data=notification, schema=NotificationOut,
             message="Notification created successfully"
         )
     except HTTPException as e:
@@ -37,7 +38,7 @@ def mark_notification_read(
     try:
         notification = mark_notification_as_read(db, notification_id)
         return success_response(
-            data=NotificationOut.model_validate(notification).model_dump(mode="json"),
+            data=notification, schema=NotificationOut,
             message="Notification marked as read"
         )
     except HTTPException as e:
@@ -45,16 +46,17 @@ def mark_notification_read(
     except Exception as e:
         return error_response(message=str(e), status_code=500)
 
-@router.get("/", response_model=List[NotificationOut])
+@router.get("/", response_model=Envelope[List[NotificationOut]])
 def list_notifications(
+    params: PageParams = Depends(page_params()),
     db: Session = Depends(get_db),
     user=Depends(get_current_user)
 ):
-    """Get all notifications ordered by creation date."""
+    """Get notifications, newest first (paged with ?limit=)."""
     try:
-        notifications = get_all_notifications(db)
+        page = get_notification_page(db, params)
         return success_response(
-            data=[NotificationOut.model_validate(n).model_dump(mode="json") for n in notifications],
+            data=page.items, schema=List[NotificationOut], page=page.info,
             message="Notifications retrieved successfully"
         )
     except HTTPException as e:
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from core.database import get_db
+from core.database import get_db, get_by_id
 from utils.auth import get_current_user
 from models.user import User
 from schemas.payment import (
@@ -28,7 +28,7 @@ async def create_subscription(
     """Create a new subscription checkout session"""
     try:
         # Get the actual user object from database
-        user = db.query(User).filter(User.id == current_user_data["id"]).first()
+        user = get_by_id(db, User, current_user_data["id"])
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -65,7 +65,7 @@ async def get_subscription_status(
     """Get current user's subscription status"""
     try:
         # Get the actual user object from database
-        user = db.query(User).filter(User.id == current_user_data["id"]).first()
+        user = get_by_id(db, User, current_user_data["id"])
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
             
@@ -121,7 +121,7 @@ async def cancel_subscription(
     """Cancel user's subscription at period end"""
     try:
         # Get the actual user object from database
-        user = db.query(User).filter(User.id == current_user_data["id"]).first()
+        user = get_by_id(db, User, current_user_data["id"])
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
             
@@ -162,7 +162,7 @@ async def create_portal_session(
     """Create a customer portal session for subscription management"""
     try:
         # Get the actual user object from database
-        user = db.query(User).filter(User.id == current_user_data["id"]).first()
+        user = get_by_id(db, User, current_user_data["id"])
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
             
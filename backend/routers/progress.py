@@ -1,16 +1,22 @@
+from datetime import date
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from core.database import get_db
-from utils.auth import get_current_user
-from services.progress_service import mark_module_completed, get_user_progress, unmark_module_completed
+from core.database import get_db, get_read_session_factory
+from utils.auth import get_current_user, require_admin
+from services.progress_service import mark_module_completed, get_user_progress_page, unmark_module_completed
 from schemas.progress import ProgressOut
-from core.response import success_response, error_response
+from core.pagination import PageParams, page_params
+from services.export_service import (
+    MEDIA_TYPES, ExportFormat, UserExportFilters, progress_export_statement, stream_export, user_export_filters
+)
+from core.response import Envelope, success_response, error_response
 from models.user import UserRole
-from typing import List
+from typing import List, Optional
 
 router = APIRouter(prefix="/progress", tags=["Progress"])
 
-@router.post("/modules/{module_id}/complete", response_model=ProgressOut)
+@router.post("/modules/{module_id}/complete", response_model=Envelope[ProgressOut])
 def complete_module(
     module_id: int,
     db: Session = Depends(get_db),
@@ -23,7 +29,7 @@ def complete_module(
 
         progress = mark_module_completed(db, user_id=user["id"], module_id=module_id)
         return success_response(
-            data=ProgressOut.model_validate(progress).model_dump(mode="json"),
+            data=progress, schema=ProgressOut,
             message="Module marked as completed"
         )
     except HTTPException as e:
@@ -31,7 +37,7 @@ def complete_module(
     except Exception as e:
         return error_response(message=str(e), status_code=500)
 
-@router.post("/modules/{module_id}/uncomplete", response_model=ProgressOut)
+@router.post("/modules/{module_id}/uncomplete", response_model=Envelope[ProgressOut])
 def uncomplete_module(
     module_id: int,
     db: Session = Depends(get_db),
@@ -44,7 +50,7 @@ def uncomplete_module(
 
         progress = unmark_module_completed(db, user_id=user["id"], module_id=module_id)
         return success_response(
-            data=ProgressOut.model_validate(progress).model_dump(mode="json"),
+            data=progress, schema=ProgressOut,
             message="Module unmarked as completed"
         )
     except HTTPException as e:
@@ -52,19 +58,39 @@ def uncomplete_module(
     except Exception as e:
         return error_response(message=str(e), status_code=500)
 
-@router.get("/user", response_model=List[ProgressOut])
+@router.get("/user", response_model=Envelope[List[ProgressOut]])
 def get_current_user_progress(
+    params: PageParams = Depends(page_params()),
     db: Session = Depends(get_db),
     user=Depends(get_current_user)
 ):
-    """Get current user's progress for all modules."""
+    """Get the current user's module progress (paged with ?limit=)."""
     try:
-        progress_records = get_user_progress(db, user_id=user["id"])
+        page = get_user_progress_page(db, user["id"], params)
         return success_response(
-            data=[ProgressOut.model_validate(p).model_dump(mode="json") for p in progress_records],
+            data=page.items, schema=List[ProgressOut], page=page.info,
             message="User progress retrieved successfully"
         )
     except HTTPException as e:
         return error_response(message=e.detail, status_code=e.status_code)
     except Exception as e:
         return error_response(message=str(e), status_code=500)
+
+@router.get("/admin/export")
+def export_progress(
+    format: ExportFormat = "ndjson",
+    module_id: Optional[int] = None,
+    status: Optional[str] = None,
+    filters: UserExportFilters = Depends(user_export_filters),
+    session_factory=Depends(get_read_session_factory),
+    admin_user=Depends(require_admin)
+):
+    """Stream module progress records as NDJSON or CSV, filtered by module, status and user (Admin only)."""
+    return StreamingResponse(
+        stream_export(session_factory, progress_export_statement(filters, module_id, status), format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="progress-{date.today().isoformat()}.{format}"',
+            "Cache-Control": "no-store",
+        },
+    )
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.conditional import Validators, conditional
+from core.pagination import PageParams, page_params
+from core.database import get_db, get_async_read_db
+from core.precompressed import precompressed_response
 from utils.auth import get_current_user
 from schemas.quiz import (
     QuizRequest, QuizResponse, QuizSubmission, QuizResultResponse,
     QuizListResponse, Quiz as QuizSchema
 )
-from services.quiz_service import QuizService
+from services.quiz_service import QuizService, AsyncQuizService
+from services.content_blob_service import AsyncContentBlobService
+from services.cache_validators import user_scope_validators
+from models.quiz import Quiz
 from typing import List, Dict, Any
 import logging
 
@@ -14,6 +21,12 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/quiz", tags=["quiz"])
 
+async def quiz_list_validators(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Dict = Depends(get_current_user)
+) -> Validators:
+    return await user_scope_validators(db, Quiz, current_user["id"])
+
 @router.post("/generate", response_model=QuizResponse)
 async def generate_quiz(
     quiz_request: QuizRequest,
@@ -89,26 +102,29 @@ async def submit_quiz(
 
 
 
-@router.get("/", response_model=QuizListResponse)
+@router.get("/", response_model=QuizListResponse, dependencies=[Depends(conditional(quiz_list_validators))])
 async def get_user_quizzes(
     skip: int = 0,
-    limit: int = 20,
-    db: Session = Depends(get_db),
+    params: PageParams = Depends(page_params(default_limit=20)),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
-    Get all quizzes for the current user with pagination
+    Get a page of the current user's quizzes, newest first. Pass page.next_cursor
+    as ?cursor= for the next page; ?skip= is still accepted but reads past every skipped row.
     """
     try:
-        quizzes = QuizService.get_user_quizzes(db, current_user["id"], skip, limit)
-        total = QuizService.get_quiz_count(db, current_user["id"])
+        page = await AsyncQuizService.get_user_quiz_page(db, current_user["id"], params, skip)
         
         return QuizListResponse(
-            quizzes=quizzes,
-            total=total,
+            quizzes=page.items,
+            total=page.info.total,
+            page=page.info,
             message="Quizzes retrieved successfully"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving quizzes for user {current_user['id']}: {str(e)}")
         raise HTTPException(
@@ -144,22 +160,23 @@ async def get_quiz_access_status(
 @router.get("/{quiz_id}", response_model=QuizSchema)
 async def get_quiz(
     quiz_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
-    Get a specific quiz by ID
+    Get a specific quiz by ID, served from its stored gzip response
     """
     try:
-        quiz = QuizService.get_quiz(db, current_user["id"], quiz_id)
+        blob = await AsyncContentBlobService.get_detail(db, "quiz", quiz_id, current_user["id"])
         
-        if not quiz:
+        if not blob:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Quiz not found"
             )
         
-        return quiz
+        return precompressed_response(request, blob.sha256, blob.payload)
         
     except HTTPException:
         raise
@@ -173,14 +190,14 @@ async def get_quiz(
 @router.get("/{quiz_id}/review")
 async def get_quiz_review(
     quiz_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
     Get detailed quiz review with questions, answers, and explanations
     """
     try:
-        quiz = QuizService.get_quiz(db, current_user["id"], quiz_id)
+        quiz = await AsyncQuizService.get_quiz(db, current_user["id"], quiz_id)
         
         if not quiz:
             raise HTTPException(
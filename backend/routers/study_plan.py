@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict
-from core.database import get_db
+from core import config
+from core.conditional import Validators, conditional, make_etag
+from core.pagination import PageParams, page_params
+from core.database import get_db, get_async_db
+from core.precompressed import precompressed_response
 from utils.auth import get_current_user
 from models.user import UserRole
-from services.study_plan_service import StudyPlanService
+from services.study_plan_service import StudyPlanService, AsyncStudyPlanService
+from services.content_blob_service import AsyncContentBlobService
+from services.cache_validators import user_scope_validators
+from models.study_plan import StudyPlan
 from schemas.study_plan import (
     StudyPlanRequest,
     StudyPlanResponse,
@@ -16,7 +24,27 @@ from schemas.study_plan import (
 
 router = APIRouter(prefix="/study-plans", tags=["study-plans"])
 
-@router.get("/certifications", response_model=CertificationsResponse)
+# The catalogs are constants, so their ETags are computed once
+CERTIFICATIONS_ETAG = make_etag("certifications", StudyPlanService.get_available_certifications())
+
+def certifications_validators() -> Validators:
+    return Validators(etag=CERTIFICATIONS_ETAG)
+
+def allowed_durations_validators(current_user: Dict = Depends(get_current_user)) -> Validators:
+    """Durations depend only on the role, which upgrades change: revalidated on every use."""
+    role = current_user["role"]
+    return Validators(etag=make_etag("allowed-durations", role.value, StudyPlanService.get_allowed_durations(role)))
+
+async def study_plan_list_validators(
+    current_user: Dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> Validators:
+    return await user_scope_validators(db, StudyPlan, current_user["id"])
+
+@router.get(
+    "/certifications", response_model=CertificationsResponse,
+    dependencies=[Depends(conditional(certifications_validators, f"public, max-age={config.STATIC_CATALOG_MAX_AGE}"))]
+)
 async def get_certifications():
     """Get all available Microsoft security certifications"""
     certifications_data = StudyPlanService.get_available_certifications()
@@ -33,7 +61,10 @@ async def get_certifications():
     
     return CertificationsResponse(certifications=certifications)
 
-@router.get("/allowed-durations", response_model=AllowedDurationsResponse)
+@router.get(
+    "/allowed-durations", response_model=AllowedDurationsResponse,
+    dependencies=[Depends(conditional(allowed_durations_validators))]
+)
 async def get_allowed_durations(current_user: Dict = Depends(get_current_user)):
     """Get allowed study plan durations based on user role"""
     durations = StudyPlanService.get_allowed_durations(current_user["role"])
@@ -98,35 +129,38 @@ async def generate_study_plan(
             detail="Failed to generate study plan"
         )
 
-@router.get("/", response_model=StudyPlanListResponse)
+@router.get("/", response_model=StudyPlanListResponse, dependencies=[Depends(conditional(study_plan_list_validators))])
 async def get_user_study_plans(
+    params: PageParams = Depends(page_params()),
     current_user: Dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all study plans for the current user"""
-    study_plans = StudyPlanService.get_user_study_plans(db, current_user["id"])
+    """Get the current user's study plans, newest first (paged with ?limit=)"""
+    page = await AsyncStudyPlanService.get_user_study_plan_page(db, current_user["id"], params)
     
     return StudyPlanListResponse(
-        study_plans=study_plans,
-        total=len(study_plans)
+        study_plans=page.items,
+        total=page.info.total,
+        page=page.info
     )
 
 @router.get("/{plan_id}", response_model=StudyPlanResponse)
 async def get_study_plan(
     plan_id: int,
+    request: Request,
     current_user: Dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get a specific study plan"""
-    study_plan = StudyPlanService.get_study_plan(db, plan_id, current_user["id"])
+    """Get a specific study plan, served from its stored gzip response"""
+    blob = await AsyncContentBlobService.get_detail(db, "study_plan", plan_id, current_user["id"])
     
-    if not study_plan:
+    if not blob:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Study plan not found"
         )
     
-    return study_plan
+    return precompressed_response(request, blob.sha256, blob.payload)
 
 @router.delete("/{plan_id}")
 async def delete_study_plan(
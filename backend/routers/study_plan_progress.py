@@ -27,7 +27,7 @@ async def toggle_day_completion(
         )
         
         return success_response(
-            data=StudyPlanProgressResponse.model_validate(progress).model_dump(mode="json"),
+            data=progress, schema=StudyPlanProgressResponse,
             message=f"Day {day_number} marked as {'completed' if progress.is_completed else 'incomplete'}"
         )
         
@@ -50,7 +50,7 @@ async def mark_day_completed(
         )
         
         return success_response(
-            data=StudyPlanProgressResponse.model_validate(progress).model_dump(mode="json"),
+            data=progress, schema=StudyPlanProgressResponse,
             message=f"Day {day_number} marked as completed"
         )
         
@@ -73,7 +73,7 @@ async def mark_day_incomplete(
         )
         
         return success_response(
-            data=StudyPlanProgressResponse.model_validate(progress).model_dump(mode="json"),
+            data=progress, schema=StudyPlanProgressResponse,
             message=f"Day {day_number} marked as incomplete"
         )
         
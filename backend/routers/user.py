@@ -1,23 +1,40 @@
+from datetime import date
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from schemas.user import UserCreate, UserLogin, UserProfileUpdate, UserOut
 from services.user_service import (
-    create_user, authenticate_user, create_access_token, 
-    get_user_by_id, get_user_by_email, update_user_profile, get_all_users,
+    create_user_async, authenticate_user_async, create_access_token,
+    get_user_profile, update_user_profile, get_user_page,
     delete_user, update_user_role
 )
-from core.database import get_db
+from core.database import get_db, get_read_session_factory
 from utils.auth import get_current_user, require_admin
-from core.response import success_response, error_response
+from core.conditional import Validators, conditional
+from core.pagination import PageParams, page_params
+from services.export_service import (
+    MEDIA_TYPES, ExportFormat, UserExportFilters, stream_export, user_export_filters, user_export_statement
+)
+from core.response import Envelope, success_response, error_response
 from typing import List
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+def profile_validators(user=Depends(get_current_user), db: Session = Depends(get_db)) -> Validators:
+    """The profile's ETag, built from users.version; loading it warms the cache for the handler."""
+    _, etag = get_user_profile(db, user["id"])
+    return Validators(etag=etag)
+
+def _profile_response(user_id: int, db: Session, message: str):
+    """Serve the cached profile; conditional(profile_validators) already answered any 304."""
+    profile, _ = get_user_profile(db, user_id)
+    return success_response(data=profile, message=message)
+
 @router.post("/register")
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     """Register a new user and return access token."""
     try:
-        new_user = create_user(db, user)
+        new_user = await create_user_async(db, user)
         # Generate access token for the new user
         token_data = {
             "sub": new_user.email,
@@ -46,10 +63,10 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login")
-def login_user(user: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user: UserLogin, db: Session = Depends(get_db)):
     """Authenticate user and return JWT token."""
     try:
-        authenticated_user = authenticate_user(db, user.email, user.password)
+        authenticated_user = await authenticate_user_async(db, user.email, user.password)
         token_data = {
             "sub": authenticated_user.email,
             "role": authenticated_user.role.value,  # Convert enum to string
@@ -75,25 +92,21 @@ def login_user(user: UserLogin, db: Session = Depends(get_db)):
         return error_response(message=str(e), status_code=500)
 
 
-@router.get("/profile", response_model=UserOut)
+@router.get("/profile", response_model=Envelope[UserOut], dependencies=[Depends(conditional(profile_validators))])
 def get_profile(
     user=Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get current user's profile."""
     try:
-        db_user = get_user_by_id(db, user["id"])
-        return success_response(
-            data=UserOut.model_validate(db_user).model_dump(mode="json"),
-            message="Profile retrieved successfully"
-        )
+        return _profile_response(user["id"], db, "Profile retrieved successfully")
     except HTTPException as e:
         return error_response(message=e.detail, status_code=e.status_code)
     except Exception as e:
         return error_response(message=str(e), status_code=500)
 
 
-@router.put("/profile", response_model=UserOut)
+@router.put("/profile", response_model=Envelope[UserOut])
 def update_profile(
     update_data: UserProfileUpdate,
     user=Depends(get_current_user),
@@ -103,7 +116,7 @@ def update_profile(
     try:
         updated_user = update_user_profile(db, user["id"], update_data)
         return success_response(
-            data=UserOut.model_validate(updated_user).model_dump(mode="json"),
+            data=updated_user, schema=UserOut,
             message="Profile updated successfully"
         )
     except HTTPException as e:
@@ -112,39 +125,54 @@ def update_profile(
         return error_response(message=str(e), status_code=500)
 
 
-@router.get("/me", response_model=UserOut)
+@router.get("/me", response_model=Envelope[UserOut], dependencies=[Depends(conditional(profile_validators))])
 def read_current_user(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get current user details."""
     try:
-        user = get_user_by_email(db, current_user["email"])
-        return success_response(
-            data=UserOut.model_validate(user).model_dump(mode="json"),
-            message="Current user retrieved successfully"
-        )
+        return _profile_response(current_user["id"], db, "Current user retrieved successfully")
     except HTTPException as e:
         return error_response(message=e.detail, status_code=e.status_code)
     except Exception as e:
         return error_response(message=str(e), status_code=500)
 
-@router.get("/admin/users", response_model=List[UserOut])
+@router.get("/admin/users", response_model=Envelope[List[UserOut]])
 def list_all_users(
+    params: PageParams = Depends(page_params()),
     db: Session = Depends(get_db),
     admin_user=Depends(require_admin)
 ):
-    """List all users (Admin only)."""
+    """List all users, paged with ?limit= (Admin only)."""
     try:
-        users = get_all_users(db)
+        page = get_user_page(db, params)
         return success_response(
-            data=[UserOut.model_validate(u).model_dump(mode="json") for u in users],
+            data=page.items, page=page.info,
             message="All users retrieved successfully"
         )
     except HTTPException as e:
         return error_response(message=e.detail, status_code=e.status_code)
     except Exception as e:
         return error_response(message=str(e), status_code=500)
+
+@router.get("/admin/users/export")
+def export_users(
+    format: ExportFormat = "ndjson",
+    filters: UserExportFilters = Depends(user_export_filters),
+    session_factory=Depends(get_read_session_factory),
+    admin_user=Depends(require_admin)
+):
+    """Stream every matching user as NDJSON or CSV (Admin only)."""
+    return StreamingResponse(
+        stream_export(session_factory, user_export_statement(filters), format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="users-{date.today().isoformat()}.{format}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
 @router.delete("/admin/users/{user_id}")
 def admin_delete_user(
     user_id: int,
@@ -178,7 +206,7 @@ def admin_update_user_role(
             return error_response(message="Role is required", status_code=400)
         updated = update_user_role(db, user_id, new_role)
         return success_response(
-            data=UserOut.model_validate(updated).model_dump(mode="json"),
+            data=updated, schema=UserOut,
             message=f"User role updated to {new_role}"
         )
     except HTTPException as e:
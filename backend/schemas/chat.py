@@ -44,4 +44,19 @@ class ChatRequest(BaseModel):
 
 class ChatResponse(BaseModel):
     message: ChatMessage
-    conversation_id: int
\ No newline at end of file
+    conversation_id: int
+
+class ChatSearchResult(BaseModel):
+    message_id: int
+    conversation_id: int
+    conversation_title: Optional[str] = None
+    role: MessageRole
+    snippet: str
+    rank: float
+    created_at: datetime
+
+class ChatSearchResponse(BaseModel):
+    results: List[ChatSearchResult]
+    skip: int
+    limit: int
+    has_more: bool
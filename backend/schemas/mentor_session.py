@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from models.mentor_session import SessionStatus
+from core.pagination import PageInfo
 
 # Mentor Profile Schemas
 class MentorProfileBase(BaseModel):
@@ -154,7 +155,8 @@ class MentorListItem(BaseModel):
 
 class MentorListResponse(BaseModel):
     mentors: List[MentorListItem]
-    total: int
+    total: Optional[int] = None  # Set on a single-page list or with ?include_total=true
+    page: Optional[PageInfo] = None
 
 # Session Review Schemas
 class SessionReviewCreate(BaseModel):
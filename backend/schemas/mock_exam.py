@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 from enum import Enum
+from core.pagination import PageInfo
 
 class MockExamDifficulty(str, Enum):
     BEGINNER = "beginner"
@@ -60,6 +61,21 @@ class MockExam(MockExamBase):
     class Config:
         from_attributes = True
 
+class MockExamSummary(BaseModel):
+    """Mock exam history row: everything but exam_content and user_answers"""
+    id: int
+    user_id: int
+    certification: str
+    difficulty: MockExamDifficulty
+    score: Optional[float] = None
+    status: Optional[MockExamStatus] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class MockExamResponse(BaseModel):
     mock_exam: MockExam
     message: str = "Mock exam generated successfully"
@@ -75,8 +91,9 @@ class MockExamResultResponse(BaseModel):
     message: str = "Mock exam submitted successfully"
 
 class MockExamListResponse(BaseModel):
-    mock_exams: List[MockExam]
-    total: int
+    mock_exams: List[MockExamSummary]
+    total: Optional[int] = None  # Set on a single-page list or with ?include_total=true
+    page: Optional[PageInfo] = None
     message: str = "Mock exams retrieved successfully"
 
 class MockExamAccessResponse(BaseModel):
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 from enum import Enum
+from core.pagination import PageInfo
 
 class QuizDifficulty(str, Enum):
     BEGINNER = "beginner"
@@ -57,6 +58,21 @@ class Quiz(QuizBase):
     class Config:
         from_attributes = True
 
+class QuizSummary(BaseModel):
+    """Quiz history row: everything but quiz_content and user_answers"""
+    id: int
+    user_id: int
+    certification: str
+    topic: str
+    difficulty: QuizDifficulty
+    score: Optional[float] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class QuizResponse(BaseModel):
     quiz: Quiz
     message: str = "Quiz generated successfully"
@@ -70,6 +86,7 @@ class QuizResultResponse(BaseModel):
     message: str = "Quiz submitted successfully"
 
 class QuizListResponse(BaseModel):
-    quizzes: List[Quiz]
-    total: int
+    quizzes: List[QuizSummary]
+    total: Optional[int] = None  # Set on a single-page list or with ?include_total=true
+    page: Optional[PageInfo] = None
     message: str = "Quizzes retrieved successfully"
\ No newline at end of file
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from core.pagination import PageInfo
 
 class StudyPlanRequest(BaseModel):
     certification: str = Field(..., description="Certification code (SC-100, SC-200, SC-300, SC-400, SC-900)")
@@ -54,6 +55,20 @@ class StudyPlanResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class StudyPlanSummary(BaseModel):
+    """Study plan list row: everything but plan_content"""
+    id: int
+    user_id: int
+    certification: str
+    certification_name: str
+    duration_days: int
+    daily_hours: float
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class CertificationInfo(BaseModel):
     code: str
     name: str
@@ -70,5 +85,6 @@ class AllowedDurationsResponse(BaseModel):
     message: str
 
 class StudyPlanListResponse(BaseModel):
-    study_plans: List[StudyPlanResponse]
-    total: int
\ No newline at end of file
+    study_plans: List[StudyPlanSummary]
+    total: Optional[int] = None  # Set on a single-page list or with ?include_total=true
+    page: Optional[PageInfo] = None
\ No newline at end of file
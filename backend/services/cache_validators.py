@@ -0,0 +1,38 @@
+"""
+Validators for conditional GETs (see core.conditional). Each is one small query that
+stands in for the response: if it hasn't changed, neither has the body.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.conditional import Validators, make_etag
+from models.table_version import TableVersion
+
+
+def table_validators(db: Session, *tables: str, parts=()) -> Validators:
+    """
+    Versions of catalog tables (models.table_version), plus any parts that select
+    within them, such as a course id. A table that has never been written is version 0.
+    """
+    rows = db.execute(
+        select(TableVersion.table_name, TableVersion.version, TableVersion.updated_at)
+        .where(TableVersion.table_name.in_(tables))
+    ).all()
+    versions = {name: (version, updated_at) for name, version, updated_at in rows}
+    last_modified = max((updated_at for _, updated_at in versions.values()), default=None)
+    etag = make_etag(*(f"{name}:{versions.get(name, (0,))[0]}" for name in tables), *parts)
+    return Validators(etag=etag, last_modified=last_modified)
+
+
+async def user_scope_validators(db: AsyncSession, model, user_id: int, *parts) -> Validators:
+    """
+    count and max(updated_at) of a user's rows: any insert or update moves the max and
+    any delete moves the count. parts adds anything else the response depends on.
+    ETag only: a delete leaves max(updated_at) alone, so it can't back If-Modified-Since.
+    """
+    count, last_updated = (await db.execute(
+        select(func.count(model.id), func.max(model.updated_at)).where(model.user_id == user_id)
+    )).one()
+    etag = make_etag(model.__tablename__, user_id, count, last_updated, *parts)
+    return Validators(etag=etag)
@@ -0,0 +1,154 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.chat import ChatConversation, ChatMessage, ChatConversationArchive, MessageRole
+from core import config
+from datetime import datetime, timedelta
+from typing import List, Optional
+import json
+import logging
+import zlib
+
+logger = logging.getLogger(__name__)
+
+class ChatArchiveService:
+    CODEC = "zlib"
+    
+    @staticmethod
+    def _compress(messages: List[ChatMessage]) -> tuple[bytes, int]:
+        """
+        Serialize messages to canonical JSON and compress them.
+        Returns the compressed payload and the uncompressed size.
+        """
+        raw = json.dumps(
+            [
+                {
+                    "id": msg.id,
+                    "role": msg.role.value,
+                    "content": msg.content,
+                    "created_at": msg.created_at.isoformat()
+                }
+                for msg in messages
+            ],
+            separators=(",", ":"),
+            ensure_ascii=False
+        ).encode("utf-8")
+        return zlib.compress(raw, 6), len(raw)
+    
+    @staticmethod
+    def _decompress(archive: ChatConversationArchive) -> List[dict]:
+        if archive.codec != ChatArchiveService.CODEC:
+            raise ValueError(f"Unsupported archive codec: {archive.codec}")
+        return json.loads(zlib.decompress(archive.payload).decode("utf-8"))
+    
+    @staticmethod
+    def find_idle_conversation_ids(db: Session, cutoff: datetime, limit: int) -> List[int]:
+        """
+        Get IDs of conversations whose last message and last update are older than cutoff.
+        Conversations that already have an archive row are skipped until they are restored.
+        """
+        rows = db.query(ChatMessage.conversation_id).join(
+            ChatConversation, ChatConversation.id == ChatMessage.conversation_id
+        ).outerjoin(
+            ChatConversationArchive, ChatConversationArchive.conversation_id == ChatMessage.conversation_id
+        ).filter(
+            ChatConversation.updated_at < cutoff,
+            ChatConversationArchive.conversation_id.is_(None)
+        ).group_by(
+            ChatMessage.conversation_id
+        ).having(
+            func.max(ChatMessage.created_at) < cutoff
+        ).order_by(ChatMessage.conversation_id).limit(limit).all()
+        return [row.conversation_id for row in rows]
+    
+    @staticmethod
+    def archive_batch(db: Session, conversation_ids: List[int]) -> int:
+        """
+        Move the messages of the given conversations into compressed archive rows.
+        Runs as one short transaction. Only the messages that went into an archive are
+        deleted, so one written after they were read stays live.
+        """
+        try:
+            messages = db.query(ChatMessage).filter(
+                ChatMessage.conversation_id.in_(conversation_ids)
+            ).order_by(ChatMessage.conversation_id, ChatMessage.id).all()
+            
+            by_conversation = {}
+            for msg in messages:
+                by_conversation.setdefault(msg.conversation_id, []).append(msg)
+            
+            owners = dict(db.query(ChatConversation.id, ChatConversation.user_id).filter(
+                ChatConversation.id.in_(list(by_conversation))
+            ).all())
+            
+            for conversation_id, conversation_messages in by_conversation.items():
+                payload, original_size = ChatArchiveService._compress(conversation_messages)
+                db.add(ChatConversationArchive(
+                    conversation_id=conversation_id,
+                    user_id=owners[conversation_id],
+                    message_count=len(conversation_messages),
+                    codec=ChatArchiveService.CODEC,
+                    original_size=original_size,
+                    payload=payload
+                ))
+            
+            archived_ids = [msg.id for msg in messages]
+            db.query(ChatMessage).filter(
+                ChatMessage.id.in_(archived_ids)
+            ).delete(synchronize_session=False)
+            
+            db.commit()
+            return len(by_conversation)
+        except Exception as e:
+            logger.error(f"Error archiving conversations {conversation_ids}: {str(e)}")
+            db.rollback()
+            raise Exception(f"Failed to archive conversations: {str(e)}")
+    
+    @staticmethod
+    def archive_idle_conversations(db: Session, idle_days: Optional[int] = None, batch_size: Optional[int] = None) -> int:
+        """
+        Archive every conversation idle for longer than idle_days, batch_size conversations
+        per transaction so no lock is held on chat_messages for long.
+        Returns the number of conversations archived.
+        """
+        idle_days = config.CHAT_ARCHIVE_IDLE_DAYS if idle_days is None else idle_days
+        batch_size = batch_size or config.CHAT_ARCHIVE_BATCH_SIZE
+        cutoff = datetime.utcnow() - timedelta(days=idle_days)
+        
+        total = 0
+        while True:
+            conversation_ids = ChatArchiveService.find_idle_conversation_ids(db, cutoff, batch_size)
+            if not conversation_ids:
+                break
+            total += ChatArchiveService.archive_batch(db, conversation_ids)
+            logger.info(f"Archived {total} idle conversations so far")
+        
+        return total
+    
+    @staticmethod
+    def restore_conversation(db: Session, conversation: ChatConversation) -> bool:
+        """
+        Rehydrate an archived conversation's messages back into chat_messages.
+        Returns False if the conversation was not archived.
+        """
+        archive = conversation.archive
+        if archive is None:
+            return False
+        
+        try:
+            for item in ChatArchiveService._decompress(archive):
+                db.add(ChatMessage(
+                    id=item["id"],
+                    conversation_id=conversation.id,
+                    role=MessageRole(item["role"]),
+                    content=item["content"],
+                    created_at=datetime.fromisoformat(item["created_at"])
+                ))
+            db.delete(archive)
+            db.commit()
+            db.refresh(conversation)
+            logger.info(f"Restored archived conversation {conversation.id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error restoring conversation {conversation.id}: {str(e)}")
+            db.rollback()
+            raise Exception(f"Failed to restore conversation: {str(e)}")
@@ -1,15 +1,65 @@
-from sqlalchemy.orm import Session
-from models.chat import ChatConversation, ChatMessage, MessageRole
-from models.user import User, UserRole
-from models.daily_usage import DailyUsage
+from sqlalchemy import text, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.chat import ChatConversation, ChatMessage, ChatConversationArchive, MessageRole
 from schemas.chat import ChatConversationCreate, ChatMessageCreate, ChatRequest
 from services.openai_service import tutor_chat
-from typing import List, Optional
-from datetime import date
+from services.chat_archive_service import ChatArchiveService
+from services.quota_service import QuotaService, FREE_DAILY_CHAT_MESSAGES
+from services.entitlement_service import EntitlementService
+from typing import Dict, List, Optional
 import logging
+import re
+import threading
 
 logger = logging.getLogger(__name__)
 
+class ChatConnectionState:
+    """
+    Per-connection state for the chat WebSocket channel.
+    Holds the access info resolved at connect time, the cached history of every
+    conversation touched on the connection and the cancel flag of the running generation.
+    """
+    def __init__(self, user_id: int, access_info: dict):
+        self.user_id = user_id
+        self.access_info = access_info
+        self.histories: Dict[int, List[Dict[str, str]]] = {}
+        self.cancel_event: Optional[threading.Event] = None
+    
+    @property
+    def remaining_messages(self) -> int:
+        return self.access_info["remaining_messages"]
+    
+    def has_access(self) -> bool:
+        if self.access_info["role"] == "free":
+            return self.access_info["remaining_messages"] > 0
+        return self.access_info["has_access"]
+    
+    def record_message(self):
+        """Update the cached quota after a completed free-tier exchange"""
+        if self.access_info["role"] != "free":
+            return
+        self._set_remaining(max(0, self.access_info["remaining_messages"] - 1))
+    
+    def exhaust_quota(self):
+        """The database reported the daily limit as reached (e.g. used up on another connection)"""
+        self._set_remaining(0)
+    
+    def _set_remaining(self, remaining: int):
+        self.access_info["remaining_messages"] = remaining
+        self.access_info["has_access"] = remaining > 0
+        if remaining == 0:
+            self.access_info["message"] = "Daily limit reached. Upgrade to Premium to continue"
+        else:
+            self.access_info["message"] = f"{remaining} messages remaining today"
+    
+    def cancel_generation(self) -> bool:
+        """Signal the running generation to stop. Returns False if nothing is running."""
+        if self.cancel_event is None or self.cancel_event.is_set():
+            return False
+        self.cancel_event.set()
+        return True
+
 class ChatService:
     @staticmethod
     def check_chat_access(db: Session, user_id: int) -> dict:
@@ -17,58 +67,22 @@ class ChatService:
         Check if user has access to chat and return access info
         Returns: {"has_access": bool, "remaining_messages": int, "role": str, "message": str}
         """
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return {"has_access": False, "remaining_messages": 0, "role": "unknown", "message": "User not found"}
-        
-        # Mentor role cannot access chat
-        if user.role == UserRole.MENTOR:
-            return {"has_access": False, "remaining_messages": 0, "role": "mentor", "message": "Chat not available for mentors"}
-        
-        # Admin and Premium have unlimited access
-        if user.role in [UserRole.ADMIN, UserRole.PREMIUM]:
-            return {"has_access": True, "remaining_messages": -1, "role": user.role.value, "message": "Unlimited access"}
-        
-        # Free users have daily limit
-        if user.role == UserRole.FREE:
-            today = date.today()
-            daily_usage = db.query(DailyUsage).filter(
-                DailyUsage.user_id == user_id,
-                DailyUsage.date == today
-            ).first()
-            
-            messages_used = daily_usage.chat_messages_count if daily_usage else 0
-            remaining = max(0, 3 - messages_used)
-            
-            if remaining > 0:
-                return {"has_access": True, "remaining_messages": remaining, "role": "free", "message": f"{remaining} messages remaining today"}
-            else:
-                return {"has_access": False, "remaining_messages": 0, "role": "free", "message": "Daily limit reached. Upgrade to Premium to continue"}
-        
-        return {"has_access": False, "remaining_messages": 0, "role": user.role.value, "message": "Unknown role"}
+        return EntitlementService.resolve(db, user_id).chat_access(db)
     
     @staticmethod
-    def increment_daily_usage(db: Session, user_id: int):
+    def consume_daily_message(db: Session, user_id: int) -> bool:
         """
-        Increment the daily chat message count for a user
+        Atomically use one of the user's free daily chat messages.
+        Returns False if the daily limit has already been reached.
         """
-        today = date.today()
-        daily_usage = db.query(DailyUsage).filter(
-            DailyUsage.user_id == user_id,
-            DailyUsage.date == today
-        ).first()
-        
-        if daily_usage:
-            daily_usage.chat_messages_count += 1
-        else:
-            daily_usage = DailyUsage(
-                user_id=user_id,
-                date=today,
-                chat_messages_count=1
-            )
-            db.add(daily_usage)
-        
-        db.commit()
+        return QuotaService.consume(db, user_id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES) is not None
+    
+    @staticmethod
+    def refund_daily_message(db: Session, user_id: int):
+        """
+        Give back a daily chat message whose exchange did not complete
+        """
+        QuotaService.refund(db, user_id, QuotaService.CHAT_MESSAGES)
     
     @staticmethod
     def create_conversation(db: Session, user_id: int, title: Optional[str] = None) -> ChatConversation:
@@ -96,12 +110,29 @@ class ChatService:
     @staticmethod
     def get_conversation_with_messages(db: Session, conversation_id: int, user_id: int) -> Optional[ChatConversation]:
         """
-        Get a conversation with all its messages, ensuring it belongs to the user
+        Get a conversation with all its messages, ensuring it belongs to the user.
+        Archived conversations are transparently restored from cold storage.
         """
-        return db.query(ChatConversation).filter(
+        conversation = db.query(ChatConversation).filter(
             ChatConversation.id == conversation_id,
             ChatConversation.user_id == user_id
         ).first()
+        
+        # An archived conversation can still have messages written while it was being archived
+        if conversation and conversation.archive is not None:
+            ChatArchiveService.restore_conversation(db, conversation)
+        
+        return conversation
+    
+    @staticmethod
+    def get_conversation_history(conversation: ChatConversation, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Return the last messages of a conversation in the format expected by the tutor
+        """
+        return [
+            {"role": msg.role.value, "content": msg.content}
+            for msg in conversation.messages[-limit:]
+        ]
     
     @staticmethod
     def add_message(db: Session, conversation_id: int, role: MessageRole, content: str) -> ChatMessage:
@@ -123,12 +154,19 @@ class ChatService:
         """
         Process a chat request and return both user message and AI response
         """
+        consumed = False
         try:
             # Check user access first
             access_info = ChatService.check_chat_access(db, user_id)
             if not access_info["has_access"]:
                 raise ValueError(access_info["message"])
             
+            # Free users pay for the exchange up front; the check and the increment are one statement
+            if access_info["role"] == "free":
+                if not ChatService.consume_daily_message(db, user_id):
+                    raise ValueError("Daily limit reached. Upgrade to Premium to continue")
+                consumed = True
+            
             # Get or create conversation
             if chat_request.conversation_id:
                 conversation = ChatService.get_conversation_with_messages(
@@ -146,13 +184,8 @@ class ChatService:
                 db, conversation.id, MessageRole.USER, chat_request.message
             )
             
-            # Get conversation history for context
-            conversation_history = []
-            for msg in conversation.messages[-10:]:  # Last 10 messages for context
-                conversation_history.append({
-                    "role": msg.role.value,
-                    "content": msg.content
-                })
+            # Get conversation history for context (last 10 messages)
+            conversation_history = ChatService.get_conversation_history(conversation)
             
             # Generate AI response
             ai_response_content = tutor_chat(
@@ -165,17 +198,73 @@ class ChatService:
                 db, conversation.id, MessageRole.ASSISTANT, ai_response_content
             )
             
-            # Increment daily usage for free users
-            if access_info["role"] == "free":
-                ChatService.increment_daily_usage(db, user_id)
-            
             return ai_message, conversation.id
             
         except Exception as e:
             logger.error(f"Error processing chat request: {str(e)}")
             db.rollback()
+            if consumed:
+                ChatService.refund_daily_message(db, user_id)
             raise Exception(f"Failed to process chat request: {str(e)}")
     
+    @staticmethod
+    def search_messages(db: Session, user_id: int, query: str, skip: int = 0, limit: int = 20) -> tuple[List[dict], bool]:
+        """
+        Full-text search over a user's chat messages, best matches first.
+        Uses the tsvector GIN index on Postgres and the FTS5 table on SQLite.
+        Returns the page of results and whether more results exist.
+        """
+        params = {"user_id": user_id, "limit": limit + 1, "skip": skip}
+        
+        if db.bind.dialect.name == "postgresql":
+            params["query"] = query
+            sql = text("""
+                SELECT m.id, m.conversation_id, c.title, m.role, m.created_at,
+                       ts_headline('english', m.content, q,
+                                   'MaxFragments=1, MaxWords=20, MinWords=5, StartSel=<mark>, StopSel=</mark>') AS snippet,
+                       ts_rank(to_tsvector('english', m.content), q) AS rank
+                FROM chat_messages m
+                JOIN chat_conversations c ON c.id = m.conversation_id,
+                     plainto_tsquery('english', :query) q
+                WHERE c.user_id = :user_id
+                  AND to_tsvector('english', m.content) @@ q
+                ORDER BY rank DESC, m.id DESC
+                LIMIT :limit OFFSET :skip
+            """)
+        else:
+            # Quote every term so user input can't inject FTS5 query syntax
+            terms = re.findall(r"\w+", query)
+            if not terms:
+                return [], False
+            params["query"] = " ".join(f'"{term}"' for term in terms)
+            sql = text("""
+                SELECT m.id, m.conversation_id, c.title, m.role, m.created_at,
+                       snippet(chat_messages_fts, 0, '<mark>', '</mark>', '...', 20) AS snippet,
+                       -bm25(chat_messages_fts) AS rank
+                FROM chat_messages_fts
+                JOIN chat_messages m ON m.id = chat_messages_fts.rowid
+                JOIN chat_conversations c ON c.id = m.conversation_id
+                WHERE chat_messages_fts MATCH :query
+                  AND c.user_id = :user_id
+                ORDER BY rank DESC, m.id DESC
+                LIMIT :limit OFFSET :skip
+            """)
+        
+        rows = db.execute(sql, params).all()
+        results = [
+            {
+                "message_id": row.id,
+                "conversation_id": row.conversation_id,
+                "conversation_title": row.title,
+                "role": MessageRole[row.role].value,
+                "snippet": row.snippet,
+                "rank": float(row.rank),
+                "created_at": row.created_at
+            }
+            for row in rows[:limit]
+        ]
+        return results, len(rows) > limit
+    
     @staticmethod
     def delete_conversation(db: Session, conversation_id: int, user_id: int) -> bool:
         """
@@ -193,4 +282,46 @@ class ChatService:
         db.commit()
         return True
 
+class AsyncChatService:
+    """Read paths of ChatService on an AsyncSession, for async routers"""
+    
+    @staticmethod
+    async def get_user_conversations(db: AsyncSession, user_id: int, limit: int = 20, skip: int = 0) -> List[ChatConversation]:
+        """
+        Get paginated conversations for a user.
+        """
+        result = await db.execute(
+            select(ChatConversation)
+            .options(selectinload(ChatConversation.messages))
+            .filter(ChatConversation.user_id == user_id)
+            .order_by(ChatConversation.updated_at.desc()).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    @staticmethod
+    async def get_conversation_with_messages(db: AsyncSession, conversation_id: int, user_id: int) -> Optional[ChatConversation]:
+        """
+        Get a conversation with all its messages, ensuring it belongs to the user.
+        Archived conversations are restored through the sync archive service.
+        """
+        stmt = select(ChatConversation).options(selectinload(ChatConversation.messages)).filter(
+            ChatConversation.id == conversation_id,
+            ChatConversation.user_id == user_id
+        )
+        conversation = (await db.execute(stmt)).scalars().first()
+        
+        archived = conversation is not None and (await db.execute(
+            select(ChatConversationArchive.conversation_id)
+            .where(ChatConversationArchive.conversation_id == conversation_id)
+        )).first() is not None
+        if archived:
+            restored = await db.run_sync(
+                lambda session: ChatArchiveService.restore_conversation(session, session.get(ChatConversation, conversation_id))
+            )
+            if restored:
+                result = await db.execute(stmt.execution_options(populate_existing=True))
+                conversation = result.scalars().first()
+        
+        return conversation
+
 chat_service = ChatService()
\ No newline at end of file
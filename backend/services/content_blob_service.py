@@ -0,0 +1,126 @@
+"""
+Pre-compressed detail responses for generated content.
+
+Quiz, mock exam and study plan content never changes after generation, so the detail
+response is rendered through its schema once, gzip-compressed and stored with its
+SHA-256. Detail endpoints then send the stored bytes as-is instead of re-parsing,
+re-validating and re-serializing the JSON columns on every request.
+"""
+
+import gzip
+import hashlib
+import logging
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import and_, delete, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.replicas import ReplicaSession
+from models.content_blob import ContentBlob
+from models.mock_exam import MockExam
+from models.quiz import Quiz
+from models.study_plan import StudyPlan
+from schemas.quiz import Quiz as QuizSchema
+from schemas.mock_exam import MockExam as MockExamSchema
+from schemas.study_plan import StudyPlanResponse
+
+logger = logging.getLogger(__name__)
+
+DETAIL_MODELS = {
+    "quiz": Quiz,
+    "mock_exam": MockExam,
+    "study_plan": StudyPlan,
+}
+
+# Response model of each kind's detail endpoint
+DETAIL_SCHEMAS = {
+    "quiz": QuizSchema,
+    "mock_exam": MockExamSchema,
+    "study_plan": StudyPlanResponse,
+}
+
+
+def build_blob(kind: str, obj) -> ContentBlob:
+    """Render obj as its detail response and compress it. gzip's mtime is fixed so equal content gives equal bytes."""
+    raw = DETAIL_SCHEMAS[kind].model_validate(obj).model_dump_json().encode("utf-8")
+    return ContentBlob(
+        kind=kind,
+        object_id=obj.id,
+        source_updated_at=obj.updated_at,
+        sha256=hashlib.sha256(raw).hexdigest(),
+        codec="gzip",
+        original_size=len(raw),
+        payload=gzip.compress(raw, compresslevel=9, mtime=0),
+    )
+
+
+def is_fresh(blob: Optional[ContentBlob], source_updated_at: Optional[datetime]) -> bool:
+    return blob is not None and blob.source_updated_at == source_updated_at
+
+
+class ContentBlobService:
+    @staticmethod
+    def put(db: Session, kind: str, obj):
+        """
+        Add the blob for a new or updated row to the caller's transaction, so row and
+        blob commit together. The blob is only a cache of the row: if rendering fails
+        it is logged and skipped, and the next read rebuilds it.
+        """
+        db.flush()  # Assigns the id of a new row
+        try:
+            blob = build_blob(kind, obj)
+        except Exception as e:
+            logger.warning(f"Could not render {kind} {obj.id} content blob: {str(e)}")
+            return
+        ContentBlobService.delete(db, kind, obj.id)
+        db.add(blob)
+
+    @staticmethod
+    def delete(db: Session, kind: str, object_id: int):
+        """Drop the blob of a row; committed together with the caller's change."""
+        db.query(ContentBlob).filter(ContentBlob.kind == kind, ContentBlob.object_id == object_id).delete()
+
+
+class AsyncContentBlobService:
+    """Blob reads and lazy (re)builds on an AsyncSession, for the async detail endpoints"""
+
+    @staticmethod
+    async def get_detail(db: AsyncSession, kind: str, object_id: int, user_id: int) -> Optional[ContentBlob]:
+        """
+        The user's row and its blob in one query; None if the row doesn't exist or isn't
+        theirs. A missing or stale blob is rebuilt from the full row.
+        """
+        model = DETAIL_MODELS[kind]
+        result = await db.execute(
+            select(model.updated_at, ContentBlob)
+            .outerjoin(ContentBlob, and_(ContentBlob.kind == kind, ContentBlob.object_id == model.id))
+            .where(model.id == object_id, model.user_id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        updated_at, blob = row
+        if is_fresh(blob, updated_at):
+            return blob
+        obj = (await db.execute(select(model).where(model.id == object_id))).scalars().one()
+        return await AsyncContentBlobService.rebuild(db, kind, obj)
+
+    @staticmethod
+    async def rebuild(db: AsyncSession, kind: str, obj) -> ContentBlob:
+        """
+        Build the blob for a row whose blob is missing or stale, saving it when the
+        session can write. On a read replica it is served without being saved.
+        """
+        blob = build_blob(kind, obj)
+        if isinstance(db.sync_session, ReplicaSession):
+            return blob
+        try:
+            await db.execute(
+                delete(ContentBlob).where(ContentBlob.kind == kind, ContentBlob.object_id == obj.id)
+            )
+            db.add(blob)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Could not store {kind} {obj.id} content blob: {str(e)}")
+        return blob
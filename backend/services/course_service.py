@@ -1,13 +1,21 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, func
+from core.database import get_by_id
+from core.pagination import Keyset, Page, PageParams, paginate
 from models.course import Course
 from schemas.course import CourseCreate
+from services.read_models import CourseRow, course_rows, course_select
 from fastapi import HTTPException
 from typing import List, Optional
 
-def get_all_courses(db: Session) -> List[Course]:
-    """Retrieve all courses from the database."""
-    return db.query(Course).all()
+def get_all_courses(db: Session) -> List[CourseRow]:
+    """Retrieve all courses from the database as read rows."""
+    return course_rows(db)
+
+def get_course_page(db: Session, params: PageParams) -> Page:
+    """A page of courses as read rows, in id order."""
+    return paginate(db, course_select(), Keyset(Course.id, Course.id, descending=False), params,
+                    row_type=CourseRow, estimate_table=Course.__tablename__)
 
 def create_course(db: Session, course_data: CourseCreate) -> Course:
     """Create a new course in the database."""
@@ -41,7 +49,7 @@ def search_courses(db: Session, keyword: str, limit: int = 10) -> List[Course]:
 
 def get_course_by_id(db: Session, course_id: int) -> Optional[Course]:
     """Get a course by its ID."""
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course = get_by_id(db, Course, course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     return course
\ No newline at end of file
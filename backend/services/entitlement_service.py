@@ -0,0 +1,175 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from models.user import User, UserRole
+from core import config
+from core.database import get_db
+from utils.auth import get_current_user
+from services.quota_service import QuotaService, FREE_DAILY_CHAT_MESSAGES, FREE_DAILY_QUIZZES
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class Entitlements:
+    """
+    A user's role and subscription state, resolved once per request.
+    Every feature check is answered from these fields; usage counters are read
+    at most once per request and only for free-tier quota checks.
+    """
+    def __init__(self, user_id: int, role: Optional[UserRole], subscription_status: Optional[str]):
+        self.user_id = user_id
+        self.role = role
+        self.subscription_status = subscription_status
+        self._usage: Dict[str, int] = {}
+    
+    @property
+    def exists(self) -> bool:
+        return self.role is not None
+    
+    @property
+    def is_unlimited(self) -> bool:
+        return self.role in [UserRole.ADMIN, UserRole.PREMIUM]
+    
+    def usage(self, db: Session, counter: str) -> int:
+        if counter not in self._usage:
+            self._usage[counter] = QuotaService.get_usage(db, self.user_id, counter)
+        return self._usage[counter]
+    
+    def chat_access(self, db: Session) -> dict:
+        """
+        Returns: {"has_access": bool, "remaining_messages": int, "role": str, "message": str}
+        """
+        if not self.exists:
+            return {"has_access": False, "remaining_messages": 0, "role": "unknown", "message": "User not found"}
+        
+        # Mentor role cannot access chat
+        if self.role == UserRole.MENTOR:
+            return {"has_access": False, "remaining_messages": 0, "role": "mentor", "message": "Chat not available for mentors"}
+        
+        # Admin and Premium have unlimited access
+        if self.is_unlimited:
+            return {"has_access": True, "remaining_messages": -1, "role": self.role.value, "message": "Unlimited access"}
+        
+        # Free users have daily limit
+        if self.role == UserRole.FREE:
+            remaining = max(0, FREE_DAILY_CHAT_MESSAGES - self.usage(db, QuotaService.CHAT_MESSAGES))
+            
+            if remaining > 0:
+                return {"has_access": True, "remaining_messages": remaining, "role": "free", "message": f"{remaining} messages remaining today"}
+            else:
+                return {"has_access": False, "remaining_messages": 0, "role": "free", "message": "Daily limit reached. Upgrade to Premium to continue"}
+        
+        return {"has_access": False, "remaining_messages": 0, "role": self.role.value, "message": "Unknown role"}
+    
+    def quiz_access(self, db: Session) -> dict:
+        """
+        Returns: {"has_access": bool, "remaining_quizzes": int, "role": str, "message": str}
+        """
+        if not self.exists:
+            return {"has_access": False, "remaining_quizzes": 0, "role": "unknown", "message": "User not found"}
+        
+        # Mentor role cannot access quizzes
+        if self.role == UserRole.MENTOR:
+            return {"has_access": False, "remaining_quizzes": 0, "role": "mentor", "message": "Quiz feature not available for mentors"}
+        
+        # Admin and Premium have unlimited access
+        if self.is_unlimited:
+            return {"has_access": True, "remaining_quizzes": -1, "role": self.role.value, "message": "Unlimited access"}
+        
+        # Free users have daily limit of 3 quizzes
+        if self.role == UserRole.FREE:
+            remaining = max(0, FREE_DAILY_QUIZZES - self.usage(db, QuotaService.QUIZZES))
+            
+            if remaining > 0:
+                return {"has_access": True, "remaining_quizzes": remaining, "role": "free", "message": f"{remaining} quiz{'es' if remaining != 1 else ''} remaining today"}
+            else:
+                return {"has_access": False, "remaining_quizzes": 0, "role": "free", "message": "Daily limit reached (3/3 quizzes used). Upgrade to Premium for unlimited access"}
+        
+        return {"has_access": False, "remaining_quizzes": 0, "role": self.role.value, "message": "Unknown role"}
+    
+    def mock_exam_access(self) -> dict:
+        """
+        Only premium users and admins can access mock exams
+        Returns: {"has_access": bool, "message": str, "user_role": str}
+        """
+        if not self.exists:
+            return {"has_access": False, "message": "User not found", "user_role": "unknown"}
+        
+        if self.is_unlimited:
+            return {"has_access": True, "message": "Access granted to mock exams", "user_role": self.role.value}
+        
+        # Free users and mentors cannot access mock exams
+        return {
+            "has_access": False,
+            "message": "Mock exams are only available for Premium users. Please upgrade your account.",
+            "user_role": self.role.value
+        }
+
+class EntitlementService:
+    """
+    Cross-request cache of (role, subscription_status) per user, a bounded LRU of at
+    most ENTITLEMENT_CACHE_SIZE users.
+    Each entry records the users.version it was read with, and a hit is only served
+    after a primary-key read of that column still matches, so a role or subscription
+    change made by any worker is seen immediately by all of them. invalidate() drops
+    the local entry early; ENTITLEMENT_CACHE_TTL_SECONDS bounds how long idle entries
+    are kept.
+    """
+    _lock = threading.Lock()
+    _entries: "OrderedDict[int, Tuple[float, Optional[int], Optional[UserRole], Optional[str]]]" = OrderedDict()
+    
+    @classmethod
+    def resolve(cls, db: Session, user_id: int) -> Entitlements:
+        """
+        Get a user's entitlements, reading only users.version while the cached entry is current
+        """
+        now = time.monotonic()
+        with cls._lock:
+            entry = cls._entries.get(user_id)
+            if entry is not None and entry[0] <= now:
+                del cls._entries[user_id]
+                entry = None
+        
+        if entry is not None:
+            version = db.query(User.version).filter(User.id == user_id).scalar()
+            if version == entry[1]:
+                with cls._lock:
+                    if user_id in cls._entries:
+                        cls._entries.move_to_end(user_id)
+                return Entitlements(user_id, entry[2], entry[3])
+        
+        row = db.query(User.version, User.role, User.subscription_status).filter(User.id == user_id).first()
+        version, role, subscription_status = (row.version, row.role, row.subscription_status) if row else (None, None, None)
+        
+        if config.ENTITLEMENT_CACHE_SIZE > 0:
+            with cls._lock:
+                cls._entries[user_id] = (now + config.ENTITLEMENT_CACHE_TTL_SECONDS, version, role, subscription_status)
+                cls._entries.move_to_end(user_id)
+                while len(cls._entries) > config.ENTITLEMENT_CACHE_SIZE:
+                    cls._entries.popitem(last=False)
+        
+        return Entitlements(user_id, role, subscription_status)
+    
+    @classmethod
+    def invalidate(cls, user_id: int):
+        """
+        Drop a user's cached entitlements after their role or subscription changed
+        """
+        with cls._lock:
+            cls._entries.pop(user_id, None)
+        logger.info(f"Invalidated cached entitlements for user {user_id}")
+    
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
+
+def get_entitlements(
+    db: Session = Depends(get_db),
+    current_user: Dict = Depends(get_current_user)
+) -> Entitlements:
+    """Request-scoped dependency resolving the current user's entitlements"""
+    return EntitlementService.resolve(db, current_user["id"])
@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+from core.database import get_by_id
+from core.pagination import Keyset, Page, PageParams, paginate
 from models.mentor_session import MentorSession, MentorAvailability, MentorProfile, SessionReview, SessionStatus
 from models.user import User, UserRole
 from schemas.mentor_session import (
@@ -12,6 +14,7 @@ from datetime import datetime, timedelta, time
 from typing import List, Optional, Dict, Any
 import logging
 from services.stripe_service import StripeService
+from services.read_models import MentorRow, available_mentor_rows, available_mentor_select
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +26,7 @@ class MentorService:
     def create_mentor_profile(self, db: Session, user_id: int, profile_data: MentorProfileCreate) -> MentorProfile:
         """Create a mentor profile for a user"""
         # Check if user exists and has mentor role
-        user = db.query(User).filter(User.id == user_id).first()
+        user = get_by_id(db, User, user_id)
         if not user:
             raise ValueError("User not found")
         
@@ -256,7 +259,7 @@ class MentorService:
             return None
         
         # Check permissions
-        user = db.query(User).filter(User.id == user_id).first()
+        user = get_by_id(db, User, user_id)
         if not user:
             return None
         
@@ -279,34 +282,14 @@ class MentorService:
         return session
     
     # Mentor Discovery
-    def get_available_mentors(self, db: Session, expertise_area: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get list of available mentors"""
-        query = db.query(User, MentorProfile).join(MentorProfile).filter(
-            User.role == UserRole.MENTOR,
-            MentorProfile.is_accepting_sessions == True
-        )
-        
-        if expertise_area:
-            query = query.filter(MentorProfile.expertise_areas.contains(expertise_area))
-        
-        results = query.all()
-        
-        mentors = []
-        for user, profile in results:
-            mentors.append({
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "bio": profile.bio,
-                "expertise_areas": profile.expertise_areas,
-                "hourly_rate": profile.hourly_rate,
-                "years_experience": profile.years_experience,
-                "average_rating": profile.average_rating,
-                "total_sessions": profile.total_sessions,
-                "is_accepting_sessions": profile.is_accepting_sessions
-            })
-        
-        return mentors
+    def get_available_mentors(self, db: Session, expertise_area: Optional[str] = None) -> List[MentorRow]:
+        """Get list of available mentors as read rows"""
+        return available_mentor_rows(db, expertise_area)
+    
+    def get_available_mentor_page(self, db: Session, params: PageParams, expertise_area: Optional[str] = None) -> Page:
+        """Get a page of available mentors as read rows, in id order"""
+        return paginate(db, available_mentor_select(expertise_area), Keyset(User.id, User.id, descending=False),
+                        params, row_type=MentorRow)
     
     # Payment Integration
     def create_session_payment(self, db: Session, session_id: int, success_url: str, cancel_url: str) -> Dict[str, str]:
@@ -318,7 +301,7 @@ class MentorService:
         if session.payment_status == "paid":
             raise ValueError("Session already paid")
         
-        student = db.query(User).filter(User.id == session.student_id).first()
+        student = get_by_id(db, User, session.student_id)
         if not student:
             raise ValueError("Student not found")
         
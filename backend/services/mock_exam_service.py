@@ -1,11 +1,15 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import Keyset, Page, PageParams, apaginate
 from models.mock_exam import MockExam, MockExamStatus
-from models.user import User, UserRole
 from schemas.mock_exam import (
     MockExamRequest, MockExamSubmission, MockExamUserAnswer, 
     MockExamContent
 )
-from services.openai_service import OpenAIService
+from services.openai_service import get_openai_service
+from services.entitlement_service import EntitlementService
+from services.content_blob_service import ContentBlobService
 from typing import List, Optional
 import logging
 from datetime import datetime
@@ -14,6 +18,12 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# Columns the mock exam history renders; exam_content and user_answers are only loaded by the detail endpoints
+MOCK_EXAM_SUMMARY_COLUMNS = (
+    MockExam.id, MockExam.user_id, MockExam.certification, MockExam.difficulty, MockExam.score,
+    MockExam.status, MockExam.completed_at, MockExam.created_at, MockExam.updated_at,
+)
+
 class MockExamService:
     @staticmethod
     def check_mock_exam_access(db: Session, user_id: int) -> dict:
@@ -22,24 +32,7 @@ class MockExamService:
         Only premium users and admins can access mock exams
         Returns: {"has_access": bool, "message": str, "user_role": str}
         """
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return {"has_access": False, "message": "User not found", "user_role": "unknown"}
-        
-        # Only Premium and Admin users can access mock exams
-        if user.role in [UserRole.ADMIN, UserRole.PREMIUM]:
-            return {
-                "has_access": True, 
-                "message": "Access granted to mock exams", 
-                "user_role": user.role.value
-            }
-        
-        # Free users and mentors cannot access mock exams
-        return {
-            "has_access": False, 
-            "message": "Mock exams are only available for Premium users. Please upgrade your account.", 
-            "user_role": user.role.value
-        }
+        return EntitlementService.resolve(db, user_id).mock_exam_access()
     
     @staticmethod
     def generate_mock_exam_content(certification: str, difficulty: str = "intermediate") -> dict:
@@ -48,7 +41,7 @@ class MockExamService:
         Mock exams are always at certification level (intermediate difficulty)
         """
         try:
-            openai_service = OpenAIService()
+            openai_service = get_openai_service()
             
             # Optimized system message for faster generation
             system_message = f"""Generate exactly 20 multiple-choice questions for {certification} certification exam. Return ONLY valid JSON without markdown or code blocks.
@@ -147,11 +140,6 @@ Requirements: 20 questions, 4 options each, certification-level difficulty, brie
             if not access_info["has_access"]:
                 raise Exception(access_info["message"])
             
-            # Get user for verification
-            user = db.query(User).filter(User.id == user_id).first()
-            if not user:
-                raise Exception("User not found")
-            
             logger.info(f"Generating mock exam for user {user_id}: {mock_exam_request.certification} (certification level)")
             
             # Generate mock exam content using OpenAI (always certification level)
@@ -175,6 +163,7 @@ Requirements: 20 questions, 4 options each, certification-level difficulty, brie
             )
             
             db.add(db_mock_exam)
+            ContentBlobService.put(db, "mock_exam", db_mock_exam)
             db.commit()
             db.refresh(db_mock_exam)
             
@@ -240,6 +229,7 @@ Requirements: 20 questions, 4 options each, certification-level difficulty, brie
             mock_exam.status = status
             mock_exam.completed_at = datetime.utcnow()
             mock_exam.updated_at = datetime.utcnow()
+            ContentBlobService.put(db, "mock_exam", mock_exam)
             
             db.commit()
             db.refresh(mock_exam)
@@ -265,9 +255,9 @@ Requirements: 20 questions, 4 options each, certification-level difficulty, brie
     @staticmethod
     def get_user_mock_exams(db: Session, user_id: int, skip: int = 0, limit: int = 20) -> List[MockExam]:
         """
-        Get all mock exams for a user with pagination
+        Get a page of mock exam summaries for a user, without the exam JSON
         """
-        return db.query(MockExam).filter(
+        return db.query(MockExam).options(load_only(*MOCK_EXAM_SUMMARY_COLUMNS)).filter(
             MockExam.user_id == user_id
         ).order_by(MockExam.created_at.desc()).offset(skip).limit(limit).all()
     
@@ -293,6 +283,7 @@ Requirements: 20 questions, 4 options each, certification-level difficulty, brie
                 return False
             
             db.delete(mock_exam)
+            ContentBlobService.delete(db, "mock_exam", mock_exam_id)
             db.commit()
             
             logger.info(f"Mock exam {mock_exam_id} deleted successfully")
@@ -347,4 +338,38 @@ Requirements: 20 questions, 4 options each, certification-level difficulty, brie
             
         except Exception as e:
             logger.error(f"Error getting mock exam statistics: {str(e)}")
-            raise Exception(f"Failed to get mock exam statistics: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to get mock exam statistics: {str(e)}")
+
+class AsyncMockExamService:
+    """Read paths of MockExamService on an AsyncSession, for async routers"""
+    
+    @staticmethod
+    async def get_mock_exam(db: AsyncSession, user_id: int, mock_exam_id: int) -> Optional[MockExam]:
+        result = await db.execute(
+            select(MockExam).filter(MockExam.id == mock_exam_id, MockExam.user_id == user_id)
+        )
+        return result.scalars().first()
+    
+    @staticmethod
+    async def get_user_mock_exams(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 20) -> List[MockExam]:
+        result = await db.execute(
+            select(MockExam).options(load_only(*MOCK_EXAM_SUMMARY_COLUMNS)).filter(MockExam.user_id == user_id)
+            .order_by(MockExam.created_at.desc()).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    @staticmethod
+    async def get_user_mock_exam_page(db: AsyncSession, user_id: int, params: PageParams, skip: int = 0) -> Page:
+        """Newest-first page of mock exam summaries, by cursor (or legacy skip when no cursor is given)"""
+        return await apaginate(
+            db, select(MockExam).options(load_only(*MOCK_EXAM_SUMMARY_COLUMNS)).filter(MockExam.user_id == user_id),
+            Keyset(MockExam.created_at, MockExam.id), params, skip=skip
+        )
+    
+    @staticmethod
+    async def get_mock_exam_count(db: AsyncSession, user_id: int) -> int:
+        result = await db.execute(
+            select(func.count()).select_from(MockExam).filter(MockExam.user_id == user_id)
+        )
+        return result.scalar_one()
+
@@ -1,14 +1,16 @@
 from sqlalchemy.orm import Session
+from core.database import get_by_id
 from models.module import Module
 from models.course import Course
 from schemas.module import ModuleCreate
+from services.read_models import ModuleRow, module_rows
 from fastapi import HTTPException
 from typing import List, Optional
 
 def create_module(db: Session, course_id: int, module_data: ModuleCreate) -> Module:
     """Create a new module for a specific course."""
     # Verify course exists
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course = get_by_id(db, Course, course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
@@ -22,20 +24,20 @@ def create_module(db: Session, course_id: int, module_data: ModuleCreate) -> Mod
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create module: {str(e)}")
 
-def get_modules_by_course(db: Session, course_id: int) -> List[Module]:
-    """Get all modules for a specific course."""
+def get_modules_by_course(db: Session, course_id: int) -> List[ModuleRow]:
+    """Get all modules for a specific course as read rows."""
     # Verify course exists
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course = get_by_id(db, Course, course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
-    modules = db.query(Module).filter(Module.course_id == course_id).all()
+    modules = module_rows(db, course_id)
     # Return empty list if no modules found instead of raising exception
     return modules
 
 def get_module_by_id(db: Session, module_id: int) -> Optional[Module]:
     """Get a module by its ID."""
-    module = db.query(Module).filter(Module.id == module_id).first()
+    module = get_by_id(db, Module, module_id)
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
     return module
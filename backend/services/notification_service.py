@@ -1,4 +1,6 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from core.pagination import Keyset, Page, PageParams, paginate
 from models.notification import Notification
 from schemas.notification import NotificationCreate
 from fastapi import HTTPException
@@ -25,6 +27,10 @@ def get_all_notifications(db: Session) -> List[Notification]:
     """Retrieve all notifications ordered by creation date (newest first)."""
     return db.query(Notification).order_by(Notification.created_at.desc()).all()
 
+def get_notification_page(db: Session, params: PageParams) -> Page:
+    """A page of notifications, newest first."""
+    return paginate(db, select(Notification), Keyset(Notification.created_at, Notification.id), params)
+
 def get_notification_by_id(db: Session, notification_id: int) -> Notification:
     """Get a notification by its ID."""
     notification = db.query(Notification).filter(Notification.id == notification_id).first()
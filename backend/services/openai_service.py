@@ -1,7 +1,7 @@
-from openai import OpenAI
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from core import config
 import logging
+import threading
 import time
 import json
 
@@ -12,6 +12,8 @@ class OpenAIService:
         if not config.OPENAI_API_KEY:
             raise ValueError("OpenAI API key is not configured. Please set OPENAI_API_KEY environment variable.")
         
+        from openai import OpenAI  # Imported on first use to keep the SDK off the startup path
+        
         self.client = OpenAI(api_key=config.OPENAI_API_KEY)
         self.model = config.OPENAI_MODEL
         self.max_tokens = config.OPENAI_MAX_TOKENS
@@ -38,21 +40,9 @@ class OpenAIService:
     
 
     
-    def tutor_chat_response(self, user_question: str, conversation_history: List[Dict[str, str]] = None) -> str:
-        """
-        Generate a tutor response using Microsoft Trainer persona
-        
-        Args:
-            user_question: The student's question
-            conversation_history: Previous messages in the conversation
-            
-        Returns:
-            AI tutor response as a string
-        """
-        try:
-            self._rate_limit()
-            
-            system_message = """
+    def _build_tutor_messages(self, user_question: str, conversation_history: List[Dict[str, str]] = None) -> List[Dict[str, str]]:
+        """Build the chat completion message list for the Microsoft Trainer persona"""
+        system_message = """
                 You are a certified Microsoft Trainer specializing in Azure and Microsoft security. 
                 Your job is to tutor students preparing for certifications like AZ-900, SC-900, and AZ-104. 
 
@@ -67,24 +57,38 @@ class OpenAIService:
                 - Write in a conversational, easy-to-read format
                 """
 
+        # Build conversation context
+        messages = [{"role": "system", "content": system_message}]
+        
+        # Add conversation history if provided
+        if conversation_history:
+            for msg in conversation_history[-10:]:  # Keep last 10 messages for context
+                messages.append({
+                    "role": msg["role"],
+                    "content": msg["content"]
+                })
+        
+        # Add current user question
+        messages.append({"role": "user", "content": user_question})
+        return messages
+    
+    def tutor_chat_response(self, user_question: str, conversation_history: List[Dict[str, str]] = None) -> str:
+        """
+        Generate a tutor response using Microsoft Trainer persona
+        
+        Args:
+            user_question: The student's question
+            conversation_history: Previous messages in the conversation
             
-            # Build conversation context
-            messages = [{"role": "system", "content": system_message}]
-            
-            # Add conversation history if provided
-            if conversation_history:
-                for msg in conversation_history[-10:]:  # Keep last 10 messages for context
-                    messages.append({
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
-            
-            # Add current user question
-            messages.append({"role": "user", "content": user_question})
+        Returns:
+            AI tutor response as a string
+        """
+        try:
+            self._rate_limit()
             
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=messages,
+                messages=self._build_tutor_messages(user_question, conversation_history),
                 max_tokens=self.max_tokens,
                 temperature=0.7  # Slightly creative but focused
             )
@@ -94,7 +98,51 @@ class OpenAIService:
         except Exception as e:
             logger.error(f"Error generating tutor response: {str(e)}")
             raise Exception(f"Failed to generate tutor response: {str(e)}")
-
+    
+    def tutor_chat_stream(
+        self,
+        user_question: str,
+        conversation_history: List[Dict[str, str]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[str]:
+        """
+        Stream a tutor response token by token.
+        
+        Args:
+            user_question: The student's question
+            conversation_history: Previous messages in the conversation
+            cancel_event: When set, generation stops after the current chunk and the
+                upstream HTTP stream is closed
+            
+        Yields:
+            Text deltas as they arrive from the model
+        """
+        self._rate_limit()
+        
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_tutor_messages(user_question, conversation_history),
+                max_tokens=self.max_tokens,
+                temperature=0.7,
+                stream=True
+            )
+        except Exception as e:
+            logger.error(f"Error starting tutor response stream: {str(e)}")
+            raise Exception(f"Failed to generate tutor response: {str(e)}")
+        
+        try:
+            for chunk in stream:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        finally:
+            stream.close()
+    
     def generate_study_plan(self, certification: str, duration_days: int, daily_hours: float) -> Dict:
         """
         Generate a personalized study plan using AI based on certification, duration, and daily hours
@@ -297,20 +345,38 @@ Ensure all questions are:
             logger.error(f"Error generating quiz: {str(e)}")
             raise Exception(f"Failed to generate quiz: {str(e)}")
 
-# Global instance
-openai_service = OpenAIService()
+# Global instance, created on first use so importing this module needs neither the SDK nor a key
+_openai_service: Optional[OpenAIService] = None
+_openai_service_lock = threading.Lock()
+
+def get_openai_service() -> OpenAIService:
+    global _openai_service
+    if _openai_service is None:
+        with _openai_service_lock:
+            if _openai_service is None:
+                _openai_service = OpenAIService()
+    return _openai_service
 
 # Utility function for tutor chat
 def tutor_chat(user_question: str, conversation_history: List[Dict[str, str]] = None) -> str:
     """Convenience function for tutor chat"""
-    return openai_service.tutor_chat_response(user_question, conversation_history)
+    return get_openai_service().tutor_chat_response(user_question, conversation_history)
+
+# Utility function for streaming tutor chat
+def tutor_chat_stream(
+    user_question: str,
+    conversation_history: List[Dict[str, str]] = None,
+    cancel_event: Optional[threading.Event] = None
+) -> Iterator[str]:
+    """Convenience function for streaming tutor chat"""
+    return get_openai_service().tutor_chat_stream(user_question, conversation_history, cancel_event)
 
 # Utility function for study plan generation
 def generate_ai_study_plan(certification: str, duration_days: int, daily_hours: float) -> Dict:
     """Convenience function for AI study plan generation"""
-    return openai_service.generate_study_plan(certification, duration_days, daily_hours)
+    return get_openai_service().generate_study_plan(certification, duration_days, daily_hours)
 
 # Utility function for quiz generation
 def generate_ai_quiz(certification: str, topic: str, difficulty: str) -> Dict:
     """Convenience function for AI quiz generation"""
-    return openai_service.generate_quiz(certification, topic, difficulty)
\ No newline at end of file
+    return get_openai_service().generate_quiz(certification, topic, difficulty)
\ No newline at end of file
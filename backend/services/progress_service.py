@@ -1,4 +1,7 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from core.database import get_by_id
+from core.pagination import Keyset, Page, PageParams, paginate
 from models.progress import Progress
 from models.module import Module
 from models.user import User
@@ -8,12 +11,12 @@ from typing import List, Optional
 def mark_module_completed(db: Session, user_id: int, module_id: int) -> Progress:
     """Mark a module as completed for a specific user."""
     # Verify user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_by_id(db, User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Verify module exists
-    module = db.query(Module).filter(Module.id == module_id).first()
+    module = get_by_id(db, Module, module_id)
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
     
@@ -35,21 +38,30 @@ def mark_module_completed(db: Session, user_id: int, module_id: int) -> Progress
 
 def get_user_progress(db: Session, user_id: int) -> List[Progress]:
     """Get all progress records for a specific user."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_by_id(db, User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     return db.query(Progress).filter(Progress.user_id == user_id).all()
 
+def get_user_progress_page(db: Session, user_id: int, params: PageParams) -> Page:
+    """A page of a user's progress records, in id order."""
+    user = get_by_id(db, User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return paginate(db, select(Progress).where(Progress.user_id == user_id),
+                    Keyset(Progress.id, Progress.id, descending=False), params)
+
 def unmark_module_completed(db: Session, user_id: int, module_id: int) -> Progress:
     """Unmark a module as completed for a specific user."""
     # Verify user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_by_id(db, User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Verify module exists
-    module = db.query(Module).filter(Module.id == module_id).first()
+    module = get_by_id(db, Module, module_id)
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
     
@@ -69,7 +81,7 @@ def unmark_module_completed(db: Session, user_id: int, module_id: int) -> Progre
 
 def get_module_progress(db: Session, module_id: int) -> List[Progress]:
     """Get all progress records for a specific module."""
-    module = db.query(Module).filter(Module.id == module_id).first()
+    module = get_by_id(db, Module, module_id)
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
     
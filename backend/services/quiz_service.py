@@ -1,16 +1,26 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import Keyset, Page, PageParams, apaginate
 from models.quiz import Quiz
-from models.user import User, UserRole
-from models.daily_usage import DailyUsage
 from schemas.quiz import QuizRequest, QuizCreate, QuizSubmission, UserAnswer, QuizContent
 from services.openai_service import generate_ai_quiz
+from services.quota_service import QuotaService, FREE_DAILY_QUIZZES
+from services.entitlement_service import EntitlementService
+from services.content_blob_service import ContentBlobService
 from typing import List, Optional
 import logging
-from datetime import datetime, date
+from datetime import datetime
 import json
 
 logger = logging.getLogger(__name__)
 
+# Columns the quiz history renders; quiz_content and user_answers are only loaded by the detail endpoints
+QUIZ_SUMMARY_COLUMNS = (
+    Quiz.id, Quiz.user_id, Quiz.certification, Quiz.topic, Quiz.difficulty,
+    Quiz.score, Quiz.completed_at, Quiz.created_at, Quiz.updated_at,
+)
+
 class QuizService:
     @staticmethod
     def check_quiz_access(db: Session, user_id: int) -> dict:
@@ -18,82 +28,33 @@ class QuizService:
         Check if user has access to quiz generation and return access info
         Returns: {"has_access": bool, "remaining_quizzes": int, "role": str, "message": str}
         """
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return {"has_access": False, "remaining_quizzes": 0, "role": "unknown", "message": "User not found"}
-        
-        # Mentor role cannot access quizzes
-        if user.role == UserRole.MENTOR:
-            return {"has_access": False, "remaining_quizzes": 0, "role": "mentor", "message": "Quiz feature not available for mentors"}
-        
-        # Admin and Premium have unlimited access
-        if user.role in [UserRole.ADMIN, UserRole.PREMIUM]:
-            return {"has_access": True, "remaining_quizzes": -1, "role": user.role.value, "message": "Unlimited access"}
-        
-        # Free users have daily limit of 3 quizzes
-        if user.role == UserRole.FREE:
-            today = date.today()
-            daily_usage = db.query(DailyUsage).filter(
-                DailyUsage.user_id == user_id,
-                DailyUsage.date == today
-            ).first()
-            
-            quizzes_used = daily_usage.quiz_count if daily_usage else 0
-            remaining = max(0, 3 - quizzes_used)
-            
-            if remaining > 0:
-                return {"has_access": True, "remaining_quizzes": remaining, "role": "free", "message": f"{remaining} quiz{'es' if remaining != 1 else ''} remaining today"}
-            else:
-                return {"has_access": False, "remaining_quizzes": 0, "role": "free", "message": "Daily limit reached (3/3 quizzes used). Upgrade to Premium for unlimited access"}
-        
-        return {"has_access": False, "remaining_quizzes": 0, "role": user.role.value, "message": "Unknown role"}
+        return EntitlementService.resolve(db, user_id).quiz_access(db)
     
     @staticmethod
-    def increment_daily_quiz_usage(db: Session, user_id: int):
+    def consume_daily_quiz(db: Session, user_id: int) -> bool:
         """
-        Increment the daily quiz count for a user
+        Atomically use one of the user's free daily quizzes.
+        Returns False if the daily limit has already been reached.
         """
-        try:
-            today = date.today()
-            daily_usage = db.query(DailyUsage).filter(
-                DailyUsage.user_id == user_id,
-                DailyUsage.date == today
-            ).first()
-            
-            if daily_usage:
-                daily_usage.quiz_count += 1
-            else:
-                daily_usage = DailyUsage(
-                    user_id=user_id,
-                    date=today,
-                    quiz_count=1,
-                    chat_messages_count=0
-                )
-                db.add(daily_usage)
-            
-            db.commit()
-            logger.info(f"Incremented daily quiz usage for user {user_id}")
-            
-        except Exception as e:
-            logger.error(f"Error incrementing daily quiz usage: {str(e)}")
-            db.rollback()
-            raise Exception(f"Failed to update daily usage: {str(e)}")
+        return QuotaService.consume(db, user_id, QuotaService.QUIZZES, FREE_DAILY_QUIZZES) is not None
     
     @staticmethod
     def generate_quiz(db: Session, user_id: int, quiz_request: QuizRequest) -> Quiz:
         """
         Generate a new quiz using OpenAI and save it to the database with access control
         """
+        consumed = False
         try:
             # Check access first
             access_info = QuizService.check_quiz_access(db, user_id)
             if not access_info["has_access"]:
                 raise Exception(access_info["message"])
             
-            # Get user for role checking
-            user = db.query(User).filter(User.id == user_id).first()
-            if not user:
-                raise Exception("User not found")
+            # Free users pay for the quiz up front; the check and the increment are one statement
+            if access_info["role"] == "free":
+                if not QuizService.consume_daily_quiz(db, user_id):
+                    raise Exception("Daily limit reached (3/3 quizzes used). Upgrade to Premium for unlimited access")
+                consumed = True
             
             logger.info(f"Generating quiz for user {user_id}: {quiz_request.certification} - {quiz_request.topic} ({quiz_request.difficulty})")
             
@@ -119,19 +80,18 @@ class QuizService:
             )
             
             db.add(db_quiz)
+            ContentBlobService.put(db, "quiz", db_quiz)
             db.commit()
             db.refresh(db_quiz)
             
-            # Increment daily usage for free users
-            if user.role == UserRole.FREE:
-                QuizService.increment_daily_quiz_usage(db, user_id)
-            
             logger.info(f"Quiz generated successfully with ID: {db_quiz.id}")
             return db_quiz
             
         except Exception as e:
             logger.error(f"Error generating quiz: {str(e)}")
             db.rollback()
+            if consumed:
+                QuotaService.refund(db, user_id, QuotaService.QUIZZES)
             raise Exception(f"Failed to generate quiz: {str(e)}")
     
     @staticmethod
@@ -184,6 +144,7 @@ class QuizService:
             quiz.score = score
             quiz.completed_at = datetime.utcnow()
             quiz.updated_at = datetime.utcnow()
+            ContentBlobService.put(db, "quiz", quiz)
             
             db.commit()
             db.refresh(quiz)
@@ -209,9 +170,9 @@ class QuizService:
     @staticmethod
     def get_user_quizzes(db: Session, user_id: int, skip: int = 0, limit: int = 20) -> List[Quiz]:
         """
-        Get all quizzes for a user with pagination
+        Get a page of quiz summaries for a user, without the quiz JSON
         """
-        return db.query(Quiz).filter(
+        return db.query(Quiz).options(load_only(*QUIZ_SUMMARY_COLUMNS)).filter(
             Quiz.user_id == user_id
         ).order_by(Quiz.created_at.desc()).offset(skip).limit(limit).all()
     
@@ -237,6 +198,7 @@ class QuizService:
                 return False
             
             db.delete(quiz)
+            ContentBlobService.delete(db, "quiz", quiz_id)
             db.commit()
             
             logger.info(f"Quiz {quiz_id} deleted successfully")
@@ -280,4 +242,38 @@ class QuizService:
             
         except Exception as e:
             logger.error(f"Error getting quiz statistics: {str(e)}")
-            raise Exception(f"Failed to get quiz statistics: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to get quiz statistics: {str(e)}")
+
+class AsyncQuizService:
+    """Read paths of QuizService on an AsyncSession, for async routers"""
+    
+    @staticmethod
+    async def get_quiz(db: AsyncSession, user_id: int, quiz_id: int) -> Optional[Quiz]:
+        result = await db.execute(
+            select(Quiz).filter(Quiz.id == quiz_id, Quiz.user_id == user_id)
+        )
+        return result.scalars().first()
+    
+    @staticmethod
+    async def get_user_quizzes(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 20) -> List[Quiz]:
+        result = await db.execute(
+            select(Quiz).options(load_only(*QUIZ_SUMMARY_COLUMNS)).filter(Quiz.user_id == user_id)
+            .order_by(Quiz.created_at.desc()).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    @staticmethod
+    async def get_user_quiz_page(db: AsyncSession, user_id: int, params: PageParams, skip: int = 0) -> Page:
+        """Newest-first page of quiz summaries, by cursor (or legacy skip when no cursor is given)"""
+        return await apaginate(
+            db, select(Quiz).options(load_only(*QUIZ_SUMMARY_COLUMNS)).filter(Quiz.user_id == user_id),
+            Keyset(Quiz.created_at, Quiz.id), params, skip=skip
+        )
+    
+    @staticmethod
+    async def get_quiz_count(db: AsyncSession, user_id: int) -> int:
+        result = await db.execute(
+            select(func.count()).select_from(Quiz).filter(Quiz.user_id == user_id)
+        )
+        return result.scalar_one()
+
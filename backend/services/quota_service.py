@@ -0,0 +1,236 @@
+from sqlalchemy.orm import Session
+from models.daily_usage import DailyUsage
+from core.database import dialect_insert
+from typing import Callable, Dict, Optional, Tuple
+from datetime import date
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Daily limits for free-tier users
+FREE_DAILY_CHAT_MESSAGES = 3
+FREE_DAILY_QUIZZES = 3
+
+COUNTERS = ("chat_messages_count", "quiz_count")
+
+class MemoryQuotaStore:
+    """
+    Process-local daily usage counters with write-behind persistence.
+    Counters are loaded from daily_usage on start, consumed under a lock without
+    touching the database, and the accumulated deltas are upserted into daily_usage
+    by a background thread every QUOTA_FLUSH_INTERVAL_SECONDS.
+    Limits are enforced per process: run a single worker when this store is enabled.
+    """
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[int, date, str], int] = {}
+        self._pending: Dict[Tuple[int, date], Dict[str, int]] = {}
+        self._session_factory: Optional[Callable[[], Session]] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self, session_factory: Callable[[], Session], flush_interval: float):
+        """
+        Recover today's counters from the database and start the flush thread
+        """
+        self._session_factory = session_factory
+        db = session_factory()
+        try:
+            self.load(db)
+        finally:
+            db.close()
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(flush_interval,), name="quota-flush", daemon=True
+        )
+        self._thread.start()
+        self.enabled = True
+        logger.info("In-memory quota store started")
+    
+    def stop(self):
+        """
+        Stop the flush thread and write out any pending increments
+        """
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._flush_with_new_session()
+        logger.info("In-memory quota store stopped")
+    
+    def load(self, db: Session):
+        """
+        Replace the in-memory counters with today's rows from daily_usage
+        """
+        today = date.today()
+        rows = db.query(DailyUsage).filter(DailyUsage.date == today).all()
+        with self._lock:
+            self._counts = {}
+            self._pending = {}
+            for row in rows:
+                for counter in COUNTERS:
+                    self._counts[(row.user_id, today, counter)] = getattr(row, counter)
+    
+    def get_usage(self, user_id: int, counter: str) -> int:
+        with self._lock:
+            return self._counts.get((user_id, date.today(), counter), 0)
+    
+    def consume(self, user_id: int, counter: str, limit: int) -> Optional[int]:
+        today = date.today()
+        with self._lock:
+            used = self._counts.get((user_id, today, counter), 0)
+            if used >= limit:
+                return None
+            self._counts[(user_id, today, counter)] = used + 1
+            self._add_pending(user_id, today, counter, 1)
+            return used + 1
+    
+    def refund(self, user_id: int, counter: str):
+        today = date.today()
+        with self._lock:
+            used = self._counts.get((user_id, today, counter), 0)
+            if used > 0:
+                self._counts[(user_id, today, counter)] = used - 1
+                self._add_pending(user_id, today, counter, -1)
+    
+    def _add_pending(self, user_id: int, day: date, counter: str, delta: int):
+        deltas = self._pending.setdefault((user_id, day), dict.fromkeys(COUNTERS, 0))
+        deltas[counter] += delta
+    
+    def flush(self, db: Session) -> int:
+        """
+        Write accumulated deltas to daily_usage in one batch.
+        Returns the number of (user, day) rows written.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            # Counters of previous days can no longer change
+            today = date.today()
+            self._counts = {key: value for key, value in self._counts.items() if key[1] == today}
+        
+        rows = [
+            {"user_id": user_id, "date": day, **deltas}
+            for (user_id, day), deltas in pending.items()
+            if any(deltas.values())
+        ]
+        if not rows:
+            return 0
+        
+        table = DailyUsage.__table__
+        stmt = dialect_insert(db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.date],
+            set_={counter: table.c[counter] + stmt.excluded[counter] for counter in COUNTERS}
+        )
+        try:
+            db.execute(stmt, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Put the deltas back so the next flush retries them
+            with self._lock:
+                for row in rows:
+                    for counter in COUNTERS:
+                        self._add_pending(row["user_id"], row["date"], counter, row[counter])
+            raise
+        
+        return len(rows)
+    
+    def _flush_with_new_session(self):
+        db = self._session_factory()
+        try:
+            self.flush(db)
+        except Exception as e:
+            logger.error(f"Error flushing quota counters: {str(e)}")
+        finally:
+            db.close()
+    
+    def _run(self, flush_interval: float):
+        while not self._stop_event.wait(flush_interval):
+            self._flush_with_new_session()
+
+memory_quota = MemoryQuotaStore()
+
+class QuotaService:
+    """
+    Daily usage counters backed by DailyUsage.
+    Consuming a unit is a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING on the
+    (user_id, date) unique constraint, so the limit check and the increment happen
+    atomically in the database and concurrent requests can never exceed the limit.
+    When the in-memory store is enabled (QUOTA_BACKEND=memory) the same operations
+    are served from memory and no query is issued.
+    """
+    CHAT_MESSAGES = "chat_messages_count"
+    QUIZZES = "quiz_count"
+    
+    @staticmethod
+    def get_usage(db: Session, user_id: int, counter: str) -> int:
+        """
+        Get today's value of a usage counter for a user
+        """
+        if memory_quota.enabled:
+            return memory_quota.get_usage(user_id, counter)
+        
+        value = db.query(getattr(DailyUsage, counter)).filter(
+            DailyUsage.user_id == user_id,
+            DailyUsage.date == date.today()
+        ).scalar()
+        return value or 0
+    
+    @staticmethod
+    def consume(db: Session, user_id: int, counter: str, limit: int) -> Optional[int]:
+        """
+        Atomically use one unit of today's quota.
+        Returns the new usage count, or None if the limit was already reached.
+        """
+        if memory_quota.enabled:
+            return memory_quota.consume(user_id, counter, limit)
+        
+        table = DailyUsage.__table__
+        column = table.c[counter]
+        
+        values = {"user_id": user_id, "date": date.today(), "chat_messages_count": 0, "quiz_count": 0}
+        values[counter] = 1
+        stmt = dialect_insert(db, table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.date],
+            set_={counter: column + 1},
+            where=column < limit
+        ).returning(column)
+        
+        try:
+            used = db.execute(stmt).scalar()
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error consuming {counter} quota for user {user_id}: {str(e)}")
+            db.rollback()
+            raise Exception(f"Failed to update daily usage: {str(e)}")
+        
+        return used
+    
+    @staticmethod
+    def refund(db: Session, user_id: int, counter: str):
+        """
+        Give back one unit of today's quota after the work it paid for failed
+        """
+        if memory_quota.enabled:
+            memory_quota.refund(user_id, counter)
+            return
+        
+        column = getattr(DailyUsage, counter)
+        try:
+            db.query(DailyUsage).filter(
+                DailyUsage.user_id == user_id,
+                DailyUsage.date == date.today(),
+                column > 0
+            ).update({column: column - 1}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error refunding {counter} quota for user {user_id}: {str(e)}")
+            db.rollback()
@@ -0,0 +1,98 @@
+"""
+Read models for the hot list endpoints.
+
+These queries select plain columns with Core select() and return NamedTuple rows: no
+identity map, no instance state, no relationship descriptors. Each row type has exactly
+the fields of the endpoint's response schema, in the same order, and core.response
+encodes NamedTuples as JSON objects, so rows go straight to the serializer. The
+*_select() statements are exposed for core.pagination, which pages them by keyset.
+"""
+
+from typing import List, NamedTuple, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models.course import Course
+from models.mentor_session import MentorProfile
+from models.module import Module
+from models.user import User, UserRole
+
+
+class CourseRow(NamedTuple):
+    """Fields of schemas.course.CourseOut"""
+    id: int
+    title: str
+    description: str
+    instructor_name: str
+
+
+class ModuleRow(NamedTuple):
+    """Fields of schemas.module.ModuleOut"""
+    title: str
+    content_link: str
+    id: int
+
+
+class UserRow(NamedTuple):
+    """Fields of schemas.user.UserOut"""
+    id: int
+    email: str
+    name: Optional[str]
+    role: UserRole
+    auth_method: str
+    has_password: bool
+
+
+class MentorRow(NamedTuple):
+    """Fields of schemas.mentor_session.MentorListItem"""
+    id: int
+    name: str
+    email: str
+    bio: Optional[str]
+    expertise_areas: Optional[str]
+    hourly_rate: float
+    years_experience: Optional[int]
+    average_rating: float
+    total_sessions: int
+    is_accepting_sessions: bool
+
+
+def _rows(db: Session, row_type, statement) -> list:
+    return [row_type._make(row) for row in db.execute(statement)]
+
+
+def course_select():
+    return select(Course.id, Course.title, Course.description, Course.instructor_name)
+
+
+def course_rows(db: Session) -> List[CourseRow]:
+    return _rows(db, CourseRow, course_select())
+
+
+def module_rows(db: Session, course_id: int) -> List[ModuleRow]:
+    return _rows(db, ModuleRow, select(Module.title, Module.content_link, Module.id).where(Module.course_id == course_id))
+
+
+def user_select():
+    return select(User.id, User.email, User.name, User.role, User.auth_method, User.has_password)
+
+
+def user_rows(db: Session) -> List[UserRow]:
+    return _rows(db, UserRow, user_select().order_by(User.id.asc()))
+
+
+def available_mentor_select(expertise_area: Optional[str] = None):
+    statement = select(
+        User.id, User.name, User.email, MentorProfile.bio, MentorProfile.expertise_areas,
+        MentorProfile.hourly_rate, MentorProfile.years_experience, MentorProfile.average_rating,
+        MentorProfile.total_sessions, MentorProfile.is_accepting_sessions,
+    ).join(MentorProfile, MentorProfile.user_id == User.id).where(
+        User.role == UserRole.MENTOR,
+        MentorProfile.is_accepting_sessions == True
+    )
+    if expertise_area:
+        statement = statement.where(MentorProfile.expertise_areas.contains(expertise_area))
+    return statement
+
+
+def available_mentor_rows(db: Session, expertise_area: Optional[str] = None) -> List[MentorRow]:
+    return _rows(db, MentorRow, available_mentor_select(expertise_area))
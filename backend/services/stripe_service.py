@@ -1,7 +1,8 @@
-import stripe
 from typing import Optional, Dict, Any
 from core.config import STRIPE_SECRET_KEY, STRIPE_PRICE_ID, STRIPE_WEBHOOK_SECRET
+from core.database import get_by_id
 from models.user import User, UserRole
+from services.user_service import invalidate_user_caches
 from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
@@ -10,7 +11,16 @@ logger = logging.getLogger(__name__)
 
 class StripeService:
     def __init__(self):
-        stripe.api_key = STRIPE_SECRET_KEY
+        self._stripe = None
+    
+    @property
+    def stripe(self):
+        """The stripe SDK, imported and configured on first use to keep it off the startup path"""
+        if self._stripe is None:
+            import stripe
+            stripe.api_key = STRIPE_SECRET_KEY
+            self._stripe = stripe
+        return self._stripe
     
     def create_checkout_session(
         self, 
@@ -21,7 +31,7 @@ class StripeService:
     ) -> Dict[str, str]:
         """Create a Stripe checkout session for subscription"""
         try:
-            session = stripe.checkout.Session.create(
+            session = self.stripe.checkout.Session.create(
                 payment_method_types=['card'],
                 line_items=[{
                     'price': STRIPE_PRICE_ID,
@@ -45,14 +55,14 @@ class StripeService:
                 'session_id': session.id,
                 'session_url': session.url
             }
-        except stripe.error.StripeError as e:
+        except self.stripe.error.StripeError as e:
             logger.error(f"Stripe error creating checkout session: {e}")
             raise Exception(f"Failed to create checkout session: {str(e)}")
     
     def get_subscription_status(self, subscription_id: str) -> Optional[Dict[str, Any]]:
         """Get subscription status from Stripe"""
         try:
-            subscription = stripe.Subscription.retrieve(subscription_id)
+            subscription = self.stripe.Subscription.retrieve(subscription_id)
             return {
                 'id': subscription.id,
                 'status': subscription.status,
@@ -60,45 +70,45 @@ class StripeService:
                 'cancel_at_period_end': subscription.cancel_at_period_end,
                 'customer_id': subscription.customer
             }
-        except stripe.error.StripeError as e:
+        except self.stripe.error.StripeError as e:
             logger.error(f"Stripe error retrieving subscription: {e}")
             return None
     
     def cancel_subscription(self, subscription_id: str) -> bool:
         """Cancel a subscription at period end"""
         try:
-            stripe.Subscription.modify(
+            self.stripe.Subscription.modify(
                 subscription_id,
                 cancel_at_period_end=True
             )
             return True
-        except stripe.error.StripeError as e:
+        except self.stripe.error.StripeError as e:
             logger.error(f"Stripe error canceling subscription: {e}")
             return False
     
     def create_customer_portal_session(self, customer_id: str, return_url: str) -> Optional[str]:
         """Create a customer portal session for subscription management"""
         try:
-            session = stripe.billing_portal.Session.create(
+            session = self.stripe.billing_portal.Session.create(
                 customer=customer_id,
                 return_url=return_url,
             )
             return session.url
-        except stripe.error.StripeError as e:
+        except self.stripe.error.StripeError as e:
             logger.error(f"Stripe error creating portal session: {e}")
             return None
     
     def handle_webhook_event(self, payload: bytes, sig_header: str) -> Optional[Dict[str, Any]]:
         """Handle and verify Stripe webhook events"""
         try:
-            event = stripe.Webhook.construct_event(
+            event = self.stripe.Webhook.construct_event(
                 payload, sig_header, STRIPE_WEBHOOK_SECRET
             )
             return event
         except ValueError as e:
             logger.error(f"Invalid payload: {e}")
             return None
-        except stripe.error.SignatureVerificationError as e:
+        except self.stripe.error.SignatureVerificationError as e:
             logger.error(f"Invalid signature: {e}")
             return None
     
@@ -112,7 +122,7 @@ class StripeService:
     ) -> bool:
         """Update user subscription information in database"""
         try:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = get_by_id(db, User, user_id)
             if not user:
                 logger.error(f"User {user_id} not found")
                 return False
@@ -128,6 +138,7 @@ class StripeService:
                 user.role = UserRole.FREE
             
             db.commit()
+            invalidate_user_caches(user_id)
             logger.info(f"Updated subscription for user {user_id}: {status}")
             return True
         except Exception as e:
@@ -138,9 +149,9 @@ class StripeService:
     def get_customer_by_subscription(self, subscription_id: str) -> Optional[str]:
         """Get customer ID from subscription"""
         try:
-            subscription = stripe.Subscription.retrieve(subscription_id)
+            subscription = self.stripe.Subscription.retrieve(subscription_id)
             return subscription.customer
-        except stripe.error.StripeError as e:
+        except self.stripe.error.StripeError as e:
             logger.error(f"Error retrieving customer from subscription: {e}")
             return None
     
@@ -156,7 +167,7 @@ class StripeService:
     ) -> Dict[str, str]:
         """Create a Stripe checkout session for one-time mentor session payment"""
         try:
-            session = stripe.checkout.Session.create(
+            session = self.stripe.checkout.Session.create(
                 payment_method_types=['card'],
                 line_items=[{
                     'price_data': {
@@ -183,14 +194,14 @@ class StripeService:
                 'session_id': session.id,
                 'session_url': session.url
             }
-        except stripe.error.StripeError as e:
+        except self.stripe.error.StripeError as e:
             logger.error(f"Stripe error creating session payment: {e}")
             raise Exception(f"Failed to create payment session: {str(e)}")
     
     def get_payment_intent_status(self, payment_intent_id: str) -> Optional[Dict[str, Any]]:
         """Get payment intent status from Stripe"""
         try:
-            payment_intent = stripe.PaymentIntent.retrieve(payment_intent_id)
+            payment_intent = self.stripe.PaymentIntent.retrieve(payment_intent_id)
             return {
                 'id': payment_intent.id,
                 'status': payment_intent.status,
@@ -198,26 +209,26 @@ class StripeService:
                 'currency': payment_intent.currency,
                 'metadata': payment_intent.metadata
             }
-        except stripe.error.StripeError as e:
+        except self.stripe.error.StripeError as e:
             logger.error(f"Stripe error retrieving payment intent: {e}")
             return None
     
     def get_checkout_session(self, session_id: str) -> Optional[Any]:
         """Get checkout session from Stripe"""
         try:
-            session = stripe.checkout.Session.retrieve(session_id)
+            session = self.stripe.checkout.Session.retrieve(session_id)
             return session
-        except stripe.error.StripeError as e:
+        except self.stripe.error.StripeError as e:
             logger.error(f"Error retrieving checkout session: {e}")
             return None
     
     def verify_subscription_payment(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Verify subscription payment and return user info"""
         try:
-            session = stripe.checkout.Session.retrieve(session_id)
+            session = self.stripe.checkout.Session.retrieve(session_id)
             
             if session.payment_status == 'paid' and session.subscription:
-                subscription = stripe.Subscription.retrieve(session.subscription)
+                subscription = self.stripe.Subscription.retrieve(session.subscription)
                 
                 return {
                     'user_id': int(session.metadata.get('user_id')),
@@ -228,6 +239,6 @@ class StripeService:
             
             return None
             
-        except stripe.error.StripeError as e:
+        except self.stripe.error.StripeError as e:
             logger.error(f"Error verifying subscription payment: {e}")
             return None
\ No newline at end of file
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from core.database import get_by_id
 from models.study_plan_progress import StudyPlanProgress
 from models.study_plan import StudyPlan
 from models.user import User
@@ -12,16 +13,13 @@ class StudyPlanProgressService:
     def toggle_day_completion(cls, db: Session, user_id: int, study_plan_id: int, day_number: int) -> StudyPlanProgress:
         """Toggle completion status of a specific day in a study plan"""
         # Verify user exists
-        user = db.query(User).filter(User.id == user_id).first()
+        user = get_by_id(db, User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Verify study plan exists and belongs to user
-        study_plan = db.query(StudyPlan).filter(
-            StudyPlan.id == study_plan_id,
-            StudyPlan.user_id == user_id
-        ).first()
-        if not study_plan:
+        study_plan = get_by_id(db, StudyPlan, study_plan_id)
+        if not study_plan or study_plan.user_id != user_id:
             raise HTTPException(status_code=404, detail="Study plan not found")
         
         # Validate day number
@@ -67,11 +65,8 @@ class StudyPlanProgressService:
     def get_study_plan_progress(cls, db: Session, user_id: int, study_plan_id: int) -> List[StudyPlanProgress]:
         """Get all progress records for a specific study plan"""
         # Verify study plan exists and belongs to user
-        study_plan = db.query(StudyPlan).filter(
-            StudyPlan.id == study_plan_id,
-            StudyPlan.user_id == user_id
-        ).first()
-        if not study_plan:
+        study_plan = get_by_id(db, StudyPlan, study_plan_id)
+        if not study_plan or study_plan.user_id != user_id:
             raise HTTPException(status_code=404, detail="Study plan not found")
         
         return db.query(StudyPlanProgress).filter(
@@ -83,11 +78,8 @@ class StudyPlanProgressService:
     def get_progress_summary(cls, db: Session, user_id: int, study_plan_id: int) -> dict:
         """Get progress summary for a study plan"""
         # Get study plan
-        study_plan = db.query(StudyPlan).filter(
-            StudyPlan.id == study_plan_id,
-            StudyPlan.user_id == user_id
-        ).first()
-        if not study_plan:
+        study_plan = get_by_id(db, StudyPlan, study_plan_id)
+        if not study_plan or study_plan.user_id != user_id:
             raise HTTPException(status_code=404, detail="Study plan not found")
         
         # Get completed days
@@ -114,16 +106,13 @@ class StudyPlanProgressService:
     def mark_day_completed(cls, db: Session, user_id: int, study_plan_id: int, day_number: int) -> StudyPlanProgress:
         """Mark a specific day as completed"""
         # Verify user exists
-        user = db.query(User).filter(User.id == user_id).first()
+        user = get_by_id(db, User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Verify study plan exists and belongs to user
-        study_plan = db.query(StudyPlan).filter(
-            StudyPlan.id == study_plan_id,
-            StudyPlan.user_id == user_id
-        ).first()
-        if not study_plan:
+        study_plan = get_by_id(db, StudyPlan, study_plan_id)
+        if not study_plan or study_plan.user_id != user_id:
             raise HTTPException(status_code=404, detail="Study plan not found")
         
         # Validate day number
@@ -169,11 +158,8 @@ class StudyPlanProgressService:
     def mark_day_incomplete(cls, db: Session, user_id: int, study_plan_id: int, day_number: int) -> StudyPlanProgress:
         """Mark a specific day as incomplete"""
         # Verify study plan exists and belongs to user
-        study_plan = db.query(StudyPlan).filter(
-            StudyPlan.id == study_plan_id,
-            StudyPlan.user_id == user_id
-        ).first()
-        if not study_plan:
+        study_plan = get_by_id(db, StudyPlan, study_plan_id)
+        if not study_plan or study_plan.user_id != user_id:
             raise HTTPException(status_code=404, detail="Study plan not found")
         
         # Validate day number
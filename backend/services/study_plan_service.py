@@ -1,13 +1,24 @@
 from typing import Dict, List, Any, Generator
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_by_id
+from core.pagination import Keyset, Page, PageParams, apaginate
 from models.study_plan import StudyPlan
 from models.user import User, UserRole
 from services.openai_service import generate_ai_study_plan
+from services.content_blob_service import ContentBlobService
 from datetime import datetime, timedelta
 import asyncio
 import threading
 import json
 
+# Columns the study plan list renders; plan_content (hundreds of KB for long plans) is only loaded by the detail endpoint
+STUDY_PLAN_SUMMARY_COLUMNS = (
+    StudyPlan.id, StudyPlan.user_id, StudyPlan.certification, StudyPlan.certification_name,
+    StudyPlan.duration_days, StudyPlan.daily_hours, StudyPlan.created_at, StudyPlan.updated_at,
+)
+
 class StudyPlanService:
     
     # Supported Microsoft Security certifications - AI will generate detailed content
@@ -142,22 +153,23 @@ class StudyPlanService:
             plan_content=ai_plan
         )
         db.add(study_plan)
+        ContentBlobService.put(db, "study_plan", study_plan)
         db.commit()
         db.refresh(study_plan)
         return study_plan
     
     @classmethod
     def get_user_study_plans(cls, db: Session, user_id: int) -> List[StudyPlan]:
-        """Get all study plans for a user"""
-        return db.query(StudyPlan).filter(StudyPlan.user_id == user_id).order_by(StudyPlan.created_at.desc()).all()
+        """Get summaries of all study plans for a user, without the plan JSON"""
+        return db.query(StudyPlan).options(load_only(*STUDY_PLAN_SUMMARY_COLUMNS)).filter(StudyPlan.user_id == user_id).order_by(StudyPlan.created_at.desc()).all()
     
     @classmethod
     def get_study_plan(cls, db: Session, plan_id: int, user_id: int) -> StudyPlan:
         """Get a specific study plan for a user"""
-        return db.query(StudyPlan).filter(
-            StudyPlan.id == plan_id,
-            StudyPlan.user_id == user_id
-        ).first()
+        study_plan = get_by_id(db, StudyPlan, plan_id)
+        if not study_plan or study_plan.user_id != user_id:
+            return None
+        return study_plan
     
     @classmethod
     def delete_study_plan(cls, db: Session, plan_id: int, user_id: int) -> bool:
@@ -173,6 +185,7 @@ class StudyPlanService:
             
             # Then delete the study plan
             db.delete(plan)
+            ContentBlobService.delete(db, "study_plan", plan_id)
             db.commit()
             return True
         return False
@@ -187,4 +200,32 @@ class StudyPlanService:
         if user_role == UserRole.FREE:
             return [7]  # 7-day plan for free users
         else:
-            return [30, 60, 90]  # 30, 60, 90-day plans for premium users
\ No newline at end of file
+            return [30, 60, 90]  # 30, 60, 90-day plans for premium users
+
+class AsyncStudyPlanService:
+    """Read paths of StudyPlanService on an AsyncSession, for async routers"""
+    
+    @classmethod
+    async def get_user_study_plans(cls, db: AsyncSession, user_id: int) -> List[StudyPlan]:
+        """Get summaries of all study plans for a user, without the plan JSON"""
+        result = await db.execute(
+            select(StudyPlan).options(load_only(*STUDY_PLAN_SUMMARY_COLUMNS)).filter(StudyPlan.user_id == user_id).order_by(StudyPlan.created_at.desc())
+        )
+        return list(result.scalars().all())
+    
+    @classmethod
+    async def get_user_study_plan_page(cls, db: AsyncSession, user_id: int, params: PageParams) -> Page:
+        """Newest-first page of study plan summaries"""
+        return await apaginate(
+            db, select(StudyPlan).options(load_only(*STUDY_PLAN_SUMMARY_COLUMNS)).filter(StudyPlan.user_id == user_id),
+            Keyset(StudyPlan.created_at, StudyPlan.id), params
+        )
+    
+    @classmethod
+    async def get_study_plan(cls, db: AsyncSession, plan_id: int, user_id: int) -> StudyPlan:
+        """Get a specific study plan for a user"""
+        study_plan = await db.get(StudyPlan, plan_id)
+        if not study_plan or study_plan.user_id != user_id:
+            return None
+        return study_plan
+
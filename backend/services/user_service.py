@@ -1,27 +1,93 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from core.database import get_by_id, dialect_insert
+from core.pagination import Keyset, Page, PageParams, paginate
 from fastapi import HTTPException
-from models.user import User
-from schemas.user import UserCreate, UserProfileUpdate
-from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+from models.user import User, UserRole
+from schemas.user import UserCreate, UserProfileUpdate, UserOut
 from jose import jwt
 from datetime import datetime, timedelta, timezone
 from core import config
-from typing import Optional, Dict, Any
+from core.conditional import make_etag
+from services.entitlement_service import EntitlementService
+from services.read_models import UserRow, user_rows, user_select
+from utils.hashing import password_hasher
+from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+import threading
+import time
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+class ProfileCache:
+    """
+    Read-through cache of serialized user profiles and their ETags, keyed by user ID.
+    Each entry records the users.version it was built from; get_user_profile only
+    serves it while the row still has that version, so a write made by any worker
+    is seen by all of them. Entries are also dropped explicitly on writes in this
+    process and expire after PROFILE_CACHE_TTL_SECONDS, which bounds memory.
+    """
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[float, Dict, str, int]]" = OrderedDict()
+    
+    def get(self, user_id: int) -> Optional[Tuple[Dict, str, int]]:
+        """(profile, etag, version) of a live entry"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1], entry[2], entry[3]
+    
+    def put(self, user_id: int, profile: Dict, etag: str, version: int):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, profile, etag, version)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+profile_cache = ProfileCache(config.PROFILE_CACHE_SIZE, config.PROFILE_CACHE_TTL_SECONDS)
+
+# Stored instead of a hash for OAuth accounts without a password; never matches any password
+OAUTH_PASSWORD_SENTINEL = "!oauth-no-password"
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
+
+def _ensure_email_free(db: Session, email: str):
+    if db.query(User).filter(User.email == email).first():
+        raise HTTPException(status_code=400, detail="Email already registered")
 
 def create_user(db: Session, user: UserCreate) -> User:
     """Create a new user in the database."""
-    # Check if user exists
-    existing_user = db.query(User).filter(User.email == user.email).first()
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
+    _ensure_email_free(db, user.email)
+    # Hash outside the insert so a saturated hasher surfaces as 503
+    return _insert_user(db, user, get_password_hash(user.password))
+
+async def create_user_async(db: Session, user: UserCreate) -> User:
+    """
+    create_user for async endpoints: the queries run on the threadpool and the bcrypt
+    hash is awaited, so no worker thread sits waiting for the hasher.
+    """
+    await run_in_threadpool(_ensure_email_free, db, user.email)
+    hashed_password = await password_hasher.hash_async(user.password)
+    return await run_in_threadpool(_insert_user, db, user, hashed_password)
 
+def _insert_user(db: Session, user: UserCreate, hashed_password: str) -> User:
     try:
-        hashed_password = get_password_hash(user.password)
         new_user = User(
             email=user.email, 
             hashed_password=hashed_password, 
@@ -39,13 +105,40 @@ def create_user(db: Session, user: UserCreate) -> User:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify(plain_password, hashed_password)
+
+def _password_user(db: Session, email: str) -> User:
+    user = db.query(User).filter(User.email == email).first()
+    if not user or user.hashed_password == OAUTH_PASSWORD_SENTINEL:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return user
+
+def _store_rehash(db: Session, user: User, new_hash: str):
+    """Transparently upgrade hashes made with a different BCRYPT_ROUNDS."""
+    try:
+        user.hashed_password = new_hash
+        db.commit()
+    except Exception:
+        db.rollback()
 
 def authenticate_user(db: Session, email: str, password: str) -> User:
     """Authenticate a user with email and password."""
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = _password_user(db, email)
+    valid, new_hash = password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        _store_rehash(db, user, new_hash)
+    return user
+
+async def authenticate_user_async(db: Session, email: str, password: str) -> User:
+    """authenticate_user for async endpoints; see create_user_async."""
+    user = await run_in_threadpool(_password_user, db, email)
+    valid, new_hash = await password_hasher.verify_and_update_async(password, user.hashed_password)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        await run_in_threadpool(_store_rehash, db, user, new_hash)
     return user
 
 def create_access_token(data: Dict[str, Any]) -> str:
@@ -57,11 +150,42 @@ def create_access_token(data: Dict[str, Any]) -> str:
 
 def get_user_by_id(db: Session, user_id: int) -> User:
     """Get a user by their ID."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_by_id(db, User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
+def get_user_profile(db: Session, user_id: int) -> Tuple[Dict, str]:
+    """
+    Get a user's serialized profile and its ETag, from cache when possible.
+    A cached profile costs one primary-key read of users.version; the ETag is built
+    from that version, so every worker agrees on it. The result is kept in db.info
+    so the conditional check and the handler of one request share the read.
+    """
+    served = db.info.setdefault("user_profiles", {})
+    if user_id in served:
+        return served[user_id]
+    
+    cached = profile_cache.get(user_id)
+    if cached:
+        version = db.execute(select(User.version).where(User.id == user_id)).scalar_one_or_none()
+        if version == cached[2]:
+            served[user_id] = cached[0], cached[1]
+            return served[user_id]
+        profile_cache.invalidate(user_id)
+    
+    user = get_user_by_id(db, user_id)
+    profile = UserOut.model_validate(user).model_dump(mode="json")
+    etag = make_etag("user", user.id, user.version)
+    profile_cache.put(user_id, profile, etag, user.version)
+    served[user_id] = profile, etag
+    return profile, etag
+
+def invalidate_user_caches(user_id: int):
+    """Drop everything cached about a user after their row changed."""
+    profile_cache.invalidate(user_id)
+    EntitlementService.invalidate(user_id)
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """Get a user by their email."""
     return db.query(User).filter(User.email == email).first()
@@ -92,6 +216,8 @@ def update_user_profile(db: Session, user_id: int, update_data: UserProfileUpdat
         
         db.commit()
         db.refresh(user)
+        profile_cache.invalidate(user_id)
+        db.info.get("user_profiles", {}).pop(user_id, None)
         return user
     except HTTPException:
         db.rollback()
@@ -100,14 +226,18 @@ def update_user_profile(db: Session, user_id: int, update_data: UserProfileUpdat
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update user profile: {str(e)}")
 
-def get_all_users(db: Session) -> list[User]:
-    """Get all users (admin function)."""
-    return db.query(User).order_by(User.id.asc()).all()
+def get_all_users(db: Session) -> list[UserRow]:
+    """Get all users as read rows (admin function)."""
+    return user_rows(db)
+
+def get_user_page(db: Session, params: PageParams) -> Page:
+    """A page of users as read rows, in id order (admin function)."""
+    return paginate(db, user_select(), Keyset(User.id, User.id, descending=False), params,
+                    row_type=UserRow, estimate_table=User.__tablename__)
 
 def delete_user(db: Session, user_id: int) -> bool:
     """Delete a user by ID. Returns True on success."""
-    from models.user import UserRole
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_by_id(db, User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     # Prevent deleting the last admin
@@ -118,6 +248,7 @@ def delete_user(db: Session, user_id: int) -> bool:
     try:
         db.delete(user)
         db.commit()
+        invalidate_user_caches(user_id)
         return True
     except Exception as e:
         db.rollback()
@@ -125,8 +256,7 @@ def delete_user(db: Session, user_id: int) -> bool:
 
 def update_user_role(db: Session, user_id: int, new_role: str) -> User:
     """Update a user's role (admin function)."""
-    from models.user import UserRole
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_by_id(db, User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     try:
@@ -135,6 +265,7 @@ def update_user_role(db: Session, user_id: int, new_role: str) -> User:
             raise HTTPException(status_code=400, detail=f"Invalid role: {new_role}")
         user.role = role_map[new_role]
         db.commit()
+        invalidate_user_caches(user_id)
         db.refresh(user)
         return user
     except HTTPException:
@@ -143,22 +274,31 @@ def update_user_role(db: Session, user_id: int, new_role: str) -> User:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update role: {str(e)}")
 
-def create_user_oauth(db: Session, user: UserCreate) -> User:
-    """Create a new user for OAuth (without checking if user exists)."""
+def upsert_oauth_user(db: Session, email: str, name: Optional[str] = None):
+    """
+    Get or create an OAuth user in a single INSERT ... ON CONFLICT (email) statement.
+    New accounts get OAUTH_PASSWORD_SENTINEL instead of a password hash, so sign-up
+    does no bcrypt work. Returns a row with id, email, name and role.
+    """
+    table = User.__table__
+    stmt = dialect_insert(db, table).values(
+        email=email,
+        hashed_password=OAUTH_PASSWORD_SENTINEL,
+        name=name,
+        role=UserRole.FREE,
+        auth_method="google",
+        has_password=False  # OAuth users start without a user-set password
+    )
+    # No-op update so RETURNING also yields the row of an existing user
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.email],
+        set_={"email": stmt.excluded.email}
+    ).returning(table.c.id, table.c.email, table.c.name, table.c.role)
+    
     try:
-        hashed_password = get_password_hash(user.password)
-        new_user = User(
-            email=user.email, 
-            hashed_password=hashed_password, 
-            name=user.name,
-            role=user.role,  # Use role from schema (defaults to FREE)
-            auth_method="google",
-            has_password=False  # OAuth users start without a user-set password
-        )
-        db.add(new_user)
+        row = db.execute(stmt).one()
         db.commit()
-        db.refresh(new_user)
-        return new_user
+        return row
     except Exception as e:
         db.rollback()
-        raise HTTPException(status_code=500, detail=f"Failed to create user: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to sign in OAuth user: {str(e)}")
@@ -11,10 +11,11 @@ from faker import Faker
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from main import app
-from core.database import get_db, Base
+from core.database import get_db, get_read_db, get_read_session_factory, Base
 from models.user import User
 from models.course import Course
-from services.user_service import create_access_token, get_password_hash
+from services.user_service import create_access_token, get_password_hash, profile_cache
+from services.entitlement_service import EntitlementService
 
 fake = Faker()
 
@@ -66,6 +67,14 @@ def override_get_db():
         db.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_user_caches():
+    """Every test starts from a fresh database, so cached profiles and entitlements must not leak between tests."""
+    EntitlementService.clear()
+    profile_cache.clear()
+    yield
+
+
 @pytest.fixture(scope="function")
 def test_db():
     """Create a fresh database for each test."""
@@ -78,6 +87,8 @@ def test_db():
 def client(test_db):
     """Create a test client with overridden database dependency."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_read_session_factory] = lambda: TestingSessionLocal
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -0,0 +1,310 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from main import app
+from core.database import Base, get_db, get_async_db, get_async_read_db
+from models.user import User, UserRole
+from models.quiz import Quiz, QuizDifficulty
+from models.mock_exam import MockExam, MockExamDifficulty
+from models.study_plan import StudyPlan
+from models.content_blob import ContentBlob
+from models.chat import ChatConversationArchive, MessageRole
+from services.chat_service import ChatService, AsyncChatService
+from services.chat_archive_service import ChatArchiveService
+from services.mock_exam_service import MockExamService
+from services.quiz_service import QuizService
+from schemas.quiz import QuizSubmission, UserAnswer
+from services.study_plan_service import StudyPlanService
+from services.user_service import create_access_token
+
+
+QUIZ_CONTENT = {
+    "questions": [
+        {
+            "question_id": 1,
+            "question": "Which service enforces conditional access?",
+            "options": [{"option_id": "A", "text": "Entra ID"}, {"option_id": "B", "text": "Sentinel"}],
+            "correct_answer": "A",
+            "explanation": "Conditional access is an Entra ID feature."
+        }
+    ]
+}
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Create sync and aiosqlite engines over the same file-backed SQLite database."""
+    path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    yield sync_engine, async_engine
+    asyncio.run(async_engine.dispose())
+    sync_engine.dispose()
+
+
+@pytest.fixture
+def sync_session(engines):
+    """Sync session used to seed the database."""
+    session = sessionmaker(bind=engines[0])()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def async_client(engines):
+    """Test client whose sync and async sessions both point at the file database."""
+    SyncSession = sessionmaker(bind=engines[0], autoflush=False)
+    AsyncSessionLocal = async_sessionmaker(engines[1], expire_on_commit=False, autoflush=False)
+
+    def override_get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def learner(sync_session):
+    """Create a free-tier user and return it."""
+    user = User(email="async@example.com", hashed_password="unused", name="Async", role=UserRole.FREE)
+    sync_session.add(user)
+    sync_session.commit()
+    sync_session.refresh(user)
+    return user
+
+
+def auth_headers(user):
+    token = create_access_token(data={"sub": user.email, "role": user.role.value, "id": user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestAsyncReadEndpoints:
+    """Test cases for the read endpoints served from an AsyncSession."""
+
+    def test_quiz_list_and_detail(self, async_client, sync_session, learner):
+        """Test that quizzes written through the sync session are readable through the async routes."""
+        quiz = Quiz(user_id=learner.id, certification="SC-300", topic="Identity",
+                    difficulty=QuizDifficulty.BEGINNER, quiz_content=QUIZ_CONTENT)
+        sync_session.add(quiz)
+        sync_session.commit()
+
+        response = async_client.get("/quiz/", headers=auth_headers(learner))
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["quizzes"][0]["id"] == quiz.id
+
+        response = async_client.get(f"/quiz/{quiz.id}", headers=auth_headers(learner))
+        assert response.status_code == 200
+        assert response.json()["topic"] == "Identity"
+        assert response.json()["quiz_content"] == QUIZ_CONTENT
+
+    def test_list_endpoints_return_summaries(self, async_client, sync_session, learner):
+        """Test that history lists carry summary fields only, leaving the JSON to the detail routes."""
+        sync_session.add_all([
+            Quiz(user_id=learner.id, certification="SC-300", topic="Identity",
+                 difficulty=QuizDifficulty.BEGINNER, quiz_content=QUIZ_CONTENT),
+            StudyPlan(user_id=learner.id, certification="SC-300", certification_name="Identity",
+                      duration_days=7, daily_hours=1.0, plan_content={"daily_plan": []}),
+        ])
+        sync_session.commit()
+
+        quiz = async_client.get("/quiz/", headers=auth_headers(learner)).json()["quizzes"][0]
+        plan = async_client.get("/study-plans/", headers=auth_headers(learner)).json()["study_plans"][0]
+
+        assert quiz["topic"] == "Identity" and "quiz_content" not in quiz and "user_answers" not in quiz
+        assert plan["duration_days"] == 7 and "plan_content" not in plan
+
+    def test_quiz_detail_is_scoped_to_user(self, async_client, sync_session, learner):
+        """Test that another user's quiz is reported as not found."""
+        other = User(email="other-async@example.com", hashed_password="unused", name="Other", role=UserRole.FREE)
+        sync_session.add(other)
+        sync_session.commit()
+        quiz = Quiz(user_id=other.id, certification="SC-300", topic="Identity",
+                    difficulty=QuizDifficulty.BEGINNER, quiz_content=QUIZ_CONTENT)
+        sync_session.add(quiz)
+        sync_session.commit()
+
+        response = async_client.get(f"/quiz/{quiz.id}", headers=auth_headers(learner))
+        assert response.status_code == 404
+
+
+class TestPrecompressedDetails:
+    """Test cases for detail endpoints served from stored gzip blobs."""
+
+    def seed_quiz(self, sync_session, learner):
+        quiz = Quiz(user_id=learner.id, certification="SC-300", topic="Identity",
+                    difficulty=QuizDifficulty.BEGINNER, quiz_content=QUIZ_CONTENT)
+        sync_session.add(quiz)
+        sync_session.commit()
+        return quiz
+
+    def test_gzip_bytes_and_strong_etag(self, async_client, sync_session, learner):
+        """Test that a gzip-accepting client gets the stored bytes and can revalidate them."""
+        quiz = self.seed_quiz(sync_session, learner)
+        headers = {**auth_headers(learner), "Accept-Encoding": "gzip"}
+
+        response = async_client.get(f"/quiz/{quiz.id}", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        etag = response.headers["etag"]
+        assert etag.startswith('"') and etag.endswith('-gzip"')
+        assert response.json()["quiz_content"] == QUIZ_CONTENT
+
+        response = async_client.get(f"/quiz/{quiz.id}", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+    def test_identity_clients_get_plain_json(self, async_client, sync_session, learner):
+        """Test that clients not accepting gzip get decompressed JSON under a different ETag."""
+        quiz = self.seed_quiz(sync_session, learner)
+
+        response = async_client.get(f"/quiz/{quiz.id}", headers={**auth_headers(learner), "Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert not response.headers["etag"].endswith('-gzip"')
+        assert response.json()["topic"] == "Identity"
+
+    def test_submit_refreshes_blob(self, async_client, sync_session, learner):
+        """Test that the blob written at submit time carries the score."""
+        quiz = self.seed_quiz(sync_session, learner)
+        async_client.get(f"/quiz/{quiz.id}", headers=auth_headers(learner))
+        assert sync_session.query(ContentBlob).filter_by(kind="quiz", object_id=quiz.id).count() == 1
+
+        QuizService.submit_quiz(sync_session, learner.id, QuizSubmission(quiz_id=quiz.id, answers=[
+            UserAnswer(question_id=1, selected_option="A", is_correct=True)
+        ]))
+
+        response = async_client.get(f"/quiz/{quiz.id}", headers=auth_headers(learner))
+        assert response.json()["score"] == 100.0
+        assert sync_session.query(ContentBlob).filter_by(kind="quiz", object_id=quiz.id).count() == 1
+
+
+class TestHistoryListPagination:
+    """Test cases for cursor pages of the per-user history lists."""
+
+    def test_quiz_cursor_pages(self, async_client, sync_session, learner):
+        """Test that quiz pages follow created_at newest first and the cursor resumes after the last row."""
+        from datetime import datetime, timedelta
+        start = datetime(2025, 1, 1)
+        sync_session.add_all([
+            Quiz(user_id=learner.id, certification="SC-300", topic=f"Topic {i}", created_at=start + timedelta(minutes=i),
+                 difficulty=QuizDifficulty.BEGINNER, quiz_content=QUIZ_CONTENT)
+            for i in range(5)
+        ])
+        sync_session.commit()
+
+        first = async_client.get("/quiz/?limit=2", headers=auth_headers(learner)).json()
+        assert [q["topic"] for q in first["quizzes"]] == ["Topic 4", "Topic 3"]
+        assert first["page"]["has_more"] is True and first["total"] is None
+
+        second = async_client.get(f"/quiz/?limit=2&cursor={first['page']['next_cursor']}", headers=auth_headers(learner)).json()
+        assert [q["topic"] for q in second["quizzes"]] == ["Topic 2", "Topic 1"]
+
+        legacy = async_client.get("/quiz/?skip=2&limit=2", headers=auth_headers(learner)).json()
+        assert legacy["quizzes"] == second["quizzes"]
+
+
+class TestConditionalHistoryLists:
+    """Test cases for 304 answers on the per-user history lists."""
+
+    def test_quiz_list_revalidates_until_a_new_quiz(self, async_client, sync_session, learner):
+        """Test that the list ETag holds until the user's quizzes change, and depends on paging."""
+        sync_session.add(Quiz(user_id=learner.id, certification="SC-300", topic="Identity",
+                              difficulty=QuizDifficulty.BEGINNER, quiz_content=QUIZ_CONTENT))
+        sync_session.commit()
+        headers = auth_headers(learner)
+
+        etag = async_client.get("/quiz/", headers=headers).headers["etag"]
+        response = async_client.get("/quiz/", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert async_client.get("/quiz/?limit=5", headers={**headers, "If-None-Match": etag}).status_code == 200
+
+        sync_session.add(Quiz(user_id=learner.id, certification="SC-300", topic="Access",
+                              difficulty=QuizDifficulty.BEGINNER, quiz_content=QUIZ_CONTENT))
+        sync_session.commit()
+        response = async_client.get("/quiz/", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["total"] == 2
+        assert response.headers["etag"] != etag
+
+
+class TestSummaryQueries:
+    """Test cases for the summary list queries."""
+
+    def test_heavy_columns_are_not_loaded(self, sync_session, learner):
+        """Test that the sync list queries leave the JSON columns unloaded."""
+        sync_session.add_all([
+            Quiz(user_id=learner.id, certification="SC-300", topic="Identity",
+                 difficulty=QuizDifficulty.BEGINNER, quiz_content=QUIZ_CONTENT),
+            MockExam(user_id=learner.id, certification="SC-300",
+                     difficulty=MockExamDifficulty.BEGINNER, exam_content=QUIZ_CONTENT),
+            StudyPlan(user_id=learner.id, certification="SC-300", certification_name="Identity",
+                      duration_days=7, daily_hours=1.0, plan_content={"daily_plan": []}),
+        ])
+        sync_session.commit()
+        user_id = learner.id
+        sync_session.expunge_all()
+
+        quiz = QuizService.get_user_quizzes(sync_session, user_id)[0]
+        exam = MockExamService.get_user_mock_exams(sync_session, user_id)[0]
+        plan = StudyPlanService.get_user_study_plans(sync_session, user_id)[0]
+
+        assert {"quiz_content", "user_answers"} <= inspect(quiz).unloaded
+        assert {"exam_content", "user_answers"} <= inspect(exam).unloaded
+        assert "plan_content" in inspect(plan).unloaded
+
+
+class TestAsyncChatService:
+    """Test cases for AsyncChatService."""
+
+    def test_archived_conversation_is_restored(self, engines, sync_session, learner):
+        """Test that reading an archived conversation asynchronously rehydrates its messages."""
+        conversation = ChatService.create_conversation(sync_session, learner.id, "Archived")
+        ChatService.add_message(sync_session, conversation.id, MessageRole.USER, "What is PIM?")
+        ChatService.add_message(sync_session, conversation.id, MessageRole.ASSISTANT, "Privileged Identity Management.")
+        ChatArchiveService.archive_batch(sync_session, [conversation.id])
+
+        async def read():
+            async with async_sessionmaker(engines[1], expire_on_commit=False)() as db:
+                restored = await AsyncChatService.get_conversation_with_messages(db, conversation.id, learner.id)
+                return [m.content for m in restored.messages]
+
+        assert asyncio.run(read()) == ["What is PIM?", "Privileged Identity Management."]
+
+    def test_archive_with_live_message_is_restored(self, engines, sync_session, learner):
+        """Test that an archive is restored even when a later message kept the conversation non-empty."""
+        conversation = ChatService.create_conversation(sync_session, learner.id, "Archived")
+        first = ChatService.add_message(sync_session, conversation.id, MessageRole.USER, "What is PIM?")
+        ChatService.add_message(sync_session, conversation.id, MessageRole.USER, "And JIT access?")
+        # The state archive_batch leaves when the second message lands mid-batch
+        payload, original_size = ChatArchiveService._compress([first])
+        sync_session.add(ChatConversationArchive(conversation_id=conversation.id, user_id=learner.id,
+                                                 message_count=1, original_size=original_size, payload=payload))
+        sync_session.delete(first)
+        sync_session.commit()
+
+        async def read():
+            async with async_sessionmaker(engines[1], expire_on_commit=False)() as db:
+                restored = await AsyncChatService.get_conversation_with_messages(db, conversation.id, learner.id)
+                return sorted(m.content for m in restored.messages)
+
+        assert asyncio.run(read()) == ["And JIT access?", "What is PIM?"]
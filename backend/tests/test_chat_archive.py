@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime, timedelta
+from models.user import User, UserRole
+from models.chat import ChatConversation, ChatConversationArchive, ChatMessage, MessageRole
+from services.chat_archive_service import ChatArchiveService
+from services.chat_service import ChatService
+
+
+@pytest.fixture
+def chat_user(db_session):
+    """Create a user that owns chat conversations."""
+    user = User(email="archive@example.com", hashed_password="unused", name="Archive", role=UserRole.FREE)
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+def idle_conversation(db, user_id: int, days: int = 60) -> ChatConversation:
+    """Create a two-message conversation last touched `days` ago."""
+    conversation = ChatService.create_conversation(db, user_id, "Identity")
+    ChatService.add_message(db, conversation.id, MessageRole.USER, "What is PIM?")
+    ChatService.add_message(db, conversation.id, MessageRole.ASSISTANT, "Privileged Identity Management.")
+    idle_since = datetime.utcnow() - timedelta(days=days)
+    db.query(ChatMessage).filter(ChatMessage.conversation_id == conversation.id).update({"created_at": idle_since})
+    conversation.updated_at = idle_since
+    db.commit()
+    return conversation
+
+
+class TestChatArchive:
+    """Test cases for archiving idle conversations into compressed cold storage."""
+
+    def test_idle_conversations_are_archived_and_restored(self, db_session, chat_user):
+        """Test that idle conversations move to archive rows and come back on first access."""
+        idle = idle_conversation(db_session, chat_user.id)
+        active = idle_conversation(db_session, chat_user.id, days=0)
+
+        assert ChatArchiveService.archive_idle_conversations(db_session, idle_days=30) == 1
+        assert db_session.query(ChatMessage).filter(ChatMessage.conversation_id == idle.id).count() == 0
+        assert db_session.query(ChatMessage).filter(ChatMessage.conversation_id == active.id).count() == 2
+        archive = db_session.get(ChatConversationArchive, idle.id)
+        assert archive.message_count == 2
+        assert ChatArchiveService.archive_idle_conversations(db_session, idle_days=30) == 0
+
+        restored = ChatService.get_conversation_with_messages(db_session, idle.id, chat_user.id)
+
+        assert [m.content for m in restored.messages] == ["What is PIM?", "Privileged Identity Management."]
+        assert db_session.query(ChatConversationArchive).count() == 0
+
+    def test_message_written_during_archiving_stays_live(self, db_session, chat_user, monkeypatch):
+        """Test that only the messages copied into the archive are deleted."""
+        conversation = idle_conversation(db_session, chat_user.id)
+        compress = ChatArchiveService._compress
+
+        def compress_then_reply(messages):
+            # A reply lands after the batch read the conversation's messages
+            db_session.add(ChatMessage(conversation_id=conversation.id, role=MessageRole.USER, content="One more thing"))
+            db_session.flush()
+            return compress(messages)
+
+        monkeypatch.setattr(ChatArchiveService, "_compress", staticmethod(compress_then_reply))
+        ChatArchiveService.archive_batch(db_session, [conversation.id])
+
+        live = db_session.query(ChatMessage).filter(ChatMessage.conversation_id == conversation.id).all()
+        assert [m.content for m in live] == ["One more thing"]
+
+        db_session.expire_all()
+        restored = ChatService.get_conversation_with_messages(db_session, conversation.id, chat_user.id)
+        assert sorted(m.content for m in restored.messages) == [
+            "One more thing", "Privileged Identity Management.", "What is PIM?"
+        ]
@@ -0,0 +1,108 @@
+import pytest
+from models.user import User, UserRole
+from models.chat import MessageRole
+from services.chat_service import ChatService
+from services.user_service import create_access_token
+
+
+@pytest.fixture
+def chat_user(db_session):
+    """Create a free-tier user that owns chat conversations."""
+    user = User(email="learner@example.com", hashed_password="unused", name="Learner", role=UserRole.FREE)
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def other_user(db_session):
+    """Create a second user whose messages must never leak into search results."""
+    user = User(email="other@example.com", hashed_password="unused", name="Other", role=UserRole.FREE)
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+class TestChatSearchService:
+    """Test cases for ChatService.search_messages."""
+
+    def test_search_returns_ranked_snippets_with_conversation_ids(self, db_session, chat_user):
+        """Test that matching messages are returned with their conversation and a highlighted snippet."""
+        conversation = ChatService.create_conversation(db_session, chat_user.id, "Identity")
+        ChatService.add_message(db_session, conversation.id, MessageRole.USER, "How does conditional access work?")
+        ChatService.add_message(db_session, conversation.id, MessageRole.ASSISTANT, "Conditional access policies evaluate signals.")
+        ChatService.add_message(db_session, conversation.id, MessageRole.USER, "What about Sentinel workbooks?")
+
+        results, has_more = ChatService.search_messages(db_session, chat_user.id, "conditional access")
+
+        assert has_more is False
+        assert len(results) == 2
+        assert all(r["conversation_id"] == conversation.id for r in results)
+        assert all("<mark>" in r["snippet"] for r in results)
+        assert results[0]["rank"] >= results[1]["rank"]
+
+    def test_search_is_scoped_to_user(self, db_session, chat_user, other_user):
+        """Test that another user's messages are not searchable."""
+        conversation = ChatService.create_conversation(db_session, other_user.id, "Private")
+        ChatService.add_message(db_session, conversation.id, MessageRole.USER, "Defender for Endpoint onboarding")
+
+        results, _ = ChatService.search_messages(db_session, chat_user.id, "defender")
+
+        assert results == []
+
+    def test_search_paginates(self, db_session, chat_user):
+        """Test skip/limit pagination and the has_more flag."""
+        conversation = ChatService.create_conversation(db_session, chat_user.id, "KQL")
+        for i in range(5):
+            ChatService.add_message(db_session, conversation.id, MessageRole.USER, f"KQL query number {i}")
+
+        first_page, has_more = ChatService.search_messages(db_session, chat_user.id, "kql", skip=0, limit=3)
+        second_page, has_more_after = ChatService.search_messages(db_session, chat_user.id, "kql", skip=3, limit=3)
+
+        assert len(first_page) == 3 and has_more is True
+        assert len(second_page) == 2 and has_more_after is False
+        assert {r["message_id"] for r in first_page}.isdisjoint(r["message_id"] for r in second_page)
+
+    def test_index_follows_deletes(self, db_session, chat_user):
+        """Test that deleted conversations disappear from the index without a rebuild."""
+        conversation = ChatService.create_conversation(db_session, chat_user.id, "Temporary")
+        ChatService.add_message(db_session, conversation.id, MessageRole.USER, "Purview retention labels")
+
+        ChatService.delete_conversation(db_session, conversation.id, chat_user.id)
+        results, _ = ChatService.search_messages(db_session, chat_user.id, "purview")
+
+        assert results == []
+
+    def test_query_syntax_is_escaped(self, db_session, chat_user):
+        """Test that FTS operators in user input are treated as plain terms."""
+        conversation = ChatService.create_conversation(db_session, chat_user.id, "Syntax")
+        ChatService.add_message(db_session, conversation.id, MessageRole.USER, "Azure AD NEAR entitlement")
+
+        results, _ = ChatService.search_messages(db_session, chat_user.id, 'entitlement* (NEAR')
+
+        assert len(results) == 1
+
+
+class TestChatSearchEndpoint:
+    """Test cases for GET /chat/search."""
+
+    def test_search_endpoint(self, client, db_session, chat_user):
+        """Test the endpoint returns results for the authenticated user."""
+        conversation = ChatService.create_conversation(db_session, chat_user.id, "Zero Trust")
+        ChatService.add_message(db_session, conversation.id, MessageRole.USER, "Explain zero trust principles")
+        token = create_access_token({"sub": chat_user.email, "role": "free", "id": chat_user.id})
+
+        response = client.get("/chat/search?q=zero+trust", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["has_more"] is False
+        assert data["results"][0]["conversation_id"] == conversation.id
+
+    def test_search_endpoint_requires_auth(self, client):
+        """Test that searching without a token returns 401."""
+        response = client.get("/chat/search?q=anything")
+
+        assert response.status_code == 401
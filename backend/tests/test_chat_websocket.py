@@ -0,0 +1,198 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from core import config
+from models.chat import ChatMessage
+from models.user import User, UserRole
+from services.quota_service import QuotaService, FREE_DAILY_CHAT_MESSAGES
+from services.user_service import create_access_token
+
+
+@pytest.fixture
+def free_user(db_session):
+    """Create a free-tier user who pays for chat turns from the daily quota."""
+    user = User(email="ws-learner@example.com", hashed_password="unused", name="Learner", role=UserRole.FREE)
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def premium_user(db_session):
+    """Create a premium user with unlimited chat turns."""
+    user = User(email="ws-premium@example.com", hashed_password="unused", name="Premium", role=UserRole.PREMIUM)
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+def token_for(user: User) -> str:
+    return create_access_token({"sub": user.email, "role": user.role.value, "id": user.id})
+
+
+@pytest.fixture
+def fake_tutor(monkeypatch):
+    """Replace the OpenAI stream with a fixed reply so turns run offline."""
+    def tutor_chat_stream(message, history, cancel_event):
+        for token in ("Conditional ", "access ", "policies."):
+            if cancel_event.is_set():
+                return
+            yield token
+
+    monkeypatch.setattr("routers.chat.tutor_chat_stream", tutor_chat_stream)
+
+
+@pytest.fixture
+def stalled_tutor(monkeypatch):
+    """Replace the OpenAI stream with one that sends a token, then waits to be cancelled."""
+    def tutor_chat_stream(message, history, cancel_event):
+        yield "Thinking"
+        cancel_event.wait(5)
+
+    monkeypatch.setattr("routers.chat.tutor_chat_stream", tutor_chat_stream)
+
+
+class TestChatWebSocketProtocol:
+    """Test cases for authentication and framing on the chat WebSocket."""
+
+    def test_query_token_authenticates(self, client: TestClient, premium_user):
+        """Test that ?token= authenticates and the first server frame reports access."""
+        with client.websocket_connect(f"/chat/ws?token={token_for(premium_user)}") as websocket:
+            ready = websocket.receive_json()
+
+        assert ready["type"] == "ready"
+        assert ready["has_access"] is True
+        assert ready["remaining_messages"] == -1
+        assert ready["role"] == "premium"
+
+    def test_auth_frame_authenticates(self, client: TestClient, premium_user):
+        """Test that the token can be sent in a first auth frame instead of the URL."""
+        with client.websocket_connect("/chat/ws") as websocket:
+            websocket.send_json({"type": "auth", "token": token_for(premium_user)})
+            assert websocket.receive_json()["type"] == "ready"
+
+    @pytest.mark.parametrize("first_frame", [{"type": "auth", "token": "not-a-jwt"}, {"type": "message"}, []])
+    def test_bad_credentials_close_the_socket(self, client: TestClient, first_frame):
+        """Test that an invalid token, a missing auth frame or a non-object frame closes with a policy violation."""
+        with client.websocket_connect("/chat/ws") as websocket:
+            websocket.send_json(first_frame)
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                websocket.receive_json()
+
+        assert exc_info.value.code == 1008
+
+    @pytest.mark.parametrize("payload", ["[]", "42", "not json"])
+    def test_non_object_frames_get_an_error_frame(self, client: TestClient, premium_user, payload):
+        """Test that frames that are not JSON objects are answered instead of dropping the connection."""
+        with client.websocket_connect(f"/chat/ws?token={token_for(premium_user)}") as websocket:
+            websocket.receive_json()
+            websocket.send_text(payload)
+            assert websocket.receive_json() == {"type": "error", "message": "Frames must be JSON objects"}
+            websocket.send_json({"type": "ping"})
+            assert websocket.receive_json() == {"type": "error", "message": "Unknown frame type: ping"}
+
+
+class TestChatWebSocketTurns:
+    """Test cases for streaming, cancelling and queueing chat turns."""
+
+    def test_reply_is_streamed_and_saved(self, client: TestClient, db_session, premium_user, fake_tutor):
+        """Test that a turn streams start, token and done frames and stores both messages."""
+        with client.websocket_connect(f"/chat/ws?token={token_for(premium_user)}") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "message", "message": "What is conditional access?"})
+            frames = [websocket.receive_json() for _ in range(5)]
+
+        assert [f["type"] for f in frames] == ["start", "token", "token", "token", "done"]
+        assert "".join(f["content"] for f in frames[1:4]) == "Conditional access policies."
+        done = frames[-1]
+        assert done["conversation_id"] == frames[0]["conversation_id"]
+        assert done["message"]["content"] == "Conditional access policies."
+        stored = db_session.query(ChatMessage).filter(ChatMessage.conversation_id == done["conversation_id"]).all()
+        assert [m.content for m in stored] == ["What is conditional access?", "Conditional access policies."]
+
+    def test_cancel_stops_the_generation(self, client: TestClient, db_session, free_user, stalled_tutor):
+        """Test that a cancel frame ends the turn without an answer and refunds the free message."""
+        with client.websocket_connect(f"/chat/ws?token={token_for(free_user)}") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "cancel"})
+            assert websocket.receive_json() == {"type": "error", "message": "Nothing to cancel"}
+
+            websocket.send_json({"type": "message", "message": "Explain PIM"})
+            start = websocket.receive_json()
+            assert websocket.receive_json() == {"type": "token", "content": "Thinking"}
+            websocket.send_json({"type": "cancel"})
+            cancelled = websocket.receive_json()
+
+        assert cancelled == {"type": "cancelled", "conversation_id": start["conversation_id"]}
+        stored = db_session.query(ChatMessage).filter(ChatMessage.conversation_id == start["conversation_id"]).all()
+        assert [m.content for m in stored] == ["Explain PIM"]
+        assert QuotaService.get_usage(db_session, free_user.id, QuotaService.CHAT_MESSAGES) == 0
+
+    def test_full_queue_replies_busy(self, client: TestClient, premium_user, stalled_tutor, monkeypatch):
+        """Test that messages beyond the pending limit are rejected with a busy frame."""
+        monkeypatch.setattr(config, "CHAT_WS_MAX_PENDING_MESSAGES", 1)
+
+        with client.websocket_connect(f"/chat/ws?token={token_for(premium_user)}") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "message", "message": "First"})
+            assert [websocket.receive_json()["type"] for _ in range(2)] == ["start", "token"]
+            websocket.send_json({"type": "message", "message": "Queued"})
+            websocket.send_json({"type": "message", "message": "One too many"})
+            busy = websocket.receive_json()
+
+            # The queued turn runs once the first one is cancelled
+            websocket.send_json({"type": "cancel"})
+            assert websocket.receive_json()["type"] == "cancelled"
+            assert [websocket.receive_json()["type"] for _ in range(2)] == ["start", "token"]
+            websocket.send_json({"type": "cancel"})
+            assert websocket.receive_json()["type"] == "cancelled"
+
+        assert busy["type"] == "error"
+        assert busy["code"] == "busy"
+
+
+class TestChatWebSocketQuota:
+    """Test cases for the daily message quota on the chat WebSocket."""
+
+    def test_unknown_conversation_refunds_the_turn(self, client: TestClient, db_session, free_user, fake_tutor):
+        """Test that a turn rejected for a missing conversation does not use up a daily message."""
+        with client.websocket_connect(f"/chat/ws?token={token_for(free_user)}") as websocket:
+            assert websocket.receive_json()["type"] == "ready"
+            websocket.send_json({"type": "message", "message": "Hello", "conversation_id": 9999})
+            frame = websocket.receive_json()
+
+        assert frame == {"type": "error", "message": "Conversation not found or access denied"}
+        assert QuotaService.get_usage(db_session, free_user.id, QuotaService.CHAT_MESSAGES) == 0
+
+    def test_exhausted_quota_is_reported(self, client: TestClient, db_session, free_user, fake_tutor):
+        """Test that a free user who used every daily message is told so on connect and on send."""
+        for _ in range(FREE_DAILY_CHAT_MESSAGES):
+            QuotaService.consume(db_session, free_user.id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES)
+
+        with client.websocket_connect(f"/chat/ws?token={token_for(free_user)}") as websocket:
+            ready = websocket.receive_json()
+            websocket.send_json({"type": "message", "message": "Hello"})
+            frame = websocket.receive_json()
+
+        assert ready["has_access"] is False
+        assert ready["remaining_messages"] == 0
+        assert frame == {"type": "error", "message": "Daily limit reached. Upgrade to Premium to continue"}
+
+    def test_last_free_message_counts_down(self, client: TestClient, db_session, free_user, fake_tutor):
+        """Test that completed turns report the remaining quota and the next one is refused."""
+        for _ in range(FREE_DAILY_CHAT_MESSAGES - 1):
+            QuotaService.consume(db_session, free_user.id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES)
+
+        with client.websocket_connect(f"/chat/ws?token={token_for(free_user)}") as websocket:
+            assert websocket.receive_json()["remaining_messages"] == 1
+            websocket.send_json({"type": "message", "message": "Hello"})
+            frames = [websocket.receive_json() for _ in range(5)]
+            websocket.send_json({"type": "message", "message": "Again"})
+            refused = websocket.receive_json()
+
+        assert frames[-1]["type"] == "done"
+        assert frames[-1]["remaining_messages"] == 0
+        assert refused["type"] == "error"
+        assert QuotaService.get_usage(db_session, free_user.id, QuotaService.CHAT_MESSAGES) == FREE_DAILY_CHAT_MESSAGES
@@ -0,0 +1,104 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from models.course import Course
+from models.table_version import TableVersion
+from models.user import User, UserRole
+from services.user_service import create_access_token
+
+
+def auth_headers(user_id=1, role="free"):
+    token = create_access_token({"sub": "learner@example.com", "role": role, "id": user_id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestCatalogConditionalGet:
+    """Test cases for conditional GETs validated by table versions."""
+
+    def test_course_list_not_modified_until_a_write(self, client, db_session):
+        """Test that the course list answers 304 until a course is added, which bumps its table version."""
+        db_session.add(Course(title="Identity", description="", instructor_name="Ada"))
+        db_session.commit()
+        version = db_session.get(TableVersion, "courses").version
+
+        first = client.get("/courses/", headers=auth_headers())
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "private, no-cache"
+        etag = first.headers["etag"]
+
+        cached = client.get("/courses/", headers={**auth_headers(), "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        db_session.add(Course(title="Defender", description="", instructor_name="Ada"))
+        db_session.commit()
+        db_session.expire_all()
+        assert db_session.get(TableVersion, "courses").version == version + 1
+
+        fresh = client.get("/courses/", headers={**auth_headers(), "If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert len(fresh.json()["data"]) == 2
+        assert fresh.headers["etag"] != etag
+
+    def test_if_modified_since(self, client, db_session):
+        """Test that Last-Modified from the table version backs If-Modified-Since."""
+        course = Course(title="Identity", description="", instructor_name="Ada")
+        db_session.add(course)
+        db_session.commit()
+
+        response = client.get(f"/courses/{course.id}", headers=auth_headers())
+        last_modified = response.headers["last-modified"]
+        assert client.get(f"/courses/{course.id}", headers={
+            **auth_headers(), "If-Modified-Since": last_modified
+        }).status_code == 304
+
+        earlier = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+        assert client.get(f"/courses/{course.id}", headers={
+            **auth_headers(), "If-Modified-Since": earlier
+        }).status_code == 200
+
+    def test_requires_authentication(self, client, db_session):
+        """Test that validators never answer for an unauthenticated request."""
+        response = client.get("/courses/", headers={"If-None-Match": "*"})
+        assert response.status_code in (401, 403)
+
+
+class TestStaticCatalogs:
+    """Test cases for catalogs that only change on deploy."""
+
+    def test_certifications_are_publicly_cacheable(self, client):
+        """Test that the certification catalog carries a max-age and revalidates to 304."""
+        response = client.get("/study-plans/certifications")
+        assert response.status_code == 200
+        assert response.headers["cache-control"].startswith("public, max-age=")
+
+        etag = response.headers["etag"]
+        assert client.get("/study-plans/certifications", headers={"If-None-Match": etag}).status_code == 304
+
+    def test_allowed_durations_vary_by_role(self, client):
+        """Test that an upgrade invalidates the durations ETag."""
+        etag = client.get("/study-plans/allowed-durations", headers=auth_headers()).headers["etag"]
+        response = client.get("/study-plans/allowed-durations", headers={
+            **auth_headers(role="premium"), "If-None-Match": etag
+        })
+        assert response.status_code == 200
+        assert response.json()["durations"] != [7]
+
+
+class TestProfileConditionalGet:
+    """Test cases for /users/me revalidation."""
+
+    def test_me_not_modified(self, client, db_session):
+        """Test that the profile ETag answers 304 without a body."""
+        user = User(email="learner@example.com", hashed_password="unused", name="Learner", role=UserRole.FREE)
+        db_session.add(user)
+        db_session.commit()
+        headers = auth_headers(user.id)
+
+        response = client.get("/users/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["data"]["email"] == "learner@example.com"
+
+        cached = client.get("/users/me", headers={**headers, "If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+        assert cached.content == b""
@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime
+from core import config
+from models.course import Course
+from models.module import Module
+from models.progress import Progress
+from models.user import User, UserRole
+from services.export_service import UserExportFilters, _csv_cell, stream_export, user_export_statement
+from services.user_service import create_access_token
+from conftest import TestingSessionLocal
+
+
+def admin_headers():
+    token = create_access_token({"sub": "admin@example.com", "role": "admin", "id": 1})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def seed_users(db_session):
+    users = [
+        User(email="free@example.com", hashed_password="unused", name="Free", role=UserRole.FREE,
+             created_at=datetime(2025, 1, 10)),
+        User(email="premium@example.com", hashed_password="unused", name="=HYPERLINK(1)", role=UserRole.PREMIUM,
+             subscription_status="active", created_at=datetime(2025, 3, 5)),
+        User(email="lapsed@example.com", hashed_password="unused", name="Lapsed", role=UserRole.FREE,
+             subscription_status="canceled", created_at=datetime(2025, 3, 20)),
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+    return users
+
+
+class TestUserExport:
+    """Test cases for the streaming admin user export."""
+
+    def test_ndjson_in_batches(self, client, db_session, monkeypatch):
+        """Test that every user is streamed as one JSON object per line, a batch per chunk."""
+        monkeypatch.setattr(config, "EXPORT_BATCH_SIZE", 2)
+        seed_users(db_session)
+
+        with client.stream("GET", "/users/admin/users/export", headers=admin_headers()) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            assert "attachment" in response.headers["content-disposition"]
+            body = response.read()
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        assert [row["email"] for row in rows] == ["free@example.com", "premium@example.com", "lapsed@example.com"]
+        assert rows[1]["role"] == "premium" and rows[1]["created_at"] == "2025-03-05T00:00:00"
+        assert "hashed_password" not in rows[0]
+
+        # The stream itself yields one encoded chunk per batch
+        chunks = list(stream_export(TestingSessionLocal, user_export_statement(UserExportFilters()), "ndjson"))
+        assert [chunk.count(b"\n") for chunk in chunks] == [2, 1]
+
+    def test_csv_with_filters(self, client, db_session):
+        """Test that role, signup date and subscription filters narrow a CSV export."""
+        seed_users(db_session)
+
+        response = client.get(
+            "/users/admin/users/export?format=csv&signed_up_from=2025-03-01T00:00:00&subscription_status=active",
+            headers=admin_headers(),
+        )
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+        assert [row["email"] for row in rows] == ["premium@example.com"]
+        assert rows[0]["name"] == "'=HYPERLINK(1)"
+
+        response = client.get("/users/admin/users/export?format=csv&role=free", headers=admin_headers())
+        assert [row["email"] for row in csv.DictReader(io.StringIO(response.text))] == [
+            "free@example.com", "lapsed@example.com"
+        ]
+
+    @pytest.mark.parametrize("name", ["=1+1", "+1", "-1", "@SUM(A1)", "\t=1+1", "\r=1+1"])
+    def test_csv_cells_never_start_a_formula(self, name):
+        """Test that values a spreadsheet could evaluate are prefixed with a quote."""
+        assert _csv_cell(name) == "'" + name
+        assert _csv_cell("Ada " + name) == "Ada " + name
+
+    def test_admin_only(self, client, db_session):
+        """Test that non-admins cannot export users."""
+        token = create_access_token({"sub": "free@example.com", "role": "free", "id": 2})
+        response = client.get("/users/admin/users/export", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 403
+
+
+class TestProgressExport:
+    """Test cases for the streaming admin progress export."""
+
+    def test_progress_filtered_by_module_and_role(self, client, db_session):
+        """Test that progress rows carry the user's email and honour module and user filters."""
+        free, premium, _ = seed_users(db_session)
+        course = Course(title="Identity", description="", instructor_name="Ada")
+        db_session.add(course)
+        db_session.flush()
+        first, second = Module(title="One", content_link="x", course_id=course.id), Module(title="Two", content_link="y", course_id=course.id)
+        db_session.add_all([first, second])
+        db_session.flush()
+        db_session.add_all([
+            Progress(user_id=free.id, module_id=first.id, status="completed"),
+            Progress(user_id=premium.id, module_id=first.id, status="completed"),
+            Progress(user_id=premium.id, module_id=second.id, status="completed"),
+        ])
+        db_session.commit()
+
+        response = client.get(f"/progress/admin/export?module_id={first.id}&role=premium", headers=admin_headers())
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [(row["user_email"], row["module_id"]) for row in rows] == [("premium@example.com", first.id)]
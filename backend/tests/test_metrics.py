@@ -0,0 +1,170 @@
+import time
+import pytest
+from sqlalchemy import create_engine, text
+from core import config
+from core.pool_metrics import InstrumentedQueuePool, instrument_pool, instrumented_engines
+from core.query_stats import start_request, stop_request
+from core.slow_queries import fingerprint, redact_parameters, slow_query_log
+from services.user_service import create_access_token
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    """Create an instrumented QueuePool engine on a file-backed SQLite database."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    engine.metrics = instrument_pool(engine)
+    yield engine
+    engine.dispose()
+
+
+class TestPoolMetrics:
+    """Test cases for connection pool instrumentation."""
+
+    def test_checkouts_and_waits_are_counted(self, pooled_engine):
+        """Test that every checkout is counted and timed."""
+        for _ in range(3):
+            with pooled_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        data = pooled_engine.metrics.snapshot(pooled_engine.pool)
+        assert data["connects"] == 1
+        assert data["checkouts"] == 3
+        assert data["checkins"] == 3
+        assert data["size"] == 1
+        assert data["checked_out"] == 0
+
+    def test_exhausted_pool_records_timeout(self, pooled_engine):
+        """Test that a checkout that times out is recorded."""
+        with pooled_engine.connect():
+            with pytest.raises(Exception):
+                pooled_engine.connect()
+
+        data = pooled_engine.metrics.snapshot(pooled_engine.pool)
+        assert data["timeouts"] == 1
+        assert data["wait_ms_max"] >= 100
+
+    def test_engines_keep_separate_counters(self, pooled_engine, tmp_path):
+        """Test that two instrumented engines never add to each other's counters."""
+        other = create_engine(f"sqlite:///{tmp_path / 'other.db'}", poolclass=InstrumentedQueuePool, pool_size=1)
+        other_metrics = instrument_pool(other)
+        with other.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert other_metrics.snapshot(other.pool)["checkouts"] == 1
+        assert pooled_engine.metrics.snapshot(pooled_engine.pool)["checkouts"] == 0
+        other.dispose()
+
+    def test_metrics_survive_dispose(self, pooled_engine):
+        """Test that the pool recreated by dispose() keeps timing checkouts."""
+        pooled_engine.dispose()
+        with pooled_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert pooled_engine.metrics.waits == 1
+
+
+class TestPoolMetricsEndpoint:
+    """Test cases for GET /metrics/db-pool."""
+
+    def test_requires_admin(self, client):
+        """Test that non-admin users are rejected."""
+        token = create_access_token({"sub": "learner@example.com", "role": "free", "id": 1})
+        response = client.get("/metrics/db-pool", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 403
+
+    def test_admin_gets_pool_snapshot(self, client):
+        """Test that admins get the pool counters."""
+        token = create_access_token({"sub": "admin@example.com", "role": "admin", "id": 1})
+        response = client.get("/metrics/db-pool", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert set(data) == set(instrumented_engines)
+        assert "checkouts" in data["primary"]
+        assert "pool_class" in data["primary"]
+
+
+@pytest.fixture
+def slow_log(monkeypatch, tmp_path):
+    """Treat every statement as slow, on a file-backed SQLite engine with one table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, owner TEXT)"))
+    slow_query_log.reset()
+    monkeypatch.setattr(config, "SLOW_QUERY_MS", 0.000001)
+    yield engine
+    monkeypatch.setattr(config, "SLOW_QUERY_MS", 0)
+    slow_query_log.shutdown()
+    slow_query_log.reset()
+    engine.dispose()
+
+
+def wait_for_plan(fingerprint_text: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for entry in slow_query_log.top(200):
+            if entry["fingerprint"] == fingerprint_text and entry["plan"]:
+                return entry
+        time.sleep(0.01)
+    raise AssertionError(f"No plan captured for {fingerprint_text}")
+
+
+class TestSlowQueryLog:
+    """Test cases for the slow-query log."""
+
+    def test_fingerprint_normalizes_literals_and_placeholders(self):
+        """Test that statements differing only in values share a fingerprint."""
+        assert fingerprint("SELECT * FROM t WHERE id = 5 AND name = 'x'") == fingerprint(
+            "SELECT *\n  FROM t WHERE id = :id_1 AND name = %(name)s"
+        ) == "SELECT * FROM t WHERE id = ? AND name = ?"
+        assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (...)"
+
+    def test_parameters_are_redacted(self):
+        """Test that no parameter value survives redaction."""
+        assert redact_parameters({"email": "a@example.com"}) == {"email": "?"}
+        assert redact_parameters(("secret", 42)) == ["?", "?"]
+        assert redact_parameters([("a",), ("b",)], executemany=True) == "<2 parameter sets>"
+
+    def test_slow_statements_are_aggregated_with_path_and_plan(self, slow_log):
+        """Test that repeats are totalled under one fingerprint and a plan is captured."""
+        stats, token = start_request("/items")
+        try:
+            with slow_log.connect() as conn:
+                for owner in ("alice", "bob"):
+                    conn.execute(text("SELECT id FROM items WHERE owner = :owner"), {"owner": owner})
+        finally:
+            stop_request(token)
+
+        entry = wait_for_plan("SELECT id FROM items WHERE owner = ?")
+        assert entry["calls"] == 2
+        assert entry["last_path"] == "/items"
+        assert any("SCAN" in line for line in entry["plan"])
+
+
+class TestSlowQueryEndpoint:
+    """Test cases for GET /metrics/slow-queries."""
+
+    def test_requires_admin(self, client):
+        """Test that non-admin users are rejected."""
+        token = create_access_token({"sub": "learner@example.com", "role": "free", "id": 1})
+        response = client.get("/metrics/slow-queries", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 403
+
+    def test_admin_gets_top_queries(self, client, slow_log):
+        """Test that admins get slow fingerprints ordered by total time."""
+        with slow_log.connect() as conn:
+            conn.execute(text("SELECT count(*) FROM items"))
+        token = create_access_token({"sub": "admin@example.com", "role": "admin", "id": 1})
+        response = client.get("/metrics/slow-queries?limit=5", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        queries = response.json()["data"]["queries"]
+        assert 0 < len(queries) <= 5
+        totals = [query["total_ms"] for query in queries]
+        assert totals == sorted(totals, reverse=True)
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from core.migrations import MIGRATIONS, run_migrations
+from benchmarks.explain_hot_queries import explain_hot_queries
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Empty file-backed SQLite database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+class TestMigrations:
+    """Test cases for the versioned migration runner."""
+
+    def test_fresh_database_applies_every_migration_once(self, engine):
+        """Test that all migrations run on an empty database and a second run is a no-op."""
+        assert run_migrations(engine) == [m.version for m in MIGRATIONS]
+        assert run_migrations(engine) == []
+
+        indexes = {i["name"] for i in inspect(engine).get_indexes("quizzes")}
+        assert "ix_quizzes_user_created" in indexes
+
+    def test_legacy_database_is_upgraded(self, engine):
+        """Test that a database created before the migrations gets deduplicated usage rows and the new indexes."""
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE daily_usage (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+                "date DATE NOT NULL, chat_messages_count INTEGER NOT NULL, quiz_count INTEGER NOT NULL)"
+            ))
+            conn.execute(text(
+                "INSERT INTO daily_usage (user_id, date, chat_messages_count, quiz_count) "
+                "VALUES (1, '2024-01-01', 2, 1), (1, '2024-01-01', 1, 0), (1, '2024-01-02', 1, 1)"
+            ))
+
+        run_migrations(engine)
+
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT date, chat_messages_count, quiz_count FROM daily_usage ORDER BY date"
+            )).all()
+        assert [tuple(r) for r in rows] == [("2024-01-01", 3, 1), ("2024-01-02", 1, 1)]
+        indexes = {i["name"]: i for i in inspect(engine).get_indexes("daily_usage")}
+        assert indexes["uq_daily_usage_user_date"]["unique"]
+
+    def test_hot_queries_use_indexes(self, engine):
+        """Test that no hot query plan falls back to a full table scan."""
+        run_migrations(engine)
+
+        reports = explain_hot_queries(engine)
+
+        assert reports
+        assert [r.name for r in reports if not r.uses_indexes] == []
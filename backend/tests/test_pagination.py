@@ -0,0 +1,98 @@
+import pytest
+from fastapi import HTTPException
+from core import config
+from core.pagination import decode_cursor, encode_cursor
+from models.course import Course
+from models.notification import Notification
+from services.user_service import create_access_token
+
+
+def auth_headers():
+    token = create_access_token({"sub": "learner@example.com", "role": "free", "id": 1})
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestCursors:
+    """Test cases for the opaque cursor tokens."""
+
+    def test_round_trip(self):
+        """Test that cursors decode to the key they were made from."""
+        from datetime import datetime
+        stamp = datetime(2025, 1, 2, 3, 4, 5, 678)
+        assert decode_cursor(encode_cursor(stamp, 7)) == (stamp, 7)
+        assert decode_cursor(encode_cursor(42, 42)) == (42, 42)
+
+    @pytest.mark.parametrize("cursor", ["garbage", "W10", encode_cursor(1, 1)[:-2]])
+    def test_tampered_cursor_is_rejected(self, cursor):
+        """Test that anything that isn't a cursor is a 400, not a server error."""
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(cursor)
+        assert exc.value.status_code == 400
+
+
+class TestKeysetPages:
+    """Test cases for paging list endpoints by cursor."""
+
+    def test_walk_course_pages(self, client, db_session):
+        """Test that following next_cursor visits every course exactly once, in id order."""
+        db_session.add_all([Course(title=f"Course {i}", description="", instructor_name="Ada") for i in range(7)])
+        db_session.commit()
+
+        seen, cursor = [], None
+        while True:
+            url = "/courses/?limit=3" + (f"&cursor={cursor}" if cursor else "")
+            body = client.get(url, headers=auth_headers()).json()
+            seen += [course["id"] for course in body["data"]]
+            if not body["page"]["has_more"]:
+                assert body["page"]["next_cursor"] is None
+                break
+            cursor = body["page"]["next_cursor"]
+
+        assert seen == sorted(seen) and len(seen) == 7
+
+    def test_totals(self, client, db_session):
+        """Test that a one-page list carries its total and a longer one only on request."""
+        db_session.add_all([Course(title=f"Course {i}", description="", instructor_name="Ada") for i in range(4)])
+        db_session.commit()
+
+        assert client.get("/courses/", headers=auth_headers()).json()["page"]["total"] == 4
+        assert client.get("/courses/?limit=2", headers=auth_headers()).json()["page"]["total"] is None
+        page = client.get("/courses/?limit=2&include_total=true", headers=auth_headers()).json()["page"]
+        assert page["total"] == 4 and page["total_is_estimate"] is False
+
+    def test_lists_are_unpaged_without_limit(self, client, db_session, monkeypatch):
+        """Test that clients that never send ?limit= still get every row."""
+        monkeypatch.setattr(config, "PAGE_SIZE_DEFAULT", 2)
+        db_session.add_all([Course(title=f"Course {i}", description="", instructor_name="Ada") for i in range(5)])
+        db_session.add_all([Notification(message=f"N{i}", created_by=1) for i in range(5)])
+        db_session.commit()
+
+        for url in ("/courses/", "/notifications/"):
+            body = client.get(url, headers=auth_headers()).json()
+            assert len(body["data"]) == 5
+            assert body["page"] == {"next_cursor": None, "has_more": False, "limit": None,
+                                    "total": 5, "total_is_estimate": False}
+
+        first = client.get("/courses/?limit=1", headers=auth_headers()).json()
+        rest = client.get(f"/courses/?cursor={first['page']['next_cursor']}", headers=auth_headers()).json()
+        assert len(rest["data"]) == 2 and rest["page"]["limit"] == 2
+
+    def test_newest_first_with_equal_timestamps(self, client, db_session):
+        """Test that rows sharing a sort key are split across pages by id without gaps or repeats."""
+        from datetime import datetime
+        stamp = datetime(2025, 1, 1)
+        db_session.add_all([Notification(message=f"N{i}", created_by=1, created_at=stamp) for i in range(5)])
+        db_session.commit()
+
+        first = client.get("/notifications/?limit=2", headers=auth_headers()).json()
+        second = client.get(
+            f"/notifications/?limit=2&cursor={first['page']['next_cursor']}", headers=auth_headers()
+        ).json()
+        ids = [n["id"] for n in first["data"] + second["data"]]
+        assert ids == [5, 4, 3, 2]
+
+    def test_invalid_cursor(self, client, db_session):
+        """Test that a bad cursor is reported in the envelope as a 400."""
+        response = client.get("/courses/?cursor=not-a-cursor", headers=auth_headers())
+        assert response.status_code == 400
+        assert response.json()["success"] is False
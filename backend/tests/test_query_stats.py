@@ -0,0 +1,123 @@
+import gc
+import logging
+from fastapi import Request
+from core.database import get_by_id, get_db
+from core.query_stats import current_stats, start_request, stop_request
+from models.course import Course
+from models.user import User, UserRole
+from services.user_service import create_access_token
+
+
+class TestQueryStatsHeaders:
+    """Test cases for the per-request query headers."""
+
+    def test_db_headers_on_response(self, client, db_session):
+        """Test that a request reports its query count and database time."""
+        user = User(email="stats@example.com", hashed_password="unused", name="Stats", role=UserRole.FREE)
+        db_session.add(user)
+        db_session.commit()
+        token = create_access_token(data={"sub": user.email, "role": user.role.value, "id": user.id})
+
+        response = client.get("/courses/", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Queries"]) >= 1
+        assert response.headers["X-DB-Time"].endswith("ms")
+
+    def test_no_collection_outside_requests(self, db_session):
+        """Test that queries outside a request are not counted anywhere."""
+        db_session.query(Course).all()
+        assert current_stats() is None
+
+
+class TestNPlusOneDetection:
+    """Test cases for repeated statement detection."""
+
+    def test_repeated_statement_is_flagged_with_call_site(self, db_session):
+        """Test that one statement run in a loop is reported once, with its count and origin."""
+        courses = [Course(title=f"Course {i}", description="", instructor_name="") for i in range(6)]
+        db_session.add_all(courses)
+        db_session.commit()
+        ids = [course.id for course in courses]
+        db_session.expire_all()
+
+        stats, token = start_request()
+        try:
+            for course_id in ids:
+                db_session.query(Course).filter(Course.id == course_id).first()
+        finally:
+            stop_request(token)
+
+        assert stats.queries == 6
+        assert len(stats.n_plus_one) == 1
+        suspect = stats.n_plus_one[0]
+        assert suspect["count"] == 6
+        assert "FROM courses" in suspect["statement"]
+        assert suspect["call_site"].startswith("tests/test_query_stats.py:")
+
+    def test_distinct_statements_are_not_flagged(self, db_session):
+        """Test that a handful of different queries is not reported."""
+        stats, token = start_request()
+        try:
+            db_session.query(Course).all()
+            db_session.query(Course).count()
+        finally:
+            stop_request(token)
+
+        assert stats.queries == 2
+        assert stats.n_plus_one == []
+
+
+class TestRequestScopedLoader:
+    """Test cases for core.database.get_by_id."""
+
+    def test_repeated_lookups_hit_the_session(self, db_session):
+        """Test that a row is loaded once per session and kept alive between lookups."""
+        user = User(email="loader@example.com", hashed_password="unused", name="Loader", role=UserRole.FREE)
+        db_session.add(user)
+        db_session.commit()
+        user_id = user.id
+        db_session.expunge_all()
+        del user
+
+        stats, token = start_request()
+        try:
+            assert get_by_id(db_session, User, user_id).email == "loader@example.com"
+            gc.collect()  # The identity map alone would drop the unreferenced row here
+            get_by_id(db_session, User, user_id)
+            get_by_id(db_session, User, user_id)
+        finally:
+            stop_request(token)
+
+        assert stats.queries == 1
+        assert db_session.info["pk_lookups_saved"] == 2
+
+    def test_commit_expires_memoized_rows(self, db_session):
+        """Test that rows expired by a commit are read again rather than served stale."""
+        course = Course(title="Loader", description="", instructor_name="")
+        db_session.add(course)
+        db_session.flush()
+        course_id = course.id
+        db_session.commit()
+
+        stats, token = start_request()
+        try:
+            assert get_by_id(db_session, Course, course_id) is course
+        finally:
+            stop_request(token)
+
+        assert stats.queries == 1
+        assert db_session.info.get("pk_lookups_saved", 0) == 0
+        assert get_by_id(db_session, Course, None) is None
+
+    def test_get_db_logs_saved_lookups(self, caplog):
+        """Test that get_db reports the saved lookups when it closes the session."""
+        request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+        dependency = get_db(request)
+        db = next(dependency)
+        db.info["pk_lookups_saved"] = 3
+
+        with caplog.at_level(logging.DEBUG, logger="core.database"):
+            dependency.close()
+
+        assert "saved 3 duplicate primary-key lookup(s)" in caplog.text
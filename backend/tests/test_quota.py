@@ -0,0 +1,207 @@
+from collections import OrderedDict
+import threading
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core import config
+from core.database import Base
+from models.user import User, UserRole
+from models.daily_usage import DailyUsage
+from services.entitlement_service import EntitlementService
+from services.quota_service import QuotaService, MemoryQuotaStore, FREE_DAILY_CHAT_MESSAGES
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """Create a file-backed SQLite database so every thread gets its own connection."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'quota.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def free_user_id(file_engine):
+    """Create a free-tier user and return its id."""
+    db = sessionmaker(bind=file_engine)()
+    user = User(email="quota@example.com", hashed_password="unused", name="Quota", role=UserRole.FREE)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+class TestQuotaService:
+    """Test cases for the atomic DailyUsage quota counters."""
+
+    def test_consume_stops_at_limit(self, file_engine, free_user_id):
+        """Test that consume returns the new count until the limit, then None."""
+        db = sessionmaker(bind=file_engine)()
+
+        used = [QuotaService.consume(db, free_user_id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES) for _ in range(5)]
+
+        assert used == [1, 2, 3, None, None]
+        assert db.query(DailyUsage).count() == 1
+        db.close()
+
+    def test_refund_returns_one_unit(self, file_engine, free_user_id):
+        """Test that a refund frees one unit and never goes below zero."""
+        db = sessionmaker(bind=file_engine)()
+        for _ in range(FREE_DAILY_CHAT_MESSAGES):
+            QuotaService.consume(db, free_user_id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES)
+
+        QuotaService.refund(db, free_user_id, QuotaService.CHAT_MESSAGES)
+        assert QuotaService.get_usage(db, free_user_id, QuotaService.CHAT_MESSAGES) == 2
+        assert QuotaService.get_usage(db, free_user_id, QuotaService.QUIZZES) == 0
+
+        QuotaService.refund(db, free_user_id, QuotaService.QUIZZES)
+        assert QuotaService.get_usage(db, free_user_id, QuotaService.QUIZZES) == 0
+        db.close()
+
+    def test_concurrent_consumers_never_exceed_limit(self, file_engine, free_user_id):
+        """Test that many concurrent requests cannot push a free user past the daily limit."""
+        results = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(20)
+
+        def worker():
+            db = sessionmaker(bind=file_engine)()
+            try:
+                barrier.wait()
+                used = QuotaService.consume(db, free_user_id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES)
+                with lock:
+                    results.append(used)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        granted = sorted(r for r in results if r is not None)
+        assert granted == [1, 2, 3]
+        assert len(results) == 20
+
+        db = sessionmaker(bind=file_engine)()
+        assert db.query(DailyUsage).filter(DailyUsage.user_id == free_user_id).count() == 1
+        assert QuotaService.get_usage(db, free_user_id, QuotaService.CHAT_MESSAGES) == FREE_DAILY_CHAT_MESSAGES
+        db.close()
+
+
+class TestMemoryQuotaStore:
+    """Test cases for the in-memory quota store and its write-behind flush."""
+
+    def test_consume_does_not_touch_database_until_flush(self, file_engine, free_user_id):
+        """Test that increments are buffered in memory and written by flush."""
+        db = sessionmaker(bind=file_engine)()
+        store = MemoryQuotaStore()
+        store.load(db)
+
+        used = [store.consume(free_user_id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES) for _ in range(4)]
+        store.refund(free_user_id, QuotaService.CHAT_MESSAGES)
+
+        assert used == [1, 2, 3, None]
+        assert db.query(DailyUsage).count() == 0
+
+        assert store.flush(db) == 1
+        assert QuotaService.get_usage(db, free_user_id, QuotaService.CHAT_MESSAGES) == 2
+        assert store.flush(db) == 0
+        db.close()
+
+    def test_load_recovers_counters_from_database(self, file_engine, free_user_id):
+        """Test that a fresh store resumes from the persisted counts."""
+        db = sessionmaker(bind=file_engine)()
+        QuotaService.consume(db, free_user_id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES)
+        QuotaService.consume(db, free_user_id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES)
+
+        store = MemoryQuotaStore()
+        store.load(db)
+
+        assert store.get_usage(free_user_id, QuotaService.CHAT_MESSAGES) == 2
+        assert store.consume(free_user_id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES) == 3
+        assert store.consume(free_user_id, QuotaService.CHAT_MESSAGES, FREE_DAILY_CHAT_MESSAGES) is None
+
+        store.flush(db)
+        assert QuotaService.get_usage(db, free_user_id, QuotaService.CHAT_MESSAGES) == 3
+        db.close()
+
+
+class TestEntitlementService:
+    """Test cases for cached entitlement resolution."""
+
+    def test_resolve_is_cached_until_version_changes(self, file_engine, free_user_id):
+        """Test that a cached entry is served only while users.version still matches."""
+        db = sessionmaker(bind=file_engine)()
+
+        assert EntitlementService.resolve(db, free_user_id).chat_access(db)["remaining_messages"] == FREE_DAILY_CHAT_MESSAGES
+        assert EntitlementService._entries[free_user_id][1:] == (1, UserRole.FREE, None)
+
+        db.query(User).filter(User.id == free_user_id).update({User.role: UserRole.PREMIUM})
+        db.commit()
+        entitlements = EntitlementService.resolve(db, free_user_id)
+        assert entitlements.role == UserRole.PREMIUM
+        assert entitlements.mock_exam_access()["has_access"] is True
+        assert EntitlementService._entries[free_user_id][1] == 2
+        db.close()
+
+    def test_downgrade_on_another_worker_is_seen(self, file_engine, free_user_id, monkeypatch):
+        """Test that a worker whose cache never saw the invalidation still drops premium access."""
+        monkeypatch.setattr(EntitlementService, "_entries", OrderedDict())
+        db = sessionmaker(bind=file_engine)()
+        db.query(User).filter(User.id == free_user_id).update({User.role: UserRole.PREMIUM})
+        db.commit()
+        assert EntitlementService.resolve(db, free_user_id).is_unlimited
+        this_worker = EntitlementService._entries
+
+        # The downgrade happens on a second process with its own cache state
+        monkeypatch.setattr(EntitlementService, "_entries", OrderedDict())
+        assert EntitlementService.resolve(db, free_user_id).is_unlimited
+        db.query(User).filter(User.id == free_user_id).update({User.role: UserRole.FREE, User.subscription_status: "canceled"})
+        db.commit()
+        EntitlementService.invalidate(free_user_id)
+
+        monkeypatch.setattr(EntitlementService, "_entries", this_worker)
+        assert free_user_id in EntitlementService._entries
+        entitlements = EntitlementService.resolve(db, free_user_id)
+        assert entitlements.role == UserRole.FREE
+        assert entitlements.mock_exam_access()["has_access"] is False
+        db.close()
+
+    def test_cache_is_bounded(self, file_engine, free_user_id, monkeypatch):
+        """Test that the least recently used users are dropped once the cache is full."""
+        monkeypatch.setattr(config, "ENTITLEMENT_CACHE_SIZE", 2)
+        db = sessionmaker(bind=file_engine)()
+
+        for user_id in (free_user_id, 998, 999):
+            EntitlementService.resolve(db, user_id)
+
+        assert list(EntitlementService._entries) == [998, 999]
+        db.close()
+
+    def test_expired_entries_are_dropped(self, file_engine, free_user_id, monkeypatch):
+        """Test that an expired entry is removed and reloaded from the database."""
+        monkeypatch.setattr(config, "ENTITLEMENT_CACHE_TTL_SECONDS", 0)
+        db = sessionmaker(bind=file_engine)()
+        EntitlementService.resolve(db, free_user_id)
+
+        db.query(User).filter(User.id == free_user_id).update({User.role: UserRole.PREMIUM})
+        db.commit()
+
+        assert EntitlementService.resolve(db, free_user_id).role == UserRole.PREMIUM
+        db.close()
+
+    def test_unknown_user_has_no_access(self, file_engine):
+        """Test that a missing user resolves to no entitlements."""
+        db = sessionmaker(bind=file_engine)()
+        entitlements = EntitlementService.resolve(db, 999)
+
+        assert entitlements.chat_access(db)["role"] == "unknown"
+        assert entitlements.quiz_access(db)["has_access"] is False
+        assert entitlements.mock_exam_access()["has_access"] is False
+        db.close()
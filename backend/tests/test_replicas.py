@@ -0,0 +1,211 @@
+import threading
+import time
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core import database
+from core.database import Base, create_async_engine_for, get_read_db
+from core.replicas import READ_YOUR_WRITES_HEADER, ReadYourWritesMiddleware, ReplicaRouter, ReplicaWriteError
+from models.course import Course
+from services.user_service import create_access_token
+
+
+def make_request(method: str = "GET", user_id: int = None, pinned_until: float = None) -> Request:
+    headers = []
+    if pinned_until is not None:
+        headers.append((READ_YOUR_WRITES_HEADER.lower().encode(), str(pinned_until).encode()))
+    if user_id is not None:
+        token = create_access_token(data={"sub": f"user{user_id}@example.com", "role": "free", "id": user_id})
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return Request({"type": "http", "method": method, "path": "/courses/", "headers": headers, "query_string": b""})
+
+
+@pytest.fixture
+def replica_urls(tmp_path):
+    """Two file-backed SQLite databases standing in for read replicas, each holding one distinct course."""
+    urls = []
+    for name in ("replica_a", "replica_b"):
+        url = f"sqlite:///{tmp_path / name}.db"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        session.add(Course(title=name, description="", instructor_name=""))
+        session.commit()
+        session.close()
+        engine.dispose()
+        urls.append(url)
+    return urls
+
+
+def make_router(urls, pin_seconds: float = 5, health_check_interval: float = 10) -> ReplicaRouter:
+    return ReplicaRouter(
+        urls,
+        engine_factory=create_engine,
+        async_engine_factory=create_async_engine_for,
+        health_check_interval=health_check_interval,
+        pin_seconds=pin_seconds,
+    )
+
+
+@pytest.fixture
+def router(monkeypatch, replica_urls):
+    """Install a router over the two replicas in place of the configured one."""
+    router = make_router(replica_urls)
+    monkeypatch.setattr(database, "replica_router", router)
+    yield router
+    router.dispose()
+
+
+def read_course_title(request: Request) -> str:
+    dependency = get_read_db(request)
+    db = next(dependency)
+    try:
+        course = db.query(Course).first()
+        return course.title if course else None
+    finally:
+        dependency.close()
+
+
+class TestReplicaRouter:
+    """Test cases for ReplicaRouter."""
+
+    def test_round_robin_over_healthy_replicas(self, router):
+        """Test that consecutive picks alternate between replicas."""
+        picks = [router.choose().url for _ in range(4)]
+        assert picks[0] != picks[1]
+        assert picks[0] == picks[2] and picks[1] == picks[3]
+
+    def test_unhealthy_replica_is_skipped(self, replica_urls, tmp_path):
+        """Test that a replica failing its health check is not chosen."""
+        broken = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+        router = make_router([broken, replica_urls[0]])
+        router.check_health()
+
+        assert {router.choose().url for _ in range(3)} == {replica_urls[0]}
+        router.dispose()
+
+    def test_no_healthy_replica_returns_none(self, tmp_path):
+        """Test that callers fall back to the primary when every replica is down."""
+        router = make_router([f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+        router.check_health()
+        assert router.choose() is None
+        router.dispose()
+
+    def test_due_health_check_runs_in_the_background(self, replica_urls, monkeypatch):
+        """Test that choose() starts a due probe on another thread instead of waiting for it."""
+        router = make_router(replica_urls, health_check_interval=0)
+        started, release = threading.Event(), threading.Event()
+        probe_threads = []
+
+        def slow_check_health():
+            probe_threads.append(threading.current_thread())
+            started.set()
+            release.wait(5)
+
+        monkeypatch.setattr(router, "check_health", slow_check_health)
+        begin = time.monotonic()
+        assert router.choose() is not None
+        assert router.choose() is not None
+        elapsed = time.monotonic() - begin
+        assert started.wait(5)
+        release.set()
+
+        assert elapsed < 1
+        assert len(probe_threads) == 1 and probe_threads[0] is not threading.current_thread()
+        router.dispose()
+
+    def test_header_pin_is_bounded(self, replica_urls):
+        """Test that an echoed pin only counts while it runs and within the pin window."""
+        router = make_router(replica_urls, pin_seconds=5)
+        now = time.time()
+
+        assert router.header_pinned(str(now + 2))
+        assert not router.header_pinned(str(now - 1))
+        assert not router.header_pinned(str(now + 3600))
+        assert not router.header_pinned("soon")
+        assert not router.header_pinned(None)
+        router.dispose()
+
+    def test_pin_expires(self, replica_urls):
+        """Test that a pin only lasts for the configured window."""
+        router = make_router(replica_urls, pin_seconds=0.01)
+        router.pin(7)
+        assert router.is_pinned(7)
+        assert not router.is_pinned(8)
+
+        time.sleep(0.02)
+        assert not router.is_pinned(7)
+        router.dispose()
+
+    def test_replica_sessions_reject_writes(self, router):
+        """Test that flushing on a replica session raises instead of writing to the replica."""
+        db = router.choose().session_factory()
+        db.add(Course(title="new", description="", instructor_name=""))
+        with pytest.raises(ReplicaWriteError):
+            db.flush()
+        db.close()
+
+
+class TestReadSessionRouting:
+    """Test cases for the get_read_db dependency."""
+
+    def test_get_requests_read_from_replicas(self, router):
+        """Test that GET handlers are served by the replicas in turn."""
+        titles = {read_course_title(make_request(user_id=1)) for _ in range(2)}
+        assert titles == {"replica_a", "replica_b"}
+
+    def test_non_get_requests_use_primary(self, router):
+        """Test that only GET and HEAD requests are routed to replicas."""
+        assert read_course_title(make_request("POST", user_id=1)) not in ("replica_a", "replica_b")
+
+    def test_user_is_pinned_to_primary_after_write(self, router):
+        """Test read-your-writes: a user's reads go to the primary right after they commit."""
+        request = make_request("POST", user_id=42)
+        dependency = database.get_db(request)
+        db = next(dependency)
+        db.commit()
+        dependency.close()
+
+        assert router.is_pinned(42)
+        assert read_course_title(make_request(user_id=42)) not in ("replica_a", "replica_b")
+        assert read_course_title(make_request(user_id=43)) in ("replica_a", "replica_b")
+
+    def test_echoed_pin_reads_from_primary(self, router):
+        """Test that a pin carried back by the client holds on a worker that never saw the write."""
+        pinned = read_course_title(make_request(user_id=44, pinned_until=time.time() + 2))
+        assert pinned not in ("replica_a", "replica_b")
+        assert not router.is_pinned(44)
+
+    def test_commit_records_the_pin_for_the_response(self, router):
+        """Test that committing through get_db stashes the pin for ReadYourWritesMiddleware."""
+        request = make_request("POST", user_id=45)
+        dependency = database.get_db(request)
+        db = next(dependency)
+        db.commit()
+        dependency.close()
+
+        assert router.header_pinned(str(request.state.read_your_writes_until))
+
+
+class TestReadYourWritesMiddleware:
+    """Test cases for the READ_YOUR_WRITES_HEADER response header."""
+
+    def test_header_added_only_after_a_write(self):
+        """Test that only responses to requests that committed carry the pin."""
+        def write(request):
+            request.state.read_your_writes_until = 1234.5
+            return PlainTextResponse("saved")
+
+        def read(request):
+            return PlainTextResponse("data")
+
+        app = ReadYourWritesMiddleware(Starlette(routes=[Route("/write", write, methods=["POST"]), Route("/read", read)]))
+        client = TestClient(app)
+
+        assert client.post("/write").headers[READ_YOUR_WRITES_HEADER] == "1234.500"
+        assert READ_YOUR_WRITES_HEADER not in client.get("/read").headers
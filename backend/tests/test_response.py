@@ -0,0 +1,109 @@
+import json
+from datetime import datetime
+from typing import List
+import pytest
+from pydantic import BaseModel
+from core.response import error_response, success_response
+from models.course import Course
+from schemas.course import CourseOut
+from services.user_service import create_access_token
+
+
+class Stamped(BaseModel):
+    id: int
+    created_at: datetime
+
+
+class TestEnvelopeResponse:
+    """Test cases for success_response / error_response rendering."""
+
+    def test_schema_serializes_orm_rows(self):
+        """Test that ORM rows are serialized through the schema into the envelope."""
+        rows = [Course(id=i, title=f"Course {i}", description="", instructor_name="Ada") for i in range(3)]
+        response = success_response(data=rows, schema=List[CourseOut], message="ok")
+
+        assert response.headers["content-type"] == "application/json"
+        assert json.loads(response.body) == {
+            "success": True,
+            "data": [{"id": i, "title": f"Course {i}", "description": "", "instructor_name": "Ada"} for i in range(3)],
+            "message": "ok",
+        }
+
+    def test_plain_data_matches_stdlib_json(self):
+        """Test that schema-less data keeps the shape the stdlib encoder produced."""
+        data = {"count": 2, "nested": {"items": [1, 2]}, "label": "é", "empty": None}
+        response = success_response(data=data)
+        assert json.loads(response.body) == {"success": True, "data": data, "message": "Success"}
+
+    def test_models_and_datetimes_without_schema(self):
+        """Test that pydantic models and datetimes inside plain data are encoded."""
+        stamp = datetime(2025, 1, 2, 3, 4, 5)
+        response = success_response(data={"row": Stamped(id=1, created_at=stamp), "at": stamp})
+        assert json.loads(response.body)["data"] == {
+            "row": {"id": 1, "created_at": "2025-01-02T03:04:05"},
+            "at": "2025-01-02T03:04:05",
+        }
+
+    def test_error_response(self):
+        """Test that errors keep the envelope and status code."""
+        response = error_response(message="Not found", status_code=404)
+        assert response.status_code == 404
+        assert json.loads(response.body) == {"success": False, "data": None, "message": "Not found"}
+
+
+class TestMessagePackNegotiation:
+    """Test cases for Accept: application/msgpack."""
+
+    def test_msgpack_when_requested(self, client, db_session):
+        """Test that msgpack clients get the same envelope as MessagePack, JSON clients are unaffected."""
+        msgpack = pytest.importorskip("msgpack")
+        db_session.add(Course(title="Packed", description="", instructor_name="Ada"))
+        db_session.commit()
+        token = create_access_token({"sub": "learner@example.com", "role": "free", "id": 1})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        packed = client.get("/courses/", headers={**headers, "Accept": "application/msgpack"})
+        plain = client.get("/courses/", headers=headers)
+
+        assert packed.headers["content-type"] == "application/msgpack"
+        assert msgpack.unpackb(packed.content) == plain.json()
+        assert plain.headers["content-type"] == "application/json"
+
+
+class TestReadModels:
+    """Test cases for the Core select() read rows."""
+
+    def test_rows_serialize_like_their_schemas(self, db_session):
+        """Test that read rows produce the same JSON as validating the ORM objects through the schema."""
+        from models.mentor_session import MentorProfile
+        from models.module import Module
+        from models.user import User, UserRole
+        from schemas.mentor_session import MentorListItem
+        from schemas.module import ModuleOut
+        from schemas.user import UserOut
+        from services.read_models import available_mentor_rows, course_rows, module_rows, user_rows
+
+        course = Course(title="Rows", description="Read models", instructor_name="Ada")
+        mentor = User(email="mentor-rows@example.com", hashed_password="unused", name="Mentor", role=UserRole.MENTOR)
+        db_session.add_all([course, mentor])
+        db_session.flush()
+        db_session.add_all([
+            Module(title="Intro", content_link="https://example.com/intro", course_id=course.id),
+            MentorProfile(user_id=mentor.id, bio="Bio", expertise_areas="SC-300", hourly_rate=50.0,
+                          years_experience=3, average_rating=4.5, total_sessions=2, is_accepting_sessions=True),
+        ])
+        db_session.commit()
+
+        def envelope_data(**kwargs):
+            return json.loads(success_response(**kwargs).body)["data"]
+
+        assert envelope_data(data=course_rows(db_session)) == envelope_data(
+            data=db_session.query(Course).all(), schema=List[CourseOut])
+        assert envelope_data(data=module_rows(db_session, course.id)) == envelope_data(
+            data=db_session.query(Module).all(), schema=List[ModuleOut])
+        assert envelope_data(data=user_rows(db_session)) == envelope_data(
+            data=db_session.query(User).order_by(User.id).all(), schema=List[UserOut])
+        assert envelope_data(data=available_mentor_rows(db_session, "SC-300")) == [MentorListItem(
+            id=mentor.id, name="Mentor", email="mentor-rows@example.com", bio="Bio", expertise_areas="SC-300",
+            hourly_rate=50.0, years_experience=3, average_rating=4.5, total_sessions=2, is_accepting_sessions=True,
+        ).model_dump()]
@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartup:
+    """Test cases for side-effect-free application import."""
+
+    def test_import_does_not_touch_database_or_load_sdks(self, tmp_path):
+        """Test that importing main neither connects to the database nor imports the heavy SDKs."""
+        db_path = tmp_path / "missing" / "lms.db"
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+        env.pop("OPENAI_API_KEY", None)
+        probe = "import sys, main; print(sorted(m for m in ('openai', 'stripe', 'authlib') if m in sys.modules))"
+
+        result = subprocess.run([sys.executable, "-c", probe], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+        assert not db_path.parent.exists()
@@ -1,6 +1,15 @@
+import asyncio
+import inspect
 import pytest
+import threading
+import anyio.to_thread
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from conftest import verify_api_response_structure
+from models.user import User
+from services.user_service import create_access_token, upsert_oauth_user, OAUTH_PASSWORD_SENTINEL
+from utils.auth import TokenCache, TokenClaims
+from utils.hashing import PasswordHasher, password_hasher, pwd_context
 
 
 class TestUserRegistration:
@@ -143,6 +152,90 @@ class TestUserLogin:
         verify_api_response_structure(data, expected_success=False)
 
 
+    def test_login_rehashes_outdated_cost(self, client: TestClient, db_session, sample_user_data):
+        """Test that a hash made with a different bcrypt cost is upgraded on login."""
+        old_hash = pwd_context.hash(sample_user_data["password"], rounds=4)
+        user = User(email=sample_user_data["email"], hashed_password=old_hash, name=sample_user_data["name"])
+        db_session.add(user)
+        db_session.commit()
+
+        response = client.post("/users/login", json={
+            "email": sample_user_data["email"],
+            "password": sample_user_data["password"]
+        })
+
+        assert response.status_code == 200
+        db_session.refresh(user)
+        assert user.hashed_password != old_hash
+        assert pwd_context.needs_update(user.hashed_password) is False
+
+    def test_register_returns_503_when_hasher_saturated(self, client: TestClient, sample_user_data, monkeypatch):
+        """Test that password hashing is rejected instead of queued once the hasher is full."""
+        saturated = threading.BoundedSemaphore(1)
+        saturated.acquire()
+        monkeypatch.setattr(password_hasher, "_slots", saturated)
+
+        response = client.post("/users/register", json=sample_user_data)
+
+        assert response.status_code == 503
+        verify_api_response_structure(response.json(), expected_success=False)
+
+    def test_login_and_register_are_async(self):
+        """Test that the password endpoints await the hasher instead of running on the threadpool."""
+        from routers.user import login_user, register_user
+        assert inspect.iscoroutinefunction(login_user)
+        assert inspect.iscoroutinefunction(register_user)
+
+    def test_async_hashing_holds_no_threadpool_tokens(self):
+        """Test that a burst of in-flight hashes borrows none of AnyIO's worker threads."""
+        hasher = PasswordHasher(workers=2, queue_limit=8)
+        release = threading.Event()
+
+        def slow_hash(password):
+            release.wait(5)
+            return f"hashed:{password}"
+
+        async def burst():
+            limiter = anyio.to_thread.current_default_thread_limiter()
+            tasks = [asyncio.ensure_future(hasher._run_async(slow_hash, str(i))) for i in range(10)]
+            await asyncio.sleep(0.05)
+            borrowed = limiter.borrowed_tokens
+            with pytest.raises(HTTPException) as exc_info:
+                await hasher._run_async(slow_hash, "one too many")
+            release.set()
+            return borrowed, exc_info.value.status_code, await asyncio.gather(*tasks)
+
+        borrowed, rejected_status, results = asyncio.run(burst())
+        hasher._executor.shutdown()
+
+        assert borrowed == 0
+        assert rejected_status == 503
+        assert results == [f"hashed:{i}" for i in range(10)]
+
+class TestOAuthUsers:
+    """Test cases for the single-statement OAuth sign-in path."""
+
+    def test_upsert_creates_then_returns_same_user(self, db_session):
+        """Test that signing in twice creates exactly one password-less account."""
+        first = upsert_oauth_user(db_session, "oauth@example.com", "OAuth Learner")
+        second = upsert_oauth_user(db_session, "oauth@example.com", "Other Name")
+
+        assert first.id == second.id
+        assert second.name == "OAuth Learner"
+        assert second.role.value == "free"
+        user = db_session.query(User).filter(User.email == "oauth@example.com").one()
+        assert user.hashed_password == OAUTH_PASSWORD_SENTINEL
+        assert user.has_password is False
+
+    def test_password_login_rejected_for_oauth_user(self, client: TestClient, db_session):
+        """Test that the sentinel never authenticates a password login."""
+        upsert_oauth_user(db_session, "oauth@example.com", "OAuth Learner")
+
+        response = client.post("/users/login", json={"email": "oauth@example.com", "password": OAUTH_PASSWORD_SENTINEL})
+
+        assert response.status_code == 401
+
+
 class TestProtectedRoutes:
     """Test cases for protected routes requiring authentication."""
 
@@ -250,4 +343,82 @@ class TestProtectedRoutes:
         
         # Verify API response structure
         verify_api_response_structure(data, expected_success=False)
-        assert "not authenticated" in data["message"].lower()
\ No newline at end of file
+        assert "not authenticated" in data["message"].lower()
+
+
+class TestProfileCache:
+    """Test cases for cached profiles and conditional requests on /users/me and /users/profile."""
+
+    def _register(self, client: TestClient, sample_user_data):
+        response = client.post("/users/register", json=sample_user_data)
+        return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+    def test_profile_returns_etag_and_304(self, client: TestClient, sample_user_data):
+        """Test that a matching If-None-Match is answered with 304 and no body."""
+        headers = self._register(client, sample_user_data)
+
+        response = client.get("/users/me", headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        response = client.get("/users/profile", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_profile_update_changes_etag(self, client: TestClient, sample_user_data):
+        """Test that updating the profile invalidates the cached copy."""
+        headers = self._register(client, sample_user_data)
+        etag = client.get("/users/profile", headers=headers).headers["ETag"]
+
+        client.put("/users/profile", headers=headers, json={"name": "Renamed Learner"})
+
+        response = client.get("/users/profile", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["data"]["name"] == "Renamed Learner"
+        assert response.headers["ETag"] != etag
+
+    def test_write_from_another_worker_drops_cached_profile(self, client: TestClient, db_session):
+        """Test that a change this process never saw is not served from its cache or as a 304."""
+        user = User(email="cached@example.com", name="Cached", hashed_password="unused")
+        db_session.add(user)
+        db_session.commit()
+        token = create_access_token({"sub": user.email, "role": user.role.value, "id": user.id})
+        headers = {"Authorization": f"Bearer {token}"}
+        etag = client.get("/users/me", headers=headers).headers["ETag"]
+
+        # Another worker's write: no invalidation reaches this process's cache
+        db_session.query(User).filter(User.id == user.id).update({"name": "Renamed Elsewhere"})
+        db_session.commit()
+
+        response = client.get("/users/me", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["data"]["name"] == "Renamed Elsewhere"
+        assert response.headers["ETag"] != etag
+
+
+class TestTokenCache:
+    """Test cases for the verified-token cache used by get_current_user."""
+
+    def test_entry_expires_with_token(self, monkeypatch):
+        """Test that a cached token is not served past its exp claim."""
+        cache = TokenCache(max_size=10, ttl_seconds=300)
+        monkeypatch.setattr("utils.auth.time.time", lambda: 1000.0)
+        cache.put(b"key", TokenClaims({"sub": "a@example.com", "role": "admin", "id": 1, "exp": 1010}))
+
+        assert cache.get(b"key").user["role"].value == "admin"
+
+        monkeypatch.setattr("utils.auth.time.time", lambda: 1010.0)
+        assert cache.get(b"key") is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache never grows past max_size."""
+        cache = TokenCache(max_size=2, ttl_seconds=300)
+        for key in (b"a", b"b"):
+            cache.put(key, TokenClaims({"sub": "a@example.com", "id": 1}))
+        cache.get(b"a")
+        cache.put(b"c", TokenClaims({"sub": "a@example.com", "id": 1}))
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") is not None
+        assert cache.get(b"c").user["role"].value == "free"
+
@@ -2,38 +2,106 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from core import config
-from typing import Dict, List
+from collections import OrderedDict
+from typing import Dict, List, Optional
 from models.user import UserRole
+import hashlib
+import threading
+import time
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
-def decode_token(token: str) -> Dict:
+class TokenClaims:
+    """
+    Verified claims of a JWT, parsed once.
+    `user` is the dict returned by get_current_user, built when the token is first
+    verified so cache hits do not re-parse the role.
+    """
+    __slots__ = ("payload", "user", "exp")
+    
+    def __init__(self, payload: Dict):
+        self.payload = payload
+        self.exp: Optional[float] = payload.get("exp")
+        # Convert string role to UserRole enum
+        try:
+            role = UserRole(payload.get("role", "free"))
+        except ValueError:
+            role = UserRole.FREE
+        self.user = {
+            "email": payload.get("sub"),
+            "role": role,
+            "id": payload.get("id")
+        }
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified tokens keyed by the SHA-256 digest of the token.
+    An entry is only served before both the token's `exp` and the cache TTL.
+    """
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, tuple[TokenClaims, float]]" = OrderedDict()
+    
+    def get(self, key: bytes) -> Optional[TokenClaims]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            claims, valid_until = entry
+            if now >= valid_until:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+    
+    def put(self, key: bytes, claims: TokenClaims):
+        if self.max_size <= 0:
+            return
+        valid_until = time.time() + self.ttl_seconds
+        if claims.exp is not None:
+            valid_until = min(valid_until, claims.exp)
+        with self._lock:
+            self._entries[key] = (claims, valid_until)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+token_cache = TokenCache(config.JWT_CACHE_SIZE, config.JWT_CACHE_TTL_SECONDS)
+
+def verify_token(token: str) -> TokenClaims:
+    """Verify a token's signature and expiry, reusing earlier verifications"""
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(key)
+    if claims is not None:
+        return claims
+    
     try:
         payload = jwt.decode(
             token, config.JWT_SECRET_KEY, algorithms=[config.JWT_ALGORITHM]
         )
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    claims = TokenClaims(payload)
+    token_cache.put(key, claims)
+    return claims
+
+def decode_token(token: str) -> Dict:
+    return dict(verify_token(token).payload)
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
-    payload = decode_token(token)
-    role_str = payload.get("role", "free")
-    # Convert string role to UserRole enum
-    try:
-        role = UserRole(role_str)
-    except ValueError:
-        role = UserRole.FREE
-    
-    return {
-        "email": payload.get("sub"),
-        "role": role,
-        "id": payload.get("id")
-    }
+    return dict(verify_token(token).user)
 
 def require_roles(allowed_roles: List[UserRole]):
     def role_checker(user: Dict = Depends(get_current_user)):
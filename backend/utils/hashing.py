@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from core import config
+from typing import Optional, Tuple
+import threading
+
+# min/max rounds pin the cost so hashes made with another BCRYPT_ROUNDS report needs_update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=config.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=config.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=config.BCRYPT_ROUNDS,
+)
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool instead of the shared AnyIO threadpool.
+    At most `workers + queue_limit` hashes are in flight; beyond that callers get a 503
+    immediately. Async endpoints use the *_async methods, which await the pool's future
+    on the event loop, so a login burst holds no AnyIO worker threads at all; the sync
+    methods block their calling thread and are for scripts and sync code paths.
+    """
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+    
+    def _admit(self):
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in requests. Please try again shortly."
+            )
+
+    def _run(self, fn, *args):
+        self._admit()
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    async def _run_async(self, fn, *args):
+        self._admit()
+        try:
+            return await asyncio.wrap_future(self._executor.submit(fn, *args))
+        finally:
+            self._slots.release()
+    
+    def hash(self, password: str) -> str:
+        return self._run(pwd_context.hash, password)
+    
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._run(pwd_context.verify, password, hashed_password)
+    
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; also returns a new hash if the stored one uses an outdated cost."""
+        return self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(pwd_context.hash, password)
+
+    async def verify_and_update_async(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._run_async(pwd_context.verify_and_update, password, hashed_password)
+
+password_hasher = PasswordHasher(config.PASSWORD_HASH_WORKERS, config.PASSWORD_HASH_QUEUE_LIMIT)
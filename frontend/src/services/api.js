@@ -8,6 +8,11 @@ const api = axios.create({
   },
 });
 
+// Read-your-writes pin from the last write (unix seconds); echoed back until it runs out
+// so reads right after a save go to the primary database, whichever server answers
+const READ_YOUR_WRITES_HEADER = 'X-Read-Your-Writes';
+let readYourWritesUntil = null;
+
 // Request interceptor to add JWT token
 api.interceptors.request.use(
   (config) => {
@@ -15,6 +20,9 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    if (readYourWritesUntil && readYourWritesUntil > Date.now() / 1000) {
+      config.headers[READ_YOUR_WRITES_HEADER] = readYourWritesUntil;
+    }
     return config;
   },
   (error) => {
@@ -25,6 +33,10 @@ api.interceptors.request.use(
 // Response interceptor for global error handling
 api.interceptors.response.use(
   (response) => {
+    const pinnedUntil = response.headers[READ_YOUR_WRITES_HEADER.toLowerCase()];
+    if (pinnedUntil) {
+      readYourWritesUntil = Number(pinnedUntil);
+    }
     return response;
   },
   (error) => {